@@ -1,8 +1,10 @@
 from fastapi import APIRouter
-from .routes import books, users, health
+from .routes import books, users, health, internal
 
 api_router = APIRouter()
 
 api_router.include_router(books.router, prefix="/books", tags=["books"])
 api_router.include_router(users.router, prefix="/users", tags=["users"])
 api_router.include_router(health.router, tags=["health"])
+# Operational data, left out of the public API docs
+api_router.include_router(internal.router, prefix="/internal", tags=["internal"], include_in_schema=False)
@@ -1,9 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
+from datetime import date
 from ...core.database import get_db
 from ...schemas.user import UserResponse, UserWithBorrowedBooksResponse
 from ...services.user_service import user_service
+from ...services.export_service import export_service, ExportFormat, MEDIA_TYPES
+from ...services.archive_service import archive_service
+from ...schemas.borrow import ArchivedLoan, ArchiveRun
 from shared.pagination import PaginatedResponse
 
 router = APIRouter()
@@ -12,6 +17,7 @@ router = APIRouter()
 async def list_users(
     page: int = 1,
     limit: int = 10,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
     """List all users enrolled in the library with pagination
@@ -19,14 +25,16 @@ async def list_users(
     Args:
         page: Page number (1-based)
         limit: Maximum number of items per page
+        cursor: Cursor from a previous page's next_cursor; overrides page
         db: Database session
     """
-    return await user_service.get_users(db, page=page, limit=limit)
+    return await user_service.get_users(db, page=page, limit=limit, cursor=cursor)
 
 @router.get("/borrowed-books", response_model=PaginatedResponse[UserWithBorrowedBooksResponse])
 async def list_users_with_borrowed_books(
     page: int = 1,
     limit: int = 10,
+    since: Optional[date] = None,
     db: Session = Depends(get_db)
 ):
     """List all users who have borrowed books with pagination
@@ -34,8 +42,53 @@ async def list_users_with_borrowed_books(
     Args:
         page: Page number (1-based)
         limit: Maximum number of items per page
+        since: Only include books borrowed on or after this date (YYYY-MM-DD)
         db: Database session
     """
-    return await user_service.get_users_with_borrowed_books(db, page=page, limit=limit)
+    return await user_service.get_users_with_borrowed_books(
+        db, page=page, limit=limit, since=since
+    )
 
+@router.get("/export")
+def export_users(format: ExportFormat = ExportFormat.NDJSON):
+    """Stream every user as NDJSON or CSV
+    
+    Args:
+        format: ndjson (one JSON object per line) or csv
+    """
+    return StreamingResponse(
+        export_service.export_users(format),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="users.{format.value}"'}
+    )
+
+@router.get("/borrowed-books/export")
+def export_loans(format: ExportFormat = ExportFormat.NDJSON):
+    """Stream every borrow record with its user and book as NDJSON or CSV
+    
+    Args:
+        format: ndjson (one JSON object per line) or csv
+    """
+    return StreamingResponse(
+        export_service.export_loans(format),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="loans.{format.value}"'}
+    )
 
+@router.post("/borrowed-books/archive", response_model=ArchiveRun)
+def archive_closed_loans(db: Session = Depends(get_db)):
+    """Move loans returned before the archive horizon to the loan archive
+
+    Each call archives up to ARCHIVE_MAX_ROWS_PER_RUN loans; meant to be
+    called periodically by a scheduler.
+    """
+    return archive_service.archive_closed_loans(db)
+
+@router.get("/{user_id}/archived-loans", response_model=List[ArchivedLoan])
+def list_archived_loans(user_id: int):
+    """List a user's loans that were moved to the archive, oldest first
+
+    Args:
+        user_id: ID of the user
+    """
+    return archive_service.get_user_loans(user_id)
@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
 from typing import Optional
+from shared.counting import CountStrategy
 
 class Settings(BaseSettings):
     PROJECT_NAME: str = "Library Management System - Admin API"
@@ -14,6 +15,31 @@ class Settings(BaseSettings):
 
     RABBITMQ_URL: str
 
+    # How list endpoints compute their total: exact, cached or estimate
+    USERS_COUNT_STRATEGY: CountStrategy = CountStrategy.EXACT
+    UNAVAILABLE_BOOKS_COUNT_STRATEGY: CountStrategy = CountStrategy.CACHED
+    BORROWED_BOOKS_COUNT_STRATEGY: CountStrategy = CountStrategy.CACHED
+    # Longest time a cached total is served without an invalidating event (seconds)
+    COUNT_CACHE_TTL: float = 60.0
+
+    # Email -> user id and ISBN -> book id map of the borrow consumer
+    IDENTITY_CACHE_SIZE: int = 100000
+    IDENTITY_CACHE_TTL: float = 3600.0
+
+    # Monthly borrow_records partitions kept ready ahead of today (Postgres only)
+    BORROW_PARTITION_MONTHS_AHEAD: int = 3
+
+    # Closed loans returned more than this many days ago are archived
+    ARCHIVE_AFTER_DAYS: int = 365
+    # Directory of the compressed loan archive and its index
+    ARCHIVE_DIR: str = "archive"
+    # Most loans moved by one archival run
+    ARCHIVE_MAX_ROWS_PER_RUN: int = 100000
+
+    # Value of the X-Internal-Token header required by /internal endpoints
+    # (cache statistics); unset, they answer 404
+    INTERNAL_API_TOKEN: Optional[str] = None
+
     class Config:
         env_file = ".env"
 
@@ -0,0 +1,6 @@
+from shared.local_events import LocalEventBus
+
+# Process-wide bus for committed changes (books created, deleted and
+# borrowed, users created). Published by the services after commit; subscribed to by
+# in-process caches.
+local_events = LocalEventBus()
@@ -4,11 +4,14 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.utils import get_openapi
 from sqlalchemy.exc import SQLAlchemyError
 import logging
+import asyncio
 from .core.config import settings
 from .api import api_router
 from .core.database import Base, engine
 from shared.message_broker import MessageBroker
-from .services.book_service import BookService
+from shared.partitioning import maintain_partitions
+from .models.borrow import BorrowRecord
+from .services.book_service import BookService, ensure_book_schema
 from .services.user_service import UserService
 from .services.user_sync_service import UserSyncService
 from .services.borrow_sync_service import BorrowSyncService
@@ -22,6 +25,7 @@ logger = logging.getLogger(__name__)
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
+ensure_book_schema(engine)
 
 # Initialize shared message broker
 message_broker = MessageBroker(settings.RABBITMQ_URL)
@@ -82,6 +86,12 @@ app.include_router(api_router, prefix=settings.API_V1_STR)
 @app.on_event("startup")
 async def startup_event():
     """Initialize services and connections on application startup"""
+    # Keep future borrow_records partitions in place; converting the table
+    # is the separate scripts.partition_borrow_records step
+    app.state.partition_maintenance = asyncio.create_task(maintain_partitions(
+        engine, BorrowRecord.__table__, settings.BORROW_PARTITION_MONTHS_AHEAD
+    ))
+    
     logger.info("Connecting to RabbitMQ...")
     await message_broker.connect()
     
@@ -99,6 +109,7 @@ async def startup_event():
 async def shutdown_event():
     """Cleanup connections on application shutdown"""
     logger.info("Shutting down application...")
+    app.state.partition_maintenance.cancel()
     
     # Close message broker connection
     await message_broker.close()
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, Date, DateTime
+from sqlalchemy import Column, Integer, String, Boolean, Date, DateTime, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from ..core.database import Base
@@ -17,6 +17,19 @@ class Book(Base):
     return_date = Column(Date, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Loan that made the book unavailable. Not a foreign key: borrow_records
+    # already references books, and the listing only ever joins on it.
+    current_borrow_id = Column(Integer, nullable=True)
+    # Its borrow_date, so the join prunes to one borrow_records partition
+    current_borrow_date = Column(Date, nullable=True)
+    # User holding the book, so the borrow consumer can set the current loan
+    # in one UPDATE without loading the book
+    current_borrower_id = Column(Integer, nullable=True)
     
     # Relationship with BorrowRecord
     borrow_records = relationship("BorrowRecord", back_populates="book")
+
+    __table_args__ = (
+        # Unavailable books listing, ordered by id
+        Index("ix_books_available_id", "available", "id"),
+    )
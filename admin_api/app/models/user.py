@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Integer, String, DateTime, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from ..core.database import Base
@@ -14,3 +14,8 @@ class User(Base):
     
     # Relationship with BorrowRecord
     borrow_records = relationship("BorrowRecord", back_populates="user")
+
+    __table_args__ = (
+        # Keyset pagination order for the users listing
+        Index("ix_users_created_at_id", "created_at", "id"),
+    )
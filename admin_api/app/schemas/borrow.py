@@ -1,5 +1,6 @@
 from pydantic import BaseModel
 from datetime import date
+from typing import Optional
 
 class BorrowCreate(BaseModel):
     """Schema for creating a new borrow record"""
@@ -27,4 +28,21 @@ class BookBorrowed(BaseModel):
     return_date: date
 
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True 
+
+class ArchivedLoan(BaseModel):
+    """Schema for a loan moved to the archive"""
+    borrow_id: int
+    # None once the user or book was deleted
+    user_id: Optional[int] = None
+    user_email: Optional[str] = None
+    book_id: Optional[int] = None
+    isbn: Optional[str] = None
+    title: Optional[str] = None
+    borrow_date: date
+    return_date: date
+
+class ArchiveRun(BaseModel):
+    """Schema for the result of an archival run"""
+    archived: int
+    segment: Optional[str] = None
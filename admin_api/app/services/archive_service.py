@@ -0,0 +1,213 @@
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import select, delete, exists
+from sqlalchemy.exc import SQLAlchemyError
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+from pydantic import ValidationError
+from ..models.user import User
+from ..models.book import Book
+from ..models.borrow import BorrowRecord
+from ..schemas.borrow import ArchivedLoan, ArchiveRun
+from ..core.config import settings
+from .user_service import invalidate_borrowed_books_total
+from shared.exceptions import LibraryException, DatabaseOperationError
+import fcntl
+import gzip
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE = "index.json"
+LOCK_FILE = "index.lock"
+
+# Rows read per round trip while writing a segment
+ARCHIVE_FETCH_SIZE = 1000
+# Ids per DELETE statement, well below the bound parameter limits
+DELETE_CHUNK_SIZE = 5000
+
+class ArchiveService:
+    """Moves closed loans out of borrow_records into compressed segment files.
+
+    A run selects loans whose return date is more than ``archive_after_days``
+    in the past and that are not the current loan of a book. Loans without a
+    borrow date (recorded before it was always set) stay in the table. It writes them
+    to a new gzip NDJSON segment, records the segment in ``index.json``, and
+    deletes the rows. Segments are never modified after they are written.
+
+    The index lists, for each segment, its row count, borrow date range and
+    the ids of the users it contains, so a user's history only opens the
+    segments that mention them.
+
+    The segment and the index are written (via rename) before the delete is
+    committed. If the commit fails, the segment is removed again. A crash
+    between the two can leave rows both archived and in the table, so a
+    later run may archive them twice; reads drop duplicates by borrow id.
+    """
+    def __init__(
+        self,
+        archive_dir: str = settings.ARCHIVE_DIR,
+        archive_after_days: int = settings.ARCHIVE_AFTER_DAYS,
+        max_rows_per_run: int = settings.ARCHIVE_MAX_ROWS_PER_RUN
+    ):
+        self.archive_dir = Path(archive_dir)
+        self.archive_after_days = archive_after_days
+        self.max_rows_per_run = max_rows_per_run
+
+    def archive_closed_loans(self, db: Session, today: Optional[date] = None) -> ArchiveRun:
+        """Archive one batch of closed loans.
+
+        Args:
+            db: Database session
+            today: Reference date for the horizon, defaults to today
+
+        Returns:
+            The number of archived loans and the segment they were written to
+        """
+        cutoff = (today or date.today()) - timedelta(days=self.archive_after_days)
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        try:
+            with self._locked():
+                return self._archive(db, cutoff)
+        except DatabaseOperationError:
+            raise
+        except SQLAlchemyError as e:
+            db.rollback()
+            raise DatabaseOperationError(
+                message="Failed to archive closed loans",
+                details={"cutoff": cutoff.isoformat()}
+            ) from e
+        except OSError as e:
+            db.rollback()
+            raise LibraryException(
+                message=f"Failed to write loan archive: {str(e)}",
+                error_code="ARCHIVE_WRITE_ERROR"
+            ) from e
+
+    def get_user_loans(self, user_id: int) -> List[ArchivedLoan]:
+        """Archived loans of a user, oldest first."""
+        loans: Dict[int, ArchivedLoan] = {}
+        for segment in self._read_index()["segments"]:
+            if user_id not in segment["user_ids"]:
+                continue
+            with gzip.open(self.archive_dir / segment["file"], "rt", encoding="utf-8") as lines:
+                for line in lines:
+                    row = json.loads(line)
+                    if row["user_id"] == user_id:
+                        loans[row["borrow_id"]] = ArchivedLoan(**row)
+        return sorted(loans.values(), key=lambda loan: (loan.borrow_date, loan.borrow_id))
+
+    def _archive(self, db: Session, cutoff: date) -> ArchiveRun:
+        current_loans = aliased(Book)
+        statement = (
+            select(
+                BorrowRecord.id.label("borrow_id"),
+                BorrowRecord.user_id,
+                User.email.label("user_email"),
+                BorrowRecord.book_id,
+                Book.isbn,
+                Book.title,
+                BorrowRecord.borrow_date,
+                BorrowRecord.return_date
+            )
+            .outerjoin(User, BorrowRecord.user_id == User.id)
+            .outerjoin(Book, BorrowRecord.book_id == Book.id)
+            .where(
+                BorrowRecord.return_date < cutoff,
+                BorrowRecord.borrow_date.isnot(None),
+                ~exists().where(current_loans.current_borrow_id == BorrowRecord.id)
+            )
+            .order_by(BorrowRecord.id)
+            .limit(self.max_rows_per_run)
+            .execution_options(yield_per=ARCHIVE_FETCH_SIZE)
+        )
+
+        name = f"loans-{datetime.utcnow():%Y%m%dT%H%M%S%f}.ndjson.gz"
+        path = self.archive_dir / name
+        borrow_ids: List[int] = []
+        user_ids = set()
+        borrow_dates = []
+        partial = path.with_suffix(".partial")
+        try:
+            with gzip.open(partial, "wt", encoding="utf-8") as segment:
+                for row in db.execute(statement):
+                    loan = ArchivedLoan(**row._mapping)
+                    segment.write(loan.model_dump_json() + "\n")
+                    borrow_ids.append(loan.borrow_id)
+                    if loan.user_id is not None:
+                        user_ids.add(loan.user_id)
+                    borrow_dates.append(loan.borrow_date)
+        except BaseException as e:
+            # Nothing was deleted yet; drop the unfinished segment
+            partial.unlink(missing_ok=True)
+            if isinstance(e, ValidationError):
+                db.rollback()
+                raise DatabaseOperationError(
+                    message="Failed to archive closed loans: a loan row is incomplete",
+                    details={"cutoff": cutoff.isoformat()}
+                ) from e
+            raise
+
+        if not borrow_ids:
+            partial.unlink()
+            return ArchiveRun(archived=0, segment=None)
+
+        os.replace(partial, path)
+        index = self._read_index()
+        index["segments"].append({
+            "file": name,
+            "rows": len(borrow_ids),
+            "min_borrow_date": min(borrow_dates).isoformat(),
+            "max_borrow_date": max(borrow_dates).isoformat(),
+            "user_ids": sorted(user_ids)
+        })
+        self._write_index(index)
+
+        try:
+            for start in range(0, len(borrow_ids), DELETE_CHUNK_SIZE):
+                db.execute(
+                    delete(BorrowRecord)
+                    .where(BorrowRecord.id.in_(borrow_ids[start:start + DELETE_CHUNK_SIZE]))
+                    .execution_options(synchronize_session=False)
+                )
+            db.commit()
+        except SQLAlchemyError:
+            # The rows stay in the table; forget the segment again
+            index["segments"].pop()
+            self._write_index(index)
+            path.unlink()
+            raise
+
+        invalidate_borrowed_books_total()
+        logger.info(f"Archived {len(borrow_ids)} loans returned before {cutoff} to {name}")
+        return ArchiveRun(archived=len(borrow_ids), segment=name)
+
+    def _read_index(self) -> dict:
+        try:
+            with open(self.archive_dir / INDEX_FILE, encoding="utf-8") as index:
+                return json.load(index)
+        except FileNotFoundError:
+            return {"segments": []}
+
+    def _write_index(self, index: dict) -> None:
+        partial = self.archive_dir / f"{INDEX_FILE}.partial"
+        with open(partial, "w", encoding="utf-8") as file:
+            json.dump(index, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(partial, self.archive_dir / INDEX_FILE)
+
+    @contextmanager
+    def _locked(self):
+        """Exclusive lock on the archive directory, shared by all workers."""
+        with open(self.archive_dir / LOCK_FILE, "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+archive_service = ArchiveService()
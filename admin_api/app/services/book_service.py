@@ -1,17 +1,22 @@
 from sqlalchemy.orm import Session
+from sqlalchemy.engine import Engine
 from typing import List, Optional
 from ..models.book import Book
 from ..models.borrow import BorrowRecord
-from ..schemas.book import BookCreate, UnavailableBook
+from ..schemas.book import Book as BookSchema, BookCreate, UnavailableBook
 from ..schemas.borrow import BookBorrowed
+from .queries import BOOK_BY_ID
 import sys
 import os
 import logging
 from datetime import datetime
 from sqlalchemy.orm import joinedload
 from shared.pagination import PaginatedResponse
-from sqlalchemy import or_
+from shared.counting import TotalCounter
+from shared.cache_registry import cache_registry
+from sqlalchemy import and_, or_, select, insert, text
 from ..core.config import settings
+from ..core.events import local_events
 from shared.exceptions import ResourceNotFoundError, DatabaseOperationError
 from sqlalchemy.exc import SQLAlchemyError
 from shared.message_types import MessageType
@@ -24,39 +29,113 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(
 
 logger = logging.getLogger(__name__)
 
+# Postgres only: the current loan columns of books and the unavailable
+# books index, for databases created before them (create_all never alters
+# an existing table). Unavailable books are then pointed at their latest
+# loan and its borrower. Every statement is idempotent.
+BOOK_SCHEMA_DDL = (
+    "ALTER TABLE books ADD COLUMN IF NOT EXISTS current_borrow_id INTEGER",
+    "ALTER TABLE books ADD COLUMN IF NOT EXISTS current_borrow_date DATE",
+    "ALTER TABLE books ADD COLUMN IF NOT EXISTS current_borrower_id INTEGER",
+    "CREATE INDEX IF NOT EXISTS ix_books_available_id ON books (available, id)",
+    """
+    UPDATE books
+    SET current_borrow_id = loans.id,
+        current_borrow_date = loans.borrow_date
+    FROM (
+        SELECT DISTINCT ON (book_id) id, book_id, borrow_date
+        FROM borrow_records
+        ORDER BY book_id, borrow_date DESC, id DESC
+    ) AS loans
+    WHERE books.id = loans.book_id
+      AND books.available = false
+      AND books.current_borrow_id IS NULL
+    """,
+    """
+    UPDATE books
+    SET current_borrower_id = borrow_records.user_id
+    FROM borrow_records
+    WHERE borrow_records.id = books.current_borrow_id
+      AND borrow_records.borrow_date = books.current_borrow_date
+      AND books.available = false
+      AND books.current_borrower_id IS NULL
+    """
+)
+
+def ensure_book_schema(engine: Engine) -> None:
+    """Bring an existing books table up to date on Postgres; no-op elsewhere."""
+    if engine.dialect.name != "postgresql":
+        return
+    with engine.begin() as connection:
+        for statement in BOOK_SCHEMA_DDL:
+            connection.execute(text(statement))
+
+# ISBNs per existence query; keeps bound parameters well below the SQLite
+# (32766) and Postgres (65535) limits.
+ISBN_LOOKUP_CHUNK_SIZE = 5000
+
+# Shared by every BookService instance; dropped when a borrow or deletion
+# commits in this process.
+unavailable_books_total = cache_registry.register(TotalCounter(
+    settings.UNAVAILABLE_BOOKS_COUNT_STRATEGY, ttl=settings.COUNT_CACHE_TTL,
+    name="unavailable_books_total"
+))
+
+def invalidate_unavailable_total(data=None) -> None:
+    """Drop the cached total of the unavailable books listing."""
+    unavailable_books_total.invalidate()
+
+local_events.subscribe(MessageType.BOOK_BORROWED, invalidate_unavailable_total)
+local_events.subscribe(MessageType.BOOK_DELETED, invalidate_unavailable_total)
+
 class BookService:
     def __init__(self, message_broker: MessageBroker):
         self.message_broker = message_broker
 
-    async def create_books(self, db: Session, books: List[BookCreate]) -> List[Book]:
+    async def create_books(self, db: Session, books: List[BookCreate]) -> List[BookSchema]:
         """Add multiple books to the catalogue using bulk insert.
+
+        Existing ISBNs are found with one IN query per chunk and the new books
+        are written with a multi-row INSERT ... RETURNING, so the number of
+        statements does not grow with one query per book.
         
         Args:
             db: Database session
             books: List of book data validated by Pydantic
         
         Returns:
-            List of created book instances
+            List of created and already existing books
         """
         try:
             logger.info(f"Creating {len(books)} books in admin API")
             
-            book_values = [book.model_dump() for book in books]
-            new_books = []
-            existing_books = []
+            # Keep the first occurrence of each ISBN in the payload
+            book_values = {}
+            for book in books:
+                book_values.setdefault(book.isbn, book.model_dump())
+            
+            try:
+                existing_books = self._get_books_by_isbns(db, list(book_values))
+            except SQLAlchemyError as e:
+                raise DatabaseOperationError(
+                    message="Failed to check for existing books"
+                ) from e
             
-            for book_data in book_values:
-                existing_book = db.query(Book).filter(Book.isbn == book_data['isbn']).first()
-                if existing_book:
-                    logger.info(f"Book with ISBN {book_data['isbn']} already exists, skipping")
-                    existing_books.append(existing_book)
-                else:
-                    db_book = Book(**book_data)
-                    db.add(db_book)
-                    new_books.append(db_book)
+            if existing_books:
+                logger.info(f"{len(existing_books)} books already exist, skipping")
+            existing_isbns = {book.isbn for book in existing_books}
+            # Serialize before the commit below expires the instances
+            existing = [BookSchema.model_validate(book) for book in existing_books]
+            new_values = [
+                book_data for isbn, book_data in book_values.items()
+                if isbn not in existing_isbns
+            ]
             
-            if new_books:
+            new_books = []
+            if new_values:
                 try:
+                    db_books = db.scalars(insert(Book).returning(Book), new_values).all()
+                    new_books = [BookSchema.model_validate(book) for book in db_books]
                     db.commit()
                 except SQLAlchemyError as e:
                     db.rollback()
@@ -64,6 +143,11 @@ class BookService:
                         message="Failed to commit new books to database"
                     ) from e
                 
+                local_events.publish(
+                    MessageType.BOOKS_CREATED,
+                    [book.model_dump() for book in new_books]
+                )
+                
                 books_data = [
                     {
                         "title": book.title,
@@ -88,7 +172,7 @@ class BookService:
                 
                 logger.info(f"Successfully created {len(new_books)} new books and notified frontend")
             
-            all_books = new_books + existing_books
+            all_books = new_books + existing
             if not all_books:
                 logger.warning("No books were created or found")
             
@@ -102,6 +186,17 @@ class BookService:
                 error_code="BOOK_CREATION_ERROR"
             ) from e
 
+    def _get_books_by_isbns(self, db: Session, isbns: List[str]) -> List[Book]:
+        """Fetch the books matching any of the given ISBNs.
+
+        The lookup is chunked to stay under the drivers' bound parameter limits.
+        """
+        books = []
+        for start in range(0, len(isbns), ISBN_LOOKUP_CHUNK_SIZE):
+            chunk = isbns[start:start + ISBN_LOOKUP_CHUNK_SIZE]
+            books.extend(db.scalars(select(Book).where(Book.isbn.in_(chunk))).all())
+        return books
+
     async def delete_book(self, db: Session, book_id: int) -> bool:
         """Delete a book from the catalogue.
         
@@ -118,6 +213,10 @@ class BookService:
             
             db.delete(book)
             db.commit()
+            local_events.publish(
+                MessageType.BOOK_DELETED,
+                {"id": book_id, "isbn": book_isbn}
+            )
             
             await self.message_broker.publish(
                 MessageType.BOOK_DELETED.value,
@@ -150,7 +249,7 @@ class BookService:
             Book instance if found
         """
         try:
-            book = db.query(Book).filter(Book.id == book_id).first()
+            book = db.execute(BOOK_BY_ID, {"book_id": book_id}).scalars().first()
             if not book:
                 raise ResourceNotFoundError("Book", book_id)
             return book
@@ -187,6 +286,9 @@ class BookService:
         try:
             skip = (page - 1) * limit
             
+            # Each book joins only its current loan, so the cost does not
+            # grow with the loan history and a book is listed once. The
+            # borrow date lets Postgres prune the lookup to one partition.
             base_query = (
                 db.query(
                     Book,
@@ -194,7 +296,10 @@ class BookService:
                     BorrowRecord.return_date
                 )
                 .filter(Book.available == False)
-                .outerjoin(BorrowRecord)
+                .outerjoin(BorrowRecord, and_(
+                    BorrowRecord.id == Book.current_borrow_id,
+                    BorrowRecord.borrow_date == Book.current_borrow_date
+                ))
                 .filter(or_(
                     BorrowRecord.return_date > datetime.now(),
                     BorrowRecord.id == None
@@ -202,7 +307,7 @@ class BookService:
             )
             
             try:
-                total = base_query.count()
+                total, total_is_estimate = unavailable_books_total.count(base_query)
                 results = (
                     base_query
                     .order_by(Book.id)
@@ -234,7 +339,8 @@ class BookService:
                 items=items,
                 total=total,
                 page=page,
-                limit=limit
+                limit=limit,
+                total_is_estimate=total_is_estimate
             )
             
         except DatabaseOperationError:
@@ -1,9 +1,9 @@
 from sqlalchemy.orm import Session
 from datetime import date
+from typing import Optional
 from ..models.borrow import BorrowRecord
-from ..models.book import Book
-from ..models.user import User
 from ..schemas.borrow import BorrowCreate
+from .queries import BOOK_BY_ISBN, USER_ID_BY_EMAIL, CLAIM_BOOK
 from shared.message_broker import MessageBroker
 from shared.message_types import MessageType
 from shared.exceptions import (
@@ -12,12 +12,41 @@ from shared.exceptions import (
     ResourceNotFoundError,
     ValidationError
 )
+from shared.cache import TTLCache
+from shared.cache_registry import cache_registry
 import logging
 from ..core.config import settings
-from sqlalchemy.exc import SQLAlchemyError
+from ..core.events import local_events
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
 logger = logging.getLogger(__name__)
 
+# Identity map of the borrow consumer: book.borrowed messages name users by
+# email and books by ISBN. Filled from local user and book events and from
+# lookups on a miss. An id cached for a user or book since deleted (or
+# re-created) by another worker fails the borrow record's foreign keys or the
+# claim; both roll back and fall back to fresh lookups.
+user_ids_by_email = cache_registry.register(TTLCache(
+    maxsize=settings.IDENTITY_CACHE_SIZE, ttl=settings.IDENTITY_CACHE_TTL, name="user_ids_by_email"
+))
+book_ids_by_isbn = cache_registry.register(TTLCache(
+    maxsize=settings.IDENTITY_CACHE_SIZE, ttl=settings.IDENTITY_CACHE_TTL, name="book_ids_by_isbn"
+))
+
+def remember_user(data: dict) -> None:
+    user_ids_by_email.set(data["email"], data["id"])
+
+def remember_books(data: list) -> None:
+    for book in data:
+        book_ids_by_isbn.set(book["isbn"], book["id"])
+
+def forget_book(data: dict) -> None:
+    book_ids_by_isbn.delete(data["isbn"])
+
+local_events.subscribe(MessageType.USER_CREATED, remember_user)
+local_events.subscribe(MessageType.BOOKS_CREATED, remember_books)
+local_events.subscribe(MessageType.BOOK_DELETED, forget_book)
+
 class BorrowService:
     def __init__(self, message_broker: MessageBroker):
         self.message_broker = message_broker
@@ -25,6 +54,9 @@ class BorrowService:
     async def create_borrow_record(self, db: Session, borrow_data: dict) -> BorrowRecord:
         """Create a new borrow record from frontend message using email and ISBN.
         
+        With the user and book ids in the identity map this is one INSERT of
+        the borrow record and one conditional UPDATE claiming the book.
+        
         Args:
             db: Database session
             borrow_data: Dictionary containing user_email, book_isbn, and return_date
@@ -33,60 +65,39 @@ class BorrowService:
             Created borrow record
         """
         try:
-            # Find user by email
-            try:
-                user = db.query(User).filter(User.email == borrow_data["user_email"]).first()
-                if not user:
-                    raise ResourceNotFoundError("User", borrow_data["user_email"])
-            except SQLAlchemyError as e:
-                raise DatabaseOperationError(
-                    message="Failed to fetch user from database"
-                ) from e
-
-            # Find book by ISBN
-            try:
-                book = db.query(Book).filter(Book.isbn == borrow_data["book_isbn"]).first()
-                if not book:
-                    raise ResourceNotFoundError("Book", borrow_data["book_isbn"])
-            except SQLAlchemyError as e:
-                raise DatabaseOperationError(
-                    message="Failed to fetch book from database"
-                ) from e
-
-            # Check if book is available
-            if not book.available:
-                raise ValidationError(
-                    message="Book is not available"
-                )
-
-            # Create borrow record
-            db_borrow = BorrowRecord(
-                user_id=user.id,
-                book_id=book.id,
-                borrow_date=date.today(),
-                return_date=borrow_data["return_date"]
-            )
+            user_email = borrow_data["user_email"]
+            book_isbn = borrow_data["book_isbn"]
+            return_date = borrow_data["return_date"]
+            if isinstance(return_date, str):
+                # As sent by frontend_api over the message broker
+                return_date = date.fromisoformat(return_date)
+            user_id = self._user_id(db, user_email)
+            book_id = book_ids_by_isbn.get(book_isbn) or self._lookup_book_id(db, book_isbn)
 
-            # Update book availability
-            book.available = False
-            book.current_borrower_id = user.id
+            db_borrow = self._insert_and_claim(db, user_id, book_id, return_date)
+            if db_borrow is None:
+                # Unavailable, or stale ids: look both up again and retry once
+                user_id = self._lookup_user_id(db, user_email)
+                book_id = self._lookup_book_id(db, book_isbn, require_available=True)
+                db_borrow = self._insert_and_claim(db, user_id, book_id, return_date)
+                if db_borrow is None:
+                    raise ValidationError(
+                        message="Book is not available"
+                    )
 
-            try:
-                # Add both changes to the session
-                db.add(db_borrow)
-                db.add(book)
-                db.commit()
-                db.refresh(db_borrow)
-                db.refresh(book)
-                
-                logger.info(f"Successfully created borrow record for book {book.isbn} and user {user.email}")
-                return db_borrow
-
-            except SQLAlchemyError as e:
-                db.rollback()
-                raise DatabaseOperationError(
-                    message="Failed to create borrow record"
-                ) from e
+            local_events.publish(
+                MessageType.BOOK_BORROWED,
+                {
+                    "book_id": book_id,
+                    "book_isbn": book_isbn,
+                    "user_id": user_id,
+                    "user_email": user_email,
+                    "return_date": return_date.isoformat()
+                }
+            )
+            
+            logger.info(f"Successfully created borrow record for book {book_isbn} and user {user_email}")
+            return db_borrow
 
         except (ResourceNotFoundError, ValidationError, DatabaseOperationError):
             raise  # Re-raise these specific exceptions
@@ -96,6 +107,91 @@ class BorrowService:
                 error_code="BORROW_CREATION_ERROR"
             ) from e
 
+    def _user_id(self, db: Session, email: str) -> int:
+        """Id of the user with ``email``, from the identity map if possible."""
+        user_id = user_ids_by_email.get(email)
+        if user_id is not None:
+            return user_id
+        return self._lookup_user_id(db, email)
+
+    def _lookup_user_id(self, db: Session, email: str) -> int:
+        """Id of the user with ``email`` from the database, refreshing the identity map."""
+        try:
+            with user_ids_by_email.timed_load():
+                user_id = db.execute(USER_ID_BY_EMAIL, {"email": email}).scalar()
+        except SQLAlchemyError as e:
+            raise DatabaseOperationError(
+                message="Failed to fetch user from database"
+            ) from e
+        if user_id is None:
+            user_ids_by_email.delete(email)
+            raise ResourceNotFoundError("User", email)
+        user_ids_by_email.set(email, user_id)
+        return user_id
+
+    def _lookup_book_id(self, db: Session, isbn: str, require_available: bool = False) -> int:
+        """Id of the book with ``isbn`` from the database, refreshing the identity map."""
+        try:
+            with book_ids_by_isbn.timed_load():
+                book = db.execute(BOOK_BY_ISBN, {"isbn": isbn}).scalars().first()
+        except SQLAlchemyError as e:
+            raise DatabaseOperationError(
+                message="Failed to fetch book from database"
+            ) from e
+        if not book:
+            book_ids_by_isbn.delete(isbn)
+            raise ResourceNotFoundError("Book", isbn)
+        book_ids_by_isbn.set(isbn, book.id)
+        if require_available and not book.available:
+            raise ValidationError(
+                message="Book is not available"
+            )
+        return book.id
+
+    def _insert_and_claim(
+        self,
+        db: Session,
+        user_id: int,
+        book_id: int,
+        return_date: date
+    ) -> Optional[BorrowRecord]:
+        """Insert the borrow record and claim the book in one transaction.
+
+        Returns None, with nothing written, when the book was not claimable
+        or either id no longer exists.
+        """
+        try:
+            db_borrow = BorrowRecord(
+                user_id=user_id,
+                book_id=book_id,
+                borrow_date=date.today(),
+                return_date=return_date
+            )
+            # The flush assigns the borrow id the book points to as its current loan
+            db.add(db_borrow)
+            try:
+                db.flush()
+            except IntegrityError:
+                # A stale user or book id from the identity map
+                db.rollback()
+                return None
+            claimed = db.execute(CLAIM_BOOK, {
+                "book_id": book_id,
+                "user_id": user_id,
+                "borrow_id": db_borrow.id,
+                "borrow_date": db_borrow.borrow_date
+            }).first()
+            if claimed is None:
+                db.rollback()
+                return None
+            db.commit()
+            return db_borrow
+        except SQLAlchemyError as e:
+            db.rollback()
+            raise DatabaseOperationError(
+                message="Failed to create borrow record"
+            ) from e
+
 # Create instance to be imported by other modules
 message_broker = MessageBroker(settings.RABBITMQ_URL)
 borrow_service = BorrowService(message_broker) 
\ No newline at end of file
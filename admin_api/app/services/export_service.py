@@ -0,0 +1,110 @@
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.exc import SQLAlchemyError
+from datetime import date, datetime
+from enum import Enum
+from typing import Iterator, Sequence
+from ..models.user import User
+from ..models.book import Book
+from ..models.borrow import BorrowRecord
+from ..core.database import SessionLocal
+import csv
+import io
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Rows fetched per round trip and written per chunk of the response
+EXPORT_BATCH_SIZE = 1000
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv"
+}
+
+USER_COLUMNS = (User.id, User.email, User.firstname, User.lastname, User.created_at)
+
+LOAN_COLUMNS = (
+    BorrowRecord.id.label("borrow_id"),
+    BorrowRecord.borrow_date,
+    BorrowRecord.return_date,
+    User.id.label("user_id"),
+    User.email.label("user_email"),
+    Book.id.label("book_id"),
+    Book.isbn,
+    Book.title
+)
+
+class ExportService:
+    """Streams full listings as NDJSON or CSV with bounded memory.
+
+    Rows are read through a server-side cursor (``yield_per``) and encoded
+    one batch at a time, so memory does not depend on the table size. The
+    generators open their own session: they run while the response is being
+    sent, after the request's dependencies may have been cleaned up.
+    """
+    def __init__(self, session_factory: sessionmaker = SessionLocal):
+        self.session_factory = session_factory
+
+    def export_users(self, export_format: ExportFormat) -> Iterator[bytes]:
+        """Every user, ordered by id."""
+        statement = select(*USER_COLUMNS).order_by(User.id)
+        return self._stream(statement, export_format)
+
+    def export_loans(self, export_format: ExportFormat) -> Iterator[bytes]:
+        """One row per borrow record with its user and book, ordered by borrow id.
+
+        Records of deleted books are left out, as in the borrowed books listing.
+        """
+        statement = (
+            select(*LOAN_COLUMNS)
+            .join(User, BorrowRecord.user_id == User.id)
+            .join(Book, BorrowRecord.book_id == Book.id)
+            .order_by(BorrowRecord.id)
+        )
+        return self._stream(statement, export_format)
+
+    def _stream(self, statement, export_format: ExportFormat) -> Iterator[bytes]:
+        encode = self._encode_csv if export_format == ExportFormat.CSV else self._encode_ndjson
+        with self.session_factory() as db:
+            try:
+                result = db.execute(
+                    statement.execution_options(yield_per=EXPORT_BATCH_SIZE)
+                )
+                columns = list(result.keys())
+                if export_format == ExportFormat.CSV:
+                    yield self._encode_csv(columns, [columns])
+                for rows in result.partitions():
+                    yield encode(columns, rows)
+            except SQLAlchemyError as e:
+                # Headers are already sent; the client sees a truncated body
+                logger.error(f"Export aborted: {str(e)}", exc_info=True)
+                raise
+
+    @staticmethod
+    def _encode_ndjson(columns: Sequence[str], rows) -> bytes:
+        return "".join(
+            json.dumps(dict(zip(columns, row)), default=_json_default) + "\n"
+            for row in rows
+        ).encode()
+
+    @staticmethod
+    def _encode_csv(columns: Sequence[str], rows) -> bytes:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(
+            [value.isoformat() if isinstance(value, (date, datetime)) else value for value in row]
+            for row in rows
+        )
+        return buffer.getvalue().encode()
+
+def _json_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+export_service = ExportService()
@@ -0,0 +1,41 @@
+"""Precompiled statements for the hot single-row lookups.
+
+These are built once at import time with named bind parameters, so every
+call reuses the same statement object and hits SQLAlchemy's compiled cache
+instead of rebuilding a ``db.query(...).filter(...)`` chain. The SQL text is
+identical on every execution, which also lets drivers that support
+server-side prepared statements (e.g. psycopg 3) prepare them once.
+
+Usage:
+    db.execute(BOOK_BY_ISBN, {"isbn": isbn}).scalars().first()
+"""
+from sqlalchemy import select, update, bindparam
+from ..models.book import Book
+from ..models.user import User
+
+BOOK_BY_ID = select(Book).where(Book.id == bindparam("book_id"))
+BOOK_BY_ISBN = select(Book).where(Book.isbn == bindparam("isbn"))
+USER_BY_EMAIL = select(User).where(User.email == bindparam("email"))
+BOOK_ID_BY_ISBN = select(Book.id).where(Book.isbn == bindparam("isbn"))
+USER_ID_BY_EMAIL = select(User.id).where(User.email == bindparam("email"))
+
+# Conditional claim used by the borrow consumer: flips an available book to
+# unavailable and points it at its new loan in one statement. Concurrent or
+# stale claims match zero rows.
+CLAIM_BOOK = (
+    update(Book)
+    .where(Book.id == bindparam("book_id"), Book.available == True)
+    .values(
+        available=False,
+        current_borrower_id=bindparam("user_id"),
+        current_borrow_id=bindparam("borrow_id"),
+        current_borrow_date=bindparam("borrow_date")
+    )
+    .returning(Book.id)
+    .execution_options(synchronize_session=False)
+)
+
+__all__ = [
+    "BOOK_BY_ID", "BOOK_BY_ISBN", "USER_BY_EMAIL", "BOOK_ID_BY_ISBN",
+    "USER_ID_BY_EMAIL", "CLAIM_BOOK"
+]
@@ -1,15 +1,19 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from typing import List, Optional
 from ..models.user import User
 from ..models.borrow import BorrowRecord
 from ..schemas.book import BookBorrowed
 from shared.message_broker import MessageBroker
 from shared.message_types import MessageType
-from datetime import datetime
+from datetime import date, datetime
 import logging
-from shared.pagination import PaginatedResponse
+from shared.pagination import PaginatedResponse, encode_cursor, decode_cursor, keyset_filter
 from ..schemas.user import UserResponse, UserWithBorrowedBooksResponse
+from .queries import USER_BY_EMAIL
+from shared.counting import TotalCounter
+from shared.cache_registry import cache_registry
 from ..core.config import settings
+from ..core.events import local_events
 from shared.exceptions import (
     LibraryException,
     DatabaseOperationError,
@@ -20,6 +24,27 @@ from sqlalchemy.exc import SQLAlchemyError
 
 logger = logging.getLogger(__name__)
 
+# Shared by every UserService instance and dropped when a user or borrow
+# commits in this process.
+users_total = cache_registry.register(TotalCounter(
+    settings.USERS_COUNT_STRATEGY, ttl=settings.COUNT_CACHE_TTL, name="users_total"
+))
+users_with_borrowed_books_total = cache_registry.register(TotalCounter(
+    settings.BORROWED_BOOKS_COUNT_STRATEGY, ttl=settings.COUNT_CACHE_TTL,
+    name="users_with_borrowed_books_total"
+))
+
+def invalidate_users_total(data=None) -> None:
+    """Drop the cached total of the users listing."""
+    users_total.invalidate()
+
+def invalidate_borrowed_books_total(data=None) -> None:
+    """Drop the cached total of the users with borrowed books listing."""
+    users_with_borrowed_books_total.invalidate()
+
+local_events.subscribe(MessageType.USER_CREATED, invalidate_users_total)
+local_events.subscribe(MessageType.BOOK_BORROWED, invalidate_borrowed_books_total)
+
 class UserService:
     def __init__(self, message_broker: MessageBroker):
         self.message_broker = message_broker
@@ -28,7 +53,8 @@ class UserService:
         self, 
         db: Session, 
         page: int = 1, 
-        limit: int = 10
+        limit: int = 10,
+        cursor: Optional[str] = None
     ) -> PaginatedResponse[UserResponse]:
         """Get all users with pagination.
         
@@ -36,21 +62,32 @@ class UserService:
             db: Database session
             page: Current page number (1-based)
             limit: Maximum number of items per page
+            cursor: Keyset cursor on (created_at, id); overrides page
             
         Returns:
             Paginated response containing users
         """
         try:
-            skip = (page - 1) * limit
+            after = decode_cursor(cursor, datetime.fromisoformat, int) if cursor else None
             base_query = db.query(User)
             
             try:
-                total = base_query.count()
+                total, total_is_estimate = users_total.count(base_query)
+                page_query = base_query
+                skip = 0
+                if after:
+                    page = None
+                    page_query = base_query.filter(
+                        keyset_filter((User.created_at, User.id), after, descending=True)
+                    )
+                else:
+                    skip = (page - 1) * limit
+                # One extra row tells whether there is a next page
                 users = (
-                    base_query
-                    .order_by(User.created_at.desc())
+                    page_query
+                    .order_by(User.created_at.desc(), User.id.desc())
                     .offset(skip)
-                    .limit(limit)
+                    .limit(limit + 1)
                     .all()
                 )
             except SQLAlchemyError as e:
@@ -58,16 +95,23 @@ class UserService:
                     message=f"Failed to fetch users: {str(e)}"
                 ) from e
             
+            next_cursor = None
+            if len(users) > limit:
+                users = users[:limit]
+                next_cursor = encode_cursor((users[-1].created_at, users[-1].id))
+            
             user_responses = [UserResponse.model_validate(user) for user in users]
             
             return PaginatedResponse.create(
                 items=user_responses,
                 total=total,
                 page=page,
-                limit=limit
+                limit=limit,
+                next_cursor=next_cursor,
+                total_is_estimate=total_is_estimate
             )
             
-        except DatabaseOperationError:
+        except (DatabaseOperationError, ValidationError):
             raise  # Re-raise as is
         except Exception as e:
             raise LibraryException(
@@ -79,7 +123,8 @@ class UserService:
         self, 
         db: Session, 
         page: int = 1,
-        limit: int = 10
+        limit: int = 10,
+        since: Optional[date] = None
     ) -> PaginatedResponse[UserWithBorrowedBooksResponse]:
         """Get all users who have borrowed books with pagination.
         
@@ -87,6 +132,8 @@ class UserService:
             db: Database session
             page: Current page number (1-based)
             limit: Maximum number of items per page
+            since: Only consider books borrowed on or after this date; on
+                Postgres this skips the older borrow_records partitions
             
         Returns:
             Paginated response containing users with their borrowed books
@@ -94,17 +141,27 @@ class UserService:
         try:
             skip = (page - 1) * limit
             
-            base_query = (
-                db.query(User)
-                .join(BorrowRecord)
-                .distinct()
-            )
+            borrow_records = User.borrow_records
+            base_query = db.query(User).join(BorrowRecord)
+            if since:
+                base_query = base_query.filter(BorrowRecord.borrow_date >= since)
+                borrow_records = User.borrow_records.and_(BorrowRecord.borrow_date >= since)
+            base_query = base_query.distinct()
             
             try:
-                total = base_query.count()
+                total, total_is_estimate = users_with_borrowed_books_total.count(
+                    base_query, key=since
+                )
+                # Borrow records and their books are loaded for the whole page
+                # in one extra query instead of one query per user. The inner
+                # join keeps records of deleted books out, as before.
                 users = (
                     base_query
-                    .order_by(User.created_at.desc())
+                    .options(
+                        selectinload(borrow_records)
+                        .joinedload(BorrowRecord.book, innerjoin=True)
+                    )
+                    .order_by(User.created_at.desc(), User.id.desc())
                     .offset(skip)
                     .limit(limit)
                     .all()
@@ -115,21 +172,9 @@ class UserService:
                 ) from e
             
             for user in users:
-                try:
-                    borrow_records = (
-                        db.query(BorrowRecord)
-                        .filter(BorrowRecord.user_id == user.id)
-                        .join(BorrowRecord.book)
-                        .all()
-                    )
-                except SQLAlchemyError as e:
-                    raise DatabaseOperationError(
-                        message="Failed to fetch borrow records"
-                    ) from e
-                
                 user.borrowed_books = [
                     self._create_book_borrowed_dto(record, user)
-                    for record in borrow_records
+                    for record in user.borrow_records
                 ]
             
             user_responses = [
@@ -141,7 +186,8 @@ class UserService:
                 items=user_responses,
                 total=total,
                 page=page,
-                limit=limit
+                limit=limit,
+                total_is_estimate=total_is_estimate
             )
             
         except DatabaseOperationError:
@@ -208,6 +254,10 @@ class UserService:
                 db.add(db_user)
                 db.commit()
                 db.refresh(db_user)
+                local_events.publish(
+                    MessageType.USER_CREATED,
+                    {"id": db_user.id, "email": db_user.email}
+                )
                 
                 return db_user
                 
@@ -229,7 +279,7 @@ class UserService:
     def get_user_by_email(self, db: Session, email: str) -> Optional[User]:
         """Get a user by email."""
         try:
-            return db.query(User).filter(User.email == email).first()
+            return db.execute(USER_BY_EMAIL, {"email": email}).scalars().first()
         except SQLAlchemyError as e:
             raise LibraryException(
                 message=f"An unexpected error occurred while fetching user by email: {str(e)}",
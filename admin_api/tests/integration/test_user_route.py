@@ -59,4 +59,16 @@ class TestUserEndpoints:
         assert "items" in data
         assert "total" in data
         assert data["total"] >= 1  # At least our test user should be there
-        assert len(data["items"][0]["borrowed_books"]) >= 1  # User should have at least one borrowed book 
\ No newline at end of file
+        assert len(data["items"][0]["borrowed_books"]) >= 1  # User should have at least one borrowed book 
+
+    @pytest.mark.asyncio
+    async def test_export_users(self, client: AsyncClient, test_user: User):
+        response = await client.get("/api/v1/users/export", params={"format": "csv"})
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        assert response.text.splitlines()[0] == "id,email,firstname,lastname,created_at"
+        assert test_user.email in response.text
+
+        response = await client.get("/api/v1/users/export")
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert test_user.email in response.text
@@ -3,6 +3,15 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from app.core.database import Base
 from app.models.book import Book
+# Imported for their module-level caches, which register themselves
+from app.services import book_service, user_service, borrow_service
+from shared.cache_registry import cache_registry
+
+@pytest.fixture(autouse=True)
+def reset_count_caches():
+    # Cached totals and ids are module-level and would leak between databases
+    cache_registry.clear()
+    yield
 
 @pytest.fixture(scope="function")
 def db_session():
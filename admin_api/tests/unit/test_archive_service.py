@@ -0,0 +1,144 @@
+import gzip
+import json
+import pytest
+from datetime import date, timedelta
+from unittest.mock import AsyncMock
+from sqlalchemy.orm import Session
+from app.services import archive_service as archive_service_module
+from app.services.archive_service import ArchiveService
+from app.schemas.borrow import ArchivedLoan
+from shared.exceptions import DatabaseOperationError
+from app.services.book_service import BookService
+from app.models.user import User
+from app.models.book import Book
+from app.models.borrow import BorrowRecord
+
+TODAY = date(2025, 6, 1)
+
+class TestArchiveService:
+    @pytest.fixture
+    def archive_service(self, tmp_path):
+        return ArchiveService(archive_dir=str(tmp_path), archive_after_days=365)
+
+    @pytest.fixture
+    def loans(self, db_session: Session):
+        users = [
+            User(email=f"test{i}@example.com", firstname=f"Test{i}", lastname=f"User{i}")
+            for i in range(2)
+        ]
+        book = Book(title="Test Book", author="Test Author", isbn="123",
+                    publisher="Test Publisher", category="Test Category", available=False)
+        db_session.add_all(users + [book])
+        db_session.flush()
+
+        def loan(user, returned):
+            record = BorrowRecord(user_id=user.id, book_id=book.id,
+                                  borrow_date=returned - timedelta(days=14), return_date=returned)
+            db_session.add(record)
+            return record
+
+        old = [loan(users[0], date(2023, 1, 15)), loan(users[1], date(2023, 3, 1)),
+               loan(users[0], date(2024, 5, 1))]
+        recent = loan(users[0], date(2025, 1, 1))
+        # An old loan that is still the book's current loan stays in the table
+        current = loan(users[1], date(2024, 1, 1))
+        db_session.flush()
+        book.current_borrow_id = current.id
+        book.current_borrow_date = current.borrow_date
+        db_session.commit()
+        # Ids only: archived rows are deleted from the session's database
+        return (
+            [user.id for user in users],
+            [record.id for record in old],
+            recent.id,
+            current.id
+        )
+
+    def test_archive_moves_closed_loans(self, archive_service, db_session: Session, loans, tmp_path):
+        users, old, recent, current = loans
+
+        run = archive_service.archive_closed_loans(db_session, today=TODAY)
+
+        assert run.archived == 3
+        remaining = {record.id for record in db_session.query(BorrowRecord).all()}
+        assert remaining == {recent, current}
+
+        index = json.loads((tmp_path / "index.json").read_text())
+        assert index["segments"] == [{
+            "file": run.segment,
+            "rows": 3,
+            "min_borrow_date": "2023-01-01",
+            "max_borrow_date": "2024-04-17",
+            "user_ids": users
+        }]
+        with gzip.open(tmp_path / run.segment, "rt") as segment:
+            rows = [json.loads(line) for line in segment]
+        assert [row["borrow_id"] for row in rows] == old
+        assert rows[0]["user_email"] == "test0@example.com"
+        assert rows[0]["isbn"] == "123"
+
+    @pytest.mark.asyncio
+    async def test_archive_keeps_loans_of_deleted_books(self, archive_service, db_session: Session, tmp_path):
+        user = User(email="test@example.com", firstname="Test", lastname="User")
+        book = Book(title="Test Book", author="Test Author", isbn="123",
+                    publisher="Test Publisher", category="Test Category", available=True)
+        db_session.add_all([user, book])
+        db_session.flush()
+        db_session.add(BorrowRecord(user_id=user.id, book_id=book.id,
+                                    borrow_date=date(2023, 1, 1), return_date=date(2023, 1, 15)))
+        db_session.commit()
+        # Deleting the book sets book_id of its old loans to NULL
+        await BookService(AsyncMock()).delete_book(db_session, book.id)
+
+        run = archive_service.archive_closed_loans(db_session, today=TODAY)
+
+        assert run.archived == 1
+        with gzip.open(tmp_path / run.segment, "rt") as segment:
+            row = json.loads(segment.readline())
+        assert row["book_id"] is None and row["isbn"] is None
+        assert row["user_id"] == user.id
+
+    def test_archive_leaves_loans_without_borrow_date(self, archive_service, db_session: Session, loans, tmp_path):
+        users, old, recent, current = loans
+        undated = BorrowRecord(user_id=users[0], return_date=date(2023, 2, 1))
+        db_session.add(undated)
+        db_session.flush()
+        # As left by loans recorded before the borrow date was always set
+        db_session.query(BorrowRecord).filter(BorrowRecord.id == undated.id).update({"borrow_date": None})
+        db_session.commit()
+
+        run = archive_service.archive_closed_loans(db_session, today=TODAY)
+
+        assert run.archived == 3
+        assert db_session.get(BorrowRecord, undated.id) is not None
+        assert not list(tmp_path.glob("*.partial"))
+
+    def test_archive_removes_partial_segment_on_invalid_row(self, archive_service, db_session: Session, loans, tmp_path, monkeypatch):
+        def invalid_loan(**row):
+            return ArchivedLoan(**{**row, "return_date": None})
+        monkeypatch.setattr(archive_service_module, "ArchivedLoan", invalid_loan)
+
+        with pytest.raises(DatabaseOperationError):
+            archive_service.archive_closed_loans(db_session, today=TODAY)
+
+        assert not list(tmp_path.glob("*.partial")) and not list(tmp_path.glob("*.gz"))
+        assert db_session.query(BorrowRecord).count() == 5
+
+    def test_archive_without_closed_loans_writes_nothing(self, archive_service, db_session: Session, tmp_path):
+        run = archive_service.archive_closed_loans(db_session, today=TODAY)
+
+        assert run.archived == 0
+        assert run.segment is None
+        assert not list(tmp_path.glob("*.gz"))
+
+    def test_get_user_loans_reads_matching_segments(self, archive_service, db_session: Session, loans):
+        users, old, recent, current = loans
+        archive_service.archive_closed_loans(db_session, today=TODAY)
+        # A second run with a later horizon adds a segment
+        archive_service.archive_closed_loans(db_session, today=TODAY + timedelta(days=365))
+
+        history = archive_service.get_user_loans(users[0])
+
+        assert [loan.borrow_id for loan in history] == [old[0], old[2], recent]
+        assert archive_service.get_user_loans(users[1])[0].borrow_id == old[1]
+        assert archive_service.get_user_loans(999) == []
@@ -1,6 +1,8 @@
 import pytest
-from unittest.mock import AsyncMock, patch
-from app.services.book_service import BookService
+from unittest.mock import AsyncMock, MagicMock, patch
+from app.services.book_service import BookService, ensure_book_schema
+from app.core.events import local_events
+from shared.message_types import MessageType
 from app.models.book import Book
 from app.models.borrow import BorrowRecord
 from app.schemas.book import BookCreate
@@ -42,6 +44,46 @@ class TestBookService:
         assert db_book is not None
         assert db_book.title == "Test Book"
 
+    @pytest.mark.asyncio
+    async def test_create_books_skips_existing_and_duplicate_isbns(self, db_session: Session, mock_message_broker):
+        # Create service instance
+        book_service = BookService(mock_message_broker)
+        
+        # Existing book
+        db_session.add(Book(
+            title="Existing Book",
+            author="Test Author",
+            isbn="111-111-111",
+            publisher="Test Publisher",
+            category="Test Category"
+        ))
+        db_session.commit()
+        
+        def book_create(title, isbn):
+            return BookCreate(
+                title=title,
+                author="Test Author",
+                isbn=isbn,
+                publisher="Test Publisher",
+                category="Test Category"
+            )
+        
+        # Create books: one existing ISBN and one ISBN repeated in the payload
+        created_books = await book_service.create_books(db_session, [
+            book_create("Existing Book Again", "111-111-111"),
+            book_create("New Book", "222-222-222"),
+            book_create("New Book Duplicate", "222-222-222"),
+        ])
+        
+        # Verify one new book plus the existing one are returned
+        assert sorted(book.isbn for book in created_books) == ["111-111-111", "222-222-222"]
+        assert db_session.query(Book).count() == 2
+        
+        # Verify only the new book was published
+        published_books = mock_message_broker.publish.call_args.args[1]
+        assert [book["isbn"] for book in published_books] == ["222-222-222"]
+        assert published_books[0]["title"] == "New Book"
+
     @pytest.mark.asyncio
     async def test_get_book(self, db_session: Session, mock_message_broker):
         # Create service instance
@@ -130,4 +172,88 @@ class TestBookService:
         # Verify response
         assert paginated_response.total == 1
         assert len(paginated_response.items) == 1
-        assert paginated_response.items[0].isbn == "123-456-789"
\ No newline at end of file
+        assert paginated_response.items[0].isbn == "123-456-789"
+
+    @pytest.mark.asyncio
+    async def test_get_unavailable_books_total_invalidated_on_borrow(self, db_session: Session, mock_message_broker):
+        book_service = BookService(mock_message_broker)
+        assert (await book_service.get_unavailable_books(db_session)).total == 0
+
+        db_session.add(Book(
+            title="Test Book",
+            author="Test Author",
+            isbn="123-456-789",
+            publisher="Test Publisher",
+            category="Test Category",
+            available=False
+        ))
+        db_session.commit()
+        # Cached until a borrow or deletion is published
+        assert (await book_service.get_unavailable_books(db_session)).total == 0
+
+        local_events.publish(MessageType.BOOK_BORROWED, {"book_isbn": "123-456-789"})
+        assert (await book_service.get_unavailable_books(db_session)).total == 1
+
+    @pytest.mark.asyncio
+    async def test_get_unavailable_books_lists_current_loan_only(self, db_session: Session, mock_message_broker):
+        book_service = BookService(mock_message_broker)
+        book = Book(
+            title="Test Book",
+            author="Test Author",
+            isbn="123-456-789",
+            publisher="Test Publisher",
+            category="Test Category",
+            available=False
+        )
+        db_session.add(book)
+        db_session.flush()
+
+        # Two earlier loans that would each have matched the old join
+        today = datetime.now().date()
+        for weeks in (8, 4):
+            db_session.add(BorrowRecord(
+                book_id=book.id,
+                user_id=1,
+                borrow_date=today - timedelta(weeks=weeks),
+                return_date=today + timedelta(days=30)
+            ))
+        current = BorrowRecord(
+            book_id=book.id,
+            user_id=2,
+            borrow_date=today,
+            return_date=today + timedelta(days=14)
+        )
+        db_session.add(current)
+        db_session.flush()
+        book.current_borrow_id = current.id
+        book.current_borrow_date = current.borrow_date
+        db_session.commit()
+
+        paginated_response = await book_service.get_unavailable_books(db_session, page=1, limit=10)
+
+        assert paginated_response.total == 1
+        assert len(paginated_response.items) == 1
+        assert paginated_response.items[0].borrow_date == today
+        assert paginated_response.items[0].return_date == today + timedelta(days=14)
+
+    def test_ensure_book_schema_upgrades_existing_tables(self, db_session: Session):
+        engine = MagicMock()
+        engine.dialect.name = "postgresql"
+        connection = engine.begin.return_value.__enter__.return_value
+
+        ensure_book_schema(engine)
+
+        statements = [str(call.args[0]) for call in connection.execute.call_args_list]
+        for column in ("current_borrow_id", "current_borrow_date", "current_borrower_id"):
+            assert any(f"ADD COLUMN IF NOT EXISTS {column} " in sql for sql in statements)
+        assert "ix_books_available_id" in {index.name for index in Book.__table__.indexes}
+        assert any(
+            "CREATE INDEX IF NOT EXISTS ix_books_available_id ON books (available, id)" in sql
+            for sql in statements
+        )
+        # The backfills only touch books that have no current loan or borrower yet
+        assert "current_borrow_id IS NULL" in statements[-2]
+        assert "current_borrower_id IS NULL" in statements[-1]
+
+        # Other databases get the columns from create_all
+        ensure_book_schema(db_session.get_bind())
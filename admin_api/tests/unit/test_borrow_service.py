@@ -1,12 +1,17 @@
 import pytest
 from unittest.mock import AsyncMock
 from datetime import date
+from sqlalchemy import event, text
 from sqlalchemy.orm import Session
-from app.services.borrow_service import BorrowService
+from app.services.borrow_service import BorrowService, book_ids_by_isbn, user_ids_by_email
+from app.services.book_service import BookService
+from app.services.user_service import UserService
+from app.schemas.book import BookCreate
 from app.models.book import Book
 from app.models.user import User
 from app.models.borrow import BorrowRecord
 from shared.exceptions import ResourceNotFoundError, ValidationError
+from shared.cache_registry import cache_registry
 
 class TestBorrowService:
     @pytest.fixture
@@ -62,6 +67,8 @@ class TestBorrowService:
         db_session.refresh(test_book)
         assert test_book.available == False
         assert test_book.current_borrower_id == test_user.id
+        assert test_book.current_borrow_id == borrow_record.id
+        assert test_book.current_borrow_date == borrow_record.borrow_date
 
     @pytest.mark.asyncio
     async def test_create_borrow_record_unavailable_book(self, db_session: Session, mock_message_broker, test_book, test_user):
@@ -113,4 +120,95 @@ class TestBorrowService:
         
         # Verify borrow attempt raises ResourceNotFoundError
         with pytest.raises(ResourceNotFoundError, match="User with identifier nonexistent@example.com not found"):
-            await borrow_service.create_borrow_record(db_session, borrow_data) 
\ No newline at end of file
+            await borrow_service.create_borrow_record(db_session, borrow_data)
+
+    @pytest.mark.asyncio
+    async def test_create_borrow_record_uses_identity_map(self, db_session: Session, mock_message_broker):
+        # Users and books created through the services fill the identity map
+        await UserService(mock_message_broker).create_user_from_frontend(
+            db_session, {"email": "reader@example.com", "firstname": "Test", "lastname": "Reader"}
+        )
+        await BookService(mock_message_broker).create_books(db_session, [BookCreate(
+            title="Test Book", author="Test Author", isbn="123-456-789",
+            publisher="Test Publisher", category="Test Category"
+        )])
+        borrow_service = BorrowService(mock_message_broker)
+        
+        statements = []
+        def count_statement(*args):
+            statements.append(args[2])
+        
+        engine = db_session.get_bind()
+        event.listen(engine, "before_cursor_execute", count_statement)
+        try:
+            await borrow_service.create_borrow_record(db_session, {
+                "user_email": "reader@example.com",
+                "book_isbn": "123-456-789",
+                "return_date": date.today().isoformat()
+            })
+        finally:
+            event.remove(engine, "before_cursor_execute", count_statement)
+        
+        # Only the borrow record insert and the book claim
+        assert [statement.split()[0] for statement in statements] == ["INSERT", "UPDATE"]
+        book = db_session.query(Book).filter(Book.isbn == "123-456-789").one()
+        assert book.available == False
+        assert book.current_borrow_id == db_session.query(BorrowRecord).one().id
+
+    @pytest.mark.asyncio
+    async def test_create_borrow_record_recovers_from_stale_book_id(self, db_session: Session, mock_message_broker, test_book, test_user):
+        # E.g. the book was deleted and recreated by another worker
+        book_ids_by_isbn.set(test_book.isbn, test_book.id + 100)
+        borrow_service = BorrowService(mock_message_broker)
+        
+        borrow_record = await borrow_service.create_borrow_record(db_session, {
+            "user_email": test_user.email,
+            "book_isbn": test_book.isbn,
+            "return_date": date.today()
+        })
+        
+        assert borrow_record.book_id == test_book.id
+        assert book_ids_by_isbn.get(test_book.isbn) == test_book.id
+        assert db_session.query(BorrowRecord).count() == 1
+
+    @pytest.mark.asyncio
+    async def test_create_borrow_record_recovers_from_ids_failing_foreign_keys(self, db_session: Session, mock_message_broker, test_book, test_user):
+        # The borrow record insert runs before the claim, so stale ids hit its foreign keys
+        db_session.execute(text("PRAGMA foreign_keys=ON"))
+        book_ids_by_isbn.set(test_book.isbn, test_book.id + 100)
+        user_ids_by_email.set(test_user.email, test_user.id + 100)
+        borrow_service = BorrowService(mock_message_broker)
+
+        borrow_record = await borrow_service.create_borrow_record(db_session, {
+            "user_email": test_user.email,
+            "book_isbn": test_book.isbn,
+            "return_date": date.today()
+        })
+
+        assert (borrow_record.user_id, borrow_record.book_id) == (test_user.id, test_book.id)
+        assert user_ids_by_email.get(test_user.email) == test_user.id
+        assert book_ids_by_isbn.get(test_book.isbn) == test_book.id
+        assert db_session.query(BorrowRecord).count() == 1
+
+    @pytest.mark.asyncio
+    async def test_identity_map_lookups_are_reported(self, db_session: Session, mock_message_broker, test_book, test_user):
+        borrow_service = BorrowService(mock_message_broker)
+        before = cache_registry.stats()["user_ids_by_email"]
+
+        await borrow_service.create_borrow_record(db_session, {
+            "user_email": test_user.email,
+            "book_isbn": test_book.isbn,
+            "return_date": date.today()
+        })
+        with pytest.raises(ResourceNotFoundError):
+            await borrow_service.create_borrow_record(db_session, {
+                "user_email": "unknown@example.com",
+                "book_isbn": test_book.isbn,
+                "return_date": date.today()
+            })
+
+        stats = cache_registry.stats()["user_ids_by_email"]
+        assert stats["misses"] == before["misses"] + 2
+        assert stats["loads"] == before["loads"] + 2
+        assert stats["max_load_ms"] > 0
+        assert stats["size"] == 1 and stats["bytes"] > 0
@@ -0,0 +1,65 @@
+import csv
+import io
+import json
+import pytest
+from datetime import date, datetime
+from sqlalchemy.orm import Session, sessionmaker
+from app.services import export_service as export_module
+from app.services.export_service import ExportService, ExportFormat
+from app.models.user import User
+from app.models.book import Book
+from app.models.borrow import BorrowRecord
+
+class TestExportService:
+    @pytest.fixture
+    def export_service(self, db_session: Session):
+        return ExportService(sessionmaker(bind=db_session.get_bind()))
+
+    @pytest.fixture
+    def loans(self, db_session: Session):
+        user = User(email="test@example.com", firstname="Test", lastname="User",
+                    created_at=datetime(2024, 1, 2, 3, 4, 5))
+        book = Book(title="Test Book", author="Test Author", isbn="123",
+                    publisher="Test Publisher", category="Test Category", available=False)
+        db_session.add_all([user, book])
+        db_session.flush()
+        db_session.add(BorrowRecord(user_id=user.id, book_id=book.id,
+                                    borrow_date=date(2024, 2, 1), return_date=date(2024, 2, 15)))
+        # A record of a deleted book is left out
+        db_session.add(BorrowRecord(user_id=user.id, book_id=book.id + 1,
+                                    borrow_date=date(2024, 1, 1), return_date=date(2024, 1, 15)))
+        db_session.commit()
+        return user, book
+
+    def test_export_users_ndjson_in_batches(self, export_service, db_session: Session, monkeypatch):
+        monkeypatch.setattr(export_module, "EXPORT_BATCH_SIZE", 2)
+        db_session.add_all(
+            User(email=f"test{i}@example.com", firstname=f"Test{i}", lastname=f"User{i}",
+                 created_at=datetime(2024, 1, 1))
+            for i in range(5)
+        )
+        db_session.commit()
+
+        chunks = list(export_service.export_users(ExportFormat.NDJSON))
+
+        assert len(chunks) == 3
+        rows = [json.loads(line) for line in b"".join(chunks).decode().splitlines()]
+        assert [row["email"] for row in rows] == [f"test{i}@example.com" for i in range(5)]
+        assert rows[0]["created_at"] == "2024-01-01T00:00:00"
+
+    def test_export_loans_csv(self, export_service, loans):
+        user, book = loans
+
+        body = b"".join(export_service.export_loans(ExportFormat.CSV)).decode()
+
+        rows = list(csv.DictReader(io.StringIO(body)))
+        assert len(rows) == 1
+        assert rows[0]["user_email"] == user.email
+        assert rows[0]["isbn"] == book.isbn
+        assert rows[0]["borrow_date"] == "2024-02-01"
+        assert rows[0]["return_date"] == "2024-02-15"
+
+    def test_export_empty_csv_has_header(self, export_service):
+        body = b"".join(export_service.export_users(ExportFormat.CSV)).decode()
+
+        assert body.splitlines() == ["id,email,firstname,lastname,created_at"]
@@ -1,11 +1,13 @@
 import pytest
 from unittest.mock import AsyncMock
+from sqlalchemy import event
 from sqlalchemy.orm import Session
-from app.services.user_service import UserService
+from app.services.user_service import UserService, invalidate_borrowed_books_total
 from app.models.user import User
 from app.models.borrow import BorrowRecord
 from app.models.book import Book
-from datetime import datetime
+from datetime import date, datetime
+from shared.exceptions import ValidationError
 
 class TestUserService:
     @pytest.fixture
@@ -35,6 +37,37 @@ class TestUserService:
         assert result.page == 1
         assert result.limit == 2
 
+    @pytest.mark.asyncio
+    async def test_get_users_cursor_pagination(self, db_session: Session, mock_message_broker):
+        # Create service instance
+        user_service = UserService(mock_message_broker)
+        
+        # Create users sharing a created_at so the id tie-breaker matters
+        created_at = datetime.utcnow()
+        for i in range(5):
+            db_session.add(User(email=f"test{i}@example.com", firstname=f"Test{i}", lastname=f"User{i}", created_at=created_at))
+        db_session.commit()
+        
+        # Walk all pages by cursor
+        result = await user_service.get_users(db_session, page=1, limit=2)
+        emails = [user.email for user in result.items]
+        while result.next_cursor:
+            result = await user_service.get_users(db_session, limit=2, cursor=result.next_cursor)
+            assert result.page is None
+            emails.extend(user.email for user in result.items)
+        
+        # Verify every user was returned exactly once
+        assert sorted(emails) == [f"test{i}@example.com" for i in range(5)]
+        assert len(emails) == 5
+
+    @pytest.mark.asyncio
+    async def test_get_users_invalid_cursor(self, db_session: Session, mock_message_broker):
+        # Create service instance
+        user_service = UserService(mock_message_broker)
+        
+        with pytest.raises(ValidationError):
+            await user_service.get_users(db_session, cursor="bm90LWEtY3Vyc29y")
+
     @pytest.mark.asyncio
     async def test_get_users_with_borrowed_books(self, db_session: Session, mock_message_broker):
         # Create service instance
@@ -76,6 +109,98 @@ class TestUserService:
         assert len(result.items[0].borrowed_books) == 1
         assert result.items[0].borrowed_books[0].isbn == "123-456-789"
 
+    @pytest.mark.asyncio
+    async def test_get_users_with_borrowed_books_since(self, db_session: Session, mock_message_broker):
+        user_service = UserService(mock_message_broker)
+        users = [
+            User(email=f"test{i}@example.com", firstname=f"Test{i}", lastname=f"User{i}", created_at=datetime.utcnow())
+            for i in range(2)
+        ]
+        db_session.add_all(users)
+        db_session.flush()
+        # The first user has an old and a recent loan, the second only an old one
+        for user, borrow_dates in zip(users, ([date(2024, 1, 5), date(2024, 6, 5)], [date(2024, 2, 5)])):
+            for borrow_date in borrow_dates:
+                book = Book(
+                    title=f"Test Book {borrow_date}",
+                    author="Test Author",
+                    isbn=f"{user.id}-{borrow_date}",
+                    publisher="Test Publisher",
+                    category="Test Category"
+                )
+                db_session.add(book)
+                db_session.flush()
+                db_session.add(BorrowRecord(
+                    user_id=user.id,
+                    book_id=book.id,
+                    borrow_date=borrow_date,
+                    return_date=borrow_date
+                ))
+        db_session.commit()
+
+        result = await user_service.get_users_with_borrowed_books(
+            db_session, page=1, limit=10, since=date(2024, 6, 1)
+        )
+
+        assert result.total == 1
+        assert [item.email for item in result.items] == ["test0@example.com"]
+        assert [book.borrow_date for book in result.items[0].borrowed_books] == [date(2024, 6, 5)]
+
+        # The total for all dates is cached separately
+        result = await user_service.get_users_with_borrowed_books(db_session, page=1, limit=10)
+        assert result.total == 2
+
+    @pytest.mark.asyncio
+    async def test_get_users_with_borrowed_books_query_count_is_constant(self, db_session: Session, mock_message_broker):
+        # Create service instance
+        user_service = UserService(mock_message_broker)
+        
+        # Create 12 users with two borrowed books each
+        for i in range(12):
+            user = User(email=f"test{i}@example.com", firstname=f"Test{i}", lastname=f"User{i}", created_at=datetime.utcnow())
+            db_session.add(user)
+            db_session.flush()
+            for j in range(2):
+                book = Book(
+                    title=f"Test Book {i}-{j}",
+                    author="Test Author",
+                    isbn=f"{i}-{j}",
+                    publisher="Test Publisher",
+                    category="Test Category"
+                )
+                db_session.add(book)
+                db_session.flush()
+                db_session.add(BorrowRecord(
+                    user_id=user.id,
+                    book_id=book.id,
+                    borrow_date=datetime.utcnow(),
+                    return_date=datetime.utcnow()
+                ))
+        db_session.commit()
+        
+        # Count the statements issued for a small and a large page
+        statements = []
+        def count_statement(*args):
+            statements.append(args[2])
+        
+        engine = db_session.get_bind()
+        event.listen(engine, "before_cursor_execute", count_statement)
+        try:
+            query_counts = []
+            for limit in (2, 10):
+                db_session.expire_all()
+                invalidate_borrowed_books_total()
+                statements.clear()
+                result = await user_service.get_users_with_borrowed_books(db_session, page=1, limit=limit)
+                assert len(result.items) == limit
+                assert all(len(item.borrowed_books) == 2 for item in result.items)
+                query_counts.append(len(statements))
+        finally:
+            event.remove(engine, "before_cursor_execute", count_statement)
+        
+        # Verify the page size does not change the number of queries
+        assert query_counts[0] == query_counts[1]
+
     def test_get_user_by_email(self, db_session: Session, mock_message_broker):
         # Create service instance
         user_service = UserService(mock_message_broker)
@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from .routes import users, books, borrow, health
+from .routes import users, books, borrow, health, internal
 
 api_router = APIRouter()
 
@@ -7,3 +7,5 @@ api_router.include_router(users.router, prefix="/users", tags=["users"])
 api_router.include_router(books.router, prefix="/books", tags=["books"])
 api_router.include_router(borrow.router, prefix="/borrow", tags=["borrow"])
 api_router.include_router(health.router, tags=["health"])
+# Operational data, left out of the public API docs
+api_router.include_router(internal.router, prefix="/internal", tags=["internal"], include_in_schema=False)
@@ -1,12 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, Path
+from fastapi import APIRouter, Depends, HTTPException, Query, Path, Request, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from ...core.config import settings
 from ...core.database import get_db
-from ...schemas.book import BookResponse, BookList, BookCreate, BookDetail
+from ...schemas.book import BookResponse, BookList, BookCreate, BookDetail, BookFacets, BookSuggestion
 from ...services.book_service import BookService
+from ...services.facet_service import FacetService, facet_service
+from ...services.search_service import SearchService, search_service
+from ...services.autocomplete_service import AutocompleteService, autocomplete_service
 from shared.message_broker import MessageBroker
 from shared.pagination import PaginatedResponse
+from shared.http_cache import cache_headers, etag_matches, stale_headers
+from shared.exceptions import ValidationError, ResourceNotFoundError
 
 router = APIRouter()
 
@@ -16,46 +21,146 @@ def get_book_service():
 
 @router.get("/", response_model=PaginatedResponse[BookList])
 def list_available_books(
+    request: Request,
     page: int = 1,
     limit: int = 10,
-    publisher: Optional[str] = None,
-    category: Optional[str] = None,
+    publisher: Optional[List[str]] = Query(None, description="Publisher to include; repeat for several"),
+    category: Optional[List[str]] = Query(None, description="Category to include; repeat for several"),
+    author: Optional[List[str]] = Query(None, description="Author to include; repeat for several"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor; overrides page"),
     db: Session = Depends(get_db),
     book_service: BookService = Depends(get_book_service)
 ):
-    """List available books with optional filtering and pagination."""
-    return book_service.get_books(db, page=page, limit=limit, publisher=publisher, category=category)
+    """List available books with optional filtering and pagination.
+
+    Filters can be repeated, e.g. ``?publisher=A&publisher=B&category=X``
+    returns available books from publisher A or B in category X.
+
+    Responses carry an ETag; a request whose If-None-Match still matches
+    gets 304 without a database query. A stale page served while the
+    database is slow or failing has Age and X-Cache-Stale instead.
+    """
+    try:
+        etag = book_service.books_etag(
+            page=page, limit=limit, publisher=publisher, category=category,
+            author=author, cursor=cursor
+        )
+        headers = cache_headers(etag, settings.CATALOG_HTTP_MAX_AGE)
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+        # Already encoded, so the response model is not validated again
+        result = book_service.get_books_body(
+            db, page=page, limit=limit, publisher=publisher, category=category,
+            author=author, cursor=cursor
+        )
+        if result.stale:
+            headers = stale_headers(result.age, result.stale)
+        return Response(content=result.body, media_type="application/json", headers=headers)
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=e.message)
+
+def get_facet_service():
+    return facet_service
+
+# Fixed paths are declared before /{book_id} so they are not parsed as ids
+@router.get("/facets", response_model=BookFacets)
+def get_book_facets(
+    db: Session = Depends(get_db),
+    facet_service: FacetService = Depends(get_facet_service)
+):
+    """Get the number of available books per publisher and per category."""
+    return facet_service.get_facets(db)
+
+def get_search_service():
+    return search_service
+
+@router.get("/search", response_model=PaginatedResponse[BookList])
+def search_books(
+    q: str = Query(..., min_length=1, max_length=200, description="Words to find in titles and authors"),
+    page: int = Query(1, ge=1),
+    limit: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_db),
+    search_service: SearchService = Depends(get_search_service)
+):
+    """Search available books by title and author, best matches first."""
+    try:
+        return search_service.search_books(db, q, page=page, limit=limit)
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=e.message)
+
+def get_autocomplete_service():
+    return autocomplete_service
+
+@router.get("/autocomplete", response_model=List[BookSuggestion])
+def autocomplete_books(
+    prefix: str = Query(..., min_length=1, max_length=100, description="Start of a title or author word"),
+    limit: int = Query(10, ge=1, le=50),
+    autocomplete_service: AutocompleteService = Depends(get_autocomplete_service)
+):
+    """Suggest books whose title or author has a word starting with prefix."""
+    return autocomplete_service.suggest(prefix, limit=limit)
 
 @router.get("/{book_id}", response_model=BookDetail)
 def get_book(
+    request: Request,
     book_id: int = Path(..., description="Book ID"),
     db: Session = Depends(get_db),
     book_service: BookService = Depends(get_book_service)
 ):
-    """Get detailed information about a specific book."""
-    book = book_service.get_book(db, book_id=book_id)
-    if not book:
+    """Get detailed information about a specific book.
+
+    Responses carry an ETag; a request whose If-None-Match still matches
+    gets 304 without a database query. A stale detail served while the
+    database is slow or failing has Age and X-Cache-Stale instead.
+    """
+    etag = book_service.book_etag(book_id)
+    headers = cache_headers(etag, settings.CATALOG_HTTP_MAX_AGE)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    try:
+        result = book_service.get_book_body(db, book_id=book_id)
+    except ResourceNotFoundError:
         raise HTTPException(status_code=404, detail="Book not found")
-    return BookDetail.model_validate(book)
+    if result.stale:
+        headers = stale_headers(result.age, result.stale)
+    return Response(content=result.body, media_type="application/json", headers=headers)
 
 @router.get("/publishers/{publisher}/", response_model=PaginatedResponse[BookResponse])
-async def filter_books_by_publisher(
+def filter_books_by_publisher(
     publisher: str, 
+    response: Response,
     page: int = 1,
     limit: int = 10,
     db: Session = Depends(get_db),
     book_service: BookService = Depends(get_book_service)
 ):
-    """Get books filtered by publisher with pagination."""
-    return await book_service.get_books_by_publisher(db, publisher, page=page, limit=limit)
+    """Get books filtered by publisher with pagination.
+
+    A stale page served while the database is slow or failing has Age and
+    X-Cache-Stale.
+    """
+    # Sync, so the query runs in the threadpool and concurrent misses coalesce
+    result = book_service.get_books_by_page(db, "publisher", publisher, page=page, limit=limit)
+    if result.stale:
+        response.headers.update(stale_headers(result.age, result.stale))
+    return result.page
 
 @router.get("/categories/{category}/", response_model=PaginatedResponse[BookResponse])
-async def filter_books_by_category(
+def filter_books_by_category(
     category: str, 
+    response: Response,
     page: int = 1,
     limit: int = 10,
     db: Session = Depends(get_db),
     book_service: BookService = Depends(get_book_service)
 ):
-    """Get books filtered by category with pagination."""
-    return await book_service.get_books_by_category(db, category, page=page, limit=limit)
+    """Get books filtered by category with pagination.
+
+    A stale page served while the database is slow or failing has Age and
+    X-Cache-Stale.
+    """
+    # Sync, so the query runs in the threadpool and concurrent misses coalesce
+    result = book_service.get_books_by_page(db, "category", category, page=page, limit=limit)
+    if result.stale:
+        response.headers.update(stale_headers(result.age, result.stale))
+    return result.page
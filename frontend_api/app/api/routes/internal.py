@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from typing import Optional
+from ...core.config import settings
+from shared.cache_registry import cache_registry
+import secrets
+
+def require_internal_token(x_internal_token: Optional[str] = Header(None)):
+    """Hide the internal endpoints unless X-Internal-Token matches INTERNAL_API_TOKEN."""
+    expected = settings.INTERNAL_API_TOKEN
+    if not expected or not x_internal_token or not secrets.compare_digest(x_internal_token, expected):
+        raise HTTPException(status_code=404, detail="Not Found")
+
+router = APIRouter(dependencies=[Depends(require_internal_token)])
+
+@router.get("/caches")
+def get_cache_stats(
+    include_bytes: bool = Query(False, alias="bytes", description="Also measure each cache in bytes")
+):
+    """Statistics of every cache in this worker, by name.
+
+    Hits, misses, evictions, size in entries, and the average and worst time
+    spent loading a missed value, for tuning sizes and TTLs. Sizes in bytes
+    walk every cached entry, so they are only computed with ``?bytes=true``.
+    """
+    return cache_registry.stats(include_bytes=include_bytes)
@@ -6,6 +6,7 @@ from ...schemas.user import User, UserCreate
 from ...schemas.book import BookResponse
 from ...services.user_service import user_service
 from shared.pagination import PaginatedResponse
+from shared.exceptions import ResourceNotFoundError
 
 router = APIRouter()
 
@@ -46,10 +47,10 @@ def read_user(
     db: Session = Depends(get_db)
 ):
     """Get detailed information about a specific user."""
-    db_user = user_service.get_user(db, user_id=user_id)
-    if db_user is None:
+    try:
+        return user_service.get_user(db, user_id=user_id)
+    except ResourceNotFoundError:
         raise HTTPException(
             status_code=404,
             detail="User not found"
         )
-    return db_user
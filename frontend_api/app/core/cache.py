@@ -0,0 +1,10 @@
+from shared.redis_cache import VersionedCache, redis_client
+from shared.cache_registry import cache_registry
+from .config import settings
+
+# Catalogue list pages, shared by every worker when REDIS_URL is set.
+# Namespaces: "catalog" for unfiltered listings, "publisher:<name>" and
+# "category:<name>" for filtered ones; bumped by the book services.
+catalog_cache = cache_registry.register(VersionedCache(
+    redis_client(settings.REDIS_URL), prefix="catalog", ttl=settings.CATALOG_CACHE_TTL
+))
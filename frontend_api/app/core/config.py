@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
 from typing import Optional
+from shared.counting import CountStrategy
 
 class Settings(BaseSettings):
     PROJECT_NAME: str = "Library Management System - Frontend API"
@@ -14,6 +15,61 @@ class Settings(BaseSettings):
 
     RABBITMQ_URL: str
 
+    # How list endpoints compute their total: exact, cached or estimate
+    BOOKS_COUNT_STRATEGY: CountStrategy = CountStrategy.CACHED
+    BOOKS_BY_PUBLISHER_COUNT_STRATEGY: CountStrategy = CountStrategy.CACHED
+    BOOKS_BY_CATEGORY_COUNT_STRATEGY: CountStrategy = CountStrategy.CACHED
+    # Longest time a cached total is served without an invalidating event (seconds)
+    COUNT_CACHE_TTL: float = 60.0
+
+    # In-process cache of GET /books/{book_id}: entries and seconds they may
+    # lag changes made by other workers
+    BOOK_CACHE_SIZE: int = 10000
+    BOOK_CACHE_TTL: float = 30.0
+
+    # Book and user ids recently found missing, answered with 404 without a
+    # query; short, since ids created by other workers are only seen after it
+    NEGATIVE_CACHE_SIZE: int = 100000
+    NEGATIVE_CACHE_TTL: float = 10.0
+
+    # Catalogue list pages shared by all workers through Redis; without a
+    # URL each worker keeps its own in-memory copy
+    REDIS_URL: Optional[str] = None
+    CATALOG_CACHE_TTL: float = 300.0
+    # max-age sent with catalogue responses so clients and edge caches can
+    # reuse them; revalidation with If-None-Match is cheap after that
+    CATALOG_HTTP_MAX_AGE: int = 5
+    # Oldest catalogue list page or book detail (seconds since it was read
+    # from the database) served when the cache misses: at once while it is
+    # refreshed in the background, or when the database query fails. 0
+    # disables the mode; stale responses carry Age and X-Cache-Stale.
+    CATALOG_STALE_WHILE_REVALIDATE: float = 0.0
+    CATALOG_STALE_IF_ERROR: float = 600.0
+    CATALOG_STALE_CACHE_SIZE: int = 20000
+
+    # Books kept per publisher and category first page (page 1 with a limit
+    # up to this is served from memory) and seconds between reloads that pick
+    # up changes made by other workers. Each reload runs the full per-facet
+    # window queries in every worker, so keep it in minutes
+    FIRST_PAGE_DEPTH: int = 20
+    FIRST_PAGE_REFRESH_INTERVAL: float = 600.0
+
+    # Seconds between reloads of the autocomplete index, which pick up books
+    # returned from loan and changes made by other workers
+    AUTOCOMPLETE_REFRESH_INTERVAL: float = 300.0
+
+    # File the book detail cache is saved to at shutdown and warmed from at
+    # startup, e.g. on a volume kept across deploys; unset to disable.
+    # Requires REDIS_URL, which keeps the versions that validate the entries
+    CACHE_SNAPSHOT_PATH: Optional[str] = None
+
+    # Monthly borrow_records partitions kept ready ahead of today (Postgres only)
+    BORROW_PARTITION_MONTHS_AHEAD: int = 3
+
+    # Value of the X-Internal-Token header required by /internal endpoints
+    # (cache statistics); unset, they answer 404
+    INTERNAL_API_TOKEN: Optional[str] = None
+
     class Config:
         env_file = ".env"
 
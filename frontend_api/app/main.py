@@ -4,13 +4,20 @@ from fastapi.openapi.utils import get_openapi
 import asyncio
 from .core.config import settings
 from .api import api_router
-from .core.database import Base, engine
+from .core.database import Base, engine, SessionLocal
 from shared.message_broker import MessageBroker
+from shared.partitioning import maintain_partitions
+from .models.borrow import BorrowRecord
 from .services.book_sync_service import BookSyncService
-from .services.book_service import BookService
+from .services.book_service import BookService, catalog_refresher, load_book_details, save_book_details
 from .services.user_service import UserService
+from .services.facet_service import facet_service
+from .services.first_page_service import first_page_service
+from .services.search_service import search_service
+from .services.autocomplete_service import autocomplete_service
 from fastapi.responses import JSONResponse
 from sqlalchemy.exc import SQLAlchemyError
+from shared.exceptions import LibraryException
 import logging
 
 # Configure logging
@@ -19,6 +26,7 @@ logger = logging.getLogger(__name__)
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
+search_service.ensure_schema(engine)
 
 # Initialize shared message broker
 message_broker = MessageBroker(settings.RABBITMQ_URL)
@@ -78,9 +86,33 @@ app.include_router(api_router, prefix=settings.API_V1_STR)
 @app.on_event("startup")
 async def startup_event():
     """Initialize services and connections on application startup"""
+    # Keep future borrow_records partitions in place; converting the table
+    # is the separate scripts.partition_borrow_records step
+    app.state.partition_maintenance = asyncio.create_task(maintain_partitions(
+        engine, BorrowRecord.__table__, settings.BORROW_PARTITION_MONTHS_AHEAD
+    ))
+    
     logger.info("Connecting to RabbitMQ...")
     await message_broker.connect()
     
+    # Seed derived book data before book events start updating it
+    with SessionLocal() as db:
+        logger.info("Rebuilding book facet counters...")
+        facet_service.rebuild(db)
+        logger.info("Loading autocomplete index...")
+        autocomplete_service.load(db)
+        logger.info("Warming publisher and category first pages...")
+        first_page_service.load(db)
+    app.state.first_page_refresh = asyncio.create_task(first_page_service.keep_warm(
+        SessionLocal, settings.FIRST_PAGE_REFRESH_INTERVAL
+    ))
+    app.state.autocomplete_refresh = asyncio.create_task(autocomplete_service.keep_warm(
+        SessionLocal, settings.AUTOCOMPLETE_REFRESH_INTERVAL
+    ))
+    if settings.CACHE_SNAPSHOT_PATH:
+        loaded = load_book_details(settings.CACHE_SNAPSHOT_PATH)
+        logger.info(f"Book detail cache warmed with {loaded} entries from the last snapshot")
+    
     # Start the book sync service
     logger.info("Starting book sync service...")
     await book_sync_service.start()
@@ -91,6 +123,9 @@ async def startup_event():
 async def shutdown_event():
     """Cleanup connections on application shutdown"""
     logger.info("Shutting down application...")
+    app.state.partition_maintenance.cancel()
+    app.state.first_page_refresh.cancel()
+    app.state.autocomplete_refresh.cancel()
     
     # Close message broker connection
     await message_broker.close()
@@ -98,6 +133,10 @@ async def shutdown_event():
     # Stop the book sync service
     await book_sync_service.stop()
     
+    catalog_refresher.shutdown()
+    if settings.CACHE_SNAPSHOT_PATH:
+        saved = save_book_details(settings.CACHE_SNAPSHOT_PATH)
+        logger.info(f"Saved {saved} book detail cache entries for the next start")
     logger.info("Shutdown complete")
 
 # Global exception handlers
@@ -113,6 +152,19 @@ async def global_exception_handler(request: Request, exc: Exception):
         }
     )
 
+@app.exception_handler(LibraryException)
+async def library_exception_handler(request: Request, exc: LibraryException):
+    """Handle custom library exceptions."""
+    logger.error(f"Library error: {exc.message}", extra={"error_code": exc.error_code})
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={
+            "detail": exc.message,
+            "error_code": exc.error_code,
+            "type": "library_error"
+        }
+    )
+
 @app.exception_handler(SQLAlchemyError)
 async def sqlalchemy_exception_handler(request: Request, exc: SQLAlchemyError):
     """Handle database-related errors."""
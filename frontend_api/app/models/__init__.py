@@ -1,5 +1,6 @@
 from .book import Book
 from .user import User
 from .borrow import BorrowRecord
+from .facet import BookFacetCount
 
-__all__ = ["Book", "User", "BorrowRecord"]
+__all__ = ["Book", "User", "BorrowRecord", "BookFacetCount"]
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, func
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Index, func
 from sqlalchemy.orm import relationship
 from ..core.database import Base
 
@@ -19,3 +19,12 @@ class Book(Base):
     
     # Relationship with BorrowRecord
     borrow_records = relationship("BorrowRecord", back_populates="book")
+
+    __table_args__ = (
+        # Keyset pagination order for the catalogue listing
+        Index("ix_books_title_id", "title", "id"),
+        # Facet filters of the catalogue listing, combined with availability
+        Index("ix_books_publisher_available", "publisher", "available"),
+        Index("ix_books_category_available", "category", "available"),
+        Index("ix_books_author", "author"),
+    )
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, String
+from ..core.database import Base
+
+class BookFacetCount(Base):
+    """Number of available books per publisher and per category.
+
+    Maintained incrementally by FacetService in the same transaction as the
+    change to the books, so the facet listing reads this small table instead
+    of counting the catalogue.
+    """
+    __tablename__ = "book_facet_counts"
+
+    facet = Column(String, primary_key=True)  # "publisher" or "category"
+    value = Column(String, primary_key=True)
+    available_count = Column(Integer, nullable=False, default=0)
@@ -1,9 +1,9 @@
-from .book import BookBase, BookResponse, BookList, BookDetail, BookCreate
+from .book import BookBase, BookResponse, BookList, BookDetail, BookCreate, BookFacets, BookSuggestion
 from .user import User, UserCreate
 from .borrow import Borrow, BorrowCreate, BorrowBase
 
 __all__ = [
-    "BookBase", "BookResponse", "BookList", "BookDetail", "BookCreate",
+    "BookBase", "BookResponse", "BookList", "BookDetail", "BookCreate", "BookFacets", "BookSuggestion",
     "User", "UserCreate",
     "Borrow", "BorrowCreate", "BorrowBase"
 ]
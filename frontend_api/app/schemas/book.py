@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Optional
 
 class BookBase(BaseModel):
     """Base schema for book data"""
@@ -31,3 +31,14 @@ class BookList(BookResponse):
 class BookDetail(BookResponse):
     """Schema for detailed book response"""
     pass
+
+class BookFacets(BaseModel):
+    """Schema for available book counts per publisher and per category"""
+    publishers: Dict[str, int]
+    categories: Dict[str, int]
+
+class BookSuggestion(BaseModel):
+    """Schema for an autocomplete suggestion"""
+    id: int
+    title: str
+    author: str
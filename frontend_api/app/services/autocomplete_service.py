@@ -0,0 +1,118 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from typing import Callable, Dict, List, Optional, Tuple
+from ..models.book import Book
+from ..schemas.book import BookSuggestion
+from ..core.events import local_events
+from shared.prefix_index import PrefixIndex
+from shared.message_types import MessageType
+from shared.exceptions import DatabaseOperationError
+import asyncio
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+class AutocompleteService:
+    """Type-ahead suggestions from an in-process index of titles and authors.
+
+    Only available books are suggested, like the catalogue listings. The
+    index is loaded from the database at startup and then follows the
+    BOOKS_CREATED, BOOK_DELETED and BOOK_BORROWED local events, which
+    BookService and BorrowService publish for API calls and BookSyncService
+    for the changes it receives from admin_api. Lookups never touch the
+    database.
+
+    Changes made by other workers, and books coming back from loan, are
+    picked up by the periodic reload in ``keep_warm``; events received while
+    a reload runs are applied on top of what it loaded.
+    """
+    def __init__(self):
+        self.index = PrefixIndex()
+        self._books: Dict[int, Tuple[str, str]] = {}
+        self._lock = threading.Lock()
+        # Books changed by events during a reload (None: removed), else None
+        self._changes: Optional[Dict[int, Optional[Tuple[str, str]]]] = None
+
+    def load(self, db: Session) -> None:
+        """(Re)build the index from every available book in the catalogue."""
+        with self._lock:
+            self._changes = {}
+        try:
+            rows = db.execute(
+                select(Book.id, Book.title, Book.author).where(Book.available == True)
+            ).all()
+        except SQLAlchemyError as e:
+            with self._lock:
+                self._changes = None
+            raise DatabaseOperationError(f"Failed to load autocomplete index: {str(e)}") from e
+        books = {row.id: (row.title, row.author) for row in rows}
+        self.index.build(books.items())
+
+        with self._lock:
+            for book_id, texts in self._changes.items():
+                if texts is None:
+                    books.pop(book_id, None)
+                    self.index.remove(book_id)
+                else:
+                    books[book_id] = texts
+                    self.index.add(book_id, texts)
+            self._books = books
+            self._changes = None
+        logger.info(f"Autocomplete index loaded with {len(self.index)} books")
+
+    async def keep_warm(self, session_factory: Callable[[], Session], interval: float) -> None:
+        """Reload every ``interval`` seconds; runs until cancelled."""
+        def reload() -> None:
+            with session_factory() as db:
+                self.load(db)
+
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(reload)
+            except Exception as e:
+                logger.error(f"Failed to reload autocomplete index: {str(e)}", exc_info=True)
+
+    def _set(self, book_id: int, texts: Optional[Tuple[str, str]]) -> None:
+        """Index ``texts`` for ``book_id``, or drop it when None; call with the lock held."""
+        if texts is None:
+            self.index.remove(book_id)
+            self._books.pop(book_id, None)
+        else:
+            self._books[book_id] = texts
+            self.index.add(book_id, texts)
+        if self._changes is not None:
+            self._changes[book_id] = texts
+
+    def add_books(self, books: List[dict]) -> None:
+        """Index created books that are available; handler for BOOKS_CREATED events."""
+        with self._lock:
+            for book in books:
+                if book["available"]:
+                    self._set(book["id"], (book["title"], book["author"]))
+
+    def remove_book(self, book: dict) -> None:
+        """Drop a deleted book; handler for BOOK_DELETED events."""
+        with self._lock:
+            self._set(book["id"], None)
+
+    def mark_borrowed(self, data: dict) -> None:
+        """Drop a lent book until it is back; handler for BOOK_BORROWED events."""
+        with self._lock:
+            self._set(data["book_id"], None)
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[BookSuggestion]:
+        """Books with a title or author word starting with ``prefix``."""
+        suggestions = []
+        for book_id in self.index.search(prefix, limit):
+            book = self._books.get(book_id)
+            if book:
+                suggestions.append(BookSuggestion(id=book_id, title=book[0], author=book[1]))
+        return suggestions
+
+autocomplete_service = AutocompleteService()
+local_events.subscribe(MessageType.BOOKS_CREATED, autocomplete_service.add_books)
+local_events.subscribe(MessageType.BOOK_DELETED, autocomplete_service.remove_book)
+local_events.subscribe(MessageType.BOOK_BORROWED, autocomplete_service.mark_borrowed)
@@ -1,15 +1,30 @@
 from sqlalchemy.orm import Session
 from sqlalchemy import and_
-from typing import Optional, List
+from typing import Any, Callable, Hashable, NamedTuple, Optional, List, Sequence, Tuple, Union
 from ..models.book import Book
 from ..schemas.book import BookResponse, BookDetail, BookCreate, BookList
+from .queries import BOOK_BY_ID, BOOK_BY_ISBN
+from .facet_service import facet_service
+from .first_page_service import first_page_service
 from shared.message_types import MessageType
 from shared.message_broker import MessageBroker
-from shared.pagination import PaginatedResponse
+from shared.pagination import PaginatedResponse, encode_cursor, decode_cursor, keyset_filter
+from shared.counting import TotalCounter
+from shared.cache import TTLCache
+from shared.cache_registry import cache_registry
+from shared.singleflight import SingleFlight
+from shared.stale import StaleCache, BackgroundRefresher
+from shared.snapshot import SnapshotFile, write_snapshot
+from shared.http_cache import weak_etag
+from ..core.config import settings
+from ..core.events import local_events
+from ..core.cache import catalog_cache
+from ..core.database import SessionLocal
 from shared.exceptions import (
     LibraryException,
     DatabaseOperationError,
     ResourceNotFoundError,
+    ValidationError,
     MessageBrokerError
 )
 from sqlalchemy.exc import SQLAlchemyError
@@ -17,18 +32,228 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Most values accepted per multi-value filter of the catalogue listing; keeps
+# IN lists short enough to be planned as a handful of index probes.
+MAX_FILTER_VALUES = 20
+
+# List totals are shared by every BookService instance (routes create one per
+# request) and dropped whenever a committed change can alter them.
+books_total = cache_registry.register(TotalCounter(
+    settings.BOOKS_COUNT_STRATEGY, ttl=settings.COUNT_CACHE_TTL, name="books_total"
+))
+books_by_publisher_total = cache_registry.register(TotalCounter(
+    settings.BOOKS_BY_PUBLISHER_COUNT_STRATEGY, ttl=settings.COUNT_CACHE_TTL,
+    name="books_by_publisher_total"
+))
+books_by_category_total = cache_registry.register(TotalCounter(
+    settings.BOOKS_BY_CATEGORY_COUNT_STRATEGY, ttl=settings.COUNT_CACHE_TTL,
+    name="books_by_category_total"
+))
+
+def invalidate_totals(data=None) -> None:
+    """Drop every cached list total."""
+    for counter in (books_total, books_by_publisher_total, books_by_category_total):
+        counter.invalidate()
+
+for _event_type in (MessageType.BOOKS_CREATED, MessageType.BOOK_DELETED, MessageType.BOOK_BORROWED):
+    local_events.subscribe(_event_type, invalidate_totals)
+
+# Book details by id with their encoded JSON and the ``book:<id>`` catalogue
+# stamp read before the query, shared by every BookService instance, so a
+# hit is served without validation or encoding. Entries are dropped when
+# this process creates, deletes or lends the book; the TTL bounds how long
+# a change made by another worker can go unnoticed.
+book_detail_cache = cache_registry.register(TTLCache(
+    maxsize=settings.BOOK_CACHE_SIZE, ttl=settings.BOOK_CACHE_TTL, name="book_detail"
+))
+
+def invalidate_book_detail(data) -> None:
+    """Drop the cached and stale details of the books in a local book event."""
+    for book in data if isinstance(data, list) else [data]:
+        book_id = book.get("id", book.get("book_id"))
+        book_detail_cache.delete(book_id)
+        # A lent or deleted book must not come back as a stale copy either
+        stale_catalog.delete(("book", book_id))
+
+for _event_type in (MessageType.BOOKS_CREATED, MessageType.BOOK_DELETED, MessageType.BOOK_BORROWED):
+    local_events.subscribe(_event_type, invalidate_book_detail)
+
+def catalog_namespaces(publishers: Sequence[str] = (), categories: Sequence[str] = ()) -> Tuple[str, ...]:
+    """Catalogue cache namespaces a listing depends on.
+
+    A listing filtered by publisher only changes when a book of one of those
+    publishers does, so it depends on their namespaces alone; likewise for
+    categories. Anything else depends on the whole catalogue.
+    """
+    if publishers:
+        return tuple(f"publisher:{publisher}" for publisher in publishers)
+    if categories:
+        return tuple(f"category:{category}" for category in categories)
+    return ("catalog",)
+
+def bump_catalog_versions(data) -> None:
+    """Invalidate the cached pages affected by a local book event, in every worker."""
+    namespaces = ["catalog"]
+    for book in data if isinstance(data, list) else [data]:
+        namespaces.append(f"book:{book.get('id', book.get('book_id'))}")
+        namespaces.append(f"publisher:{book['publisher']}")
+        namespaces.append(f"category:{book['category']}")
+    catalog_cache.bump(*namespaces)
+
+for _event_type in (MessageType.BOOKS_CREATED, MessageType.BOOK_DELETED, MessageType.BOOK_BORROWED):
+    local_events.subscribe(_event_type, bump_catalog_versions)
+
+# Ids of books that do not exist or are not available, so repeated requests
+# for them skip the database. Ids of books created in this process are
+# dropped at once; the short TTL covers books created by other workers.
+missing_book_ids = cache_registry.register(TTLCache(
+    maxsize=settings.NEGATIVE_CACHE_SIZE, ttl=settings.NEGATIVE_CACHE_TTL, name="missing_book_ids"
+))
+
+def forget_missing_books(data: list) -> None:
+    """Drop newly created books from the missing book ids."""
+    for book in data:
+        missing_book_ids.delete(book["id"])
+
+local_events.subscribe(MessageType.BOOKS_CREATED, forget_missing_books)
+
+def save_book_details(path: str) -> int:
+    """Write the book detail cache to ``path``, for load_book_details in the next process.
+
+    Nothing is written without REDIS_URL: the stamps of the in-memory
+    catalogue cache would never match in the next process.
+    """
+    if not catalog_cache.shared:
+        logger.warning("Not saving the book detail cache: CACHE_SNAPSHOT_PATH requires REDIS_URL")
+        return 0
+    try:
+        return write_snapshot(path, [
+            (book_id, entry[2], entry[1])
+            for book_id, entry in book_detail_cache.items()
+            if entry[2] is not None
+        ])
+    except OSError as e:
+        logger.error(f"Failed to save the book detail cache to {path}: {str(e)}")
+        return 0
+
+def load_book_details(path: str) -> int:
+    """Warm the book detail cache from a file written by save_book_details.
+
+    Only entries whose ``book:<id>`` catalogue version has not moved since
+    they were read are loaded; the file is memory-mapped and other entries
+    are never copied out of it. Returns the number of entries loaded, 0
+    without REDIS_URL.
+    """
+    if not catalog_cache.shared:
+        logger.warning("Not loading the book detail cache: CACHE_SNAPSHOT_PATH requires REDIS_URL")
+        return 0
+    try:
+        with SnapshotFile(path) as snapshot:
+            index = snapshot.index()
+            current = catalog_cache.stamps([f"book:{book_id}" for book_id, _ in index])
+            if current is None:
+                return 0
+            loaded = 0
+            for position, ((book_id, stamp), current_stamp) in enumerate(zip(index, current)):
+                if stamp != current_stamp:
+                    continue
+                body = snapshot.value(position)
+                book_detail_cache.set(
+                    book_id, (BookDetail.model_validate_json(body), body, stamp)
+                )
+                loaded += 1
+            return loaded
+    except FileNotFoundError:
+        return 0
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring the book detail snapshot {path}: {str(e)}")
+        return 0
+
+# Concurrent identical reads that missed the caches share one query
+book_reads = cache_registry.register(SingleFlight(name="book_reads"))
+
+# Single-column listings served by get_books_by: column and cached total
+BOOK_FILTERS = {
+    "publisher": (Book.publisher, books_by_publisher_total),
+    "category": (Book.category, books_by_category_total)
+}
+
+def book_event_data(book: Book) -> dict:
+    """Describe a book in local catalogue events."""
+    return {
+        "id": book.id,
+        "isbn": book.isbn,
+        "title": book.title,
+        "author": book.author,
+        "publisher": book.publisher,
+        "category": book.category,
+        "available": book.available
+    }
+
+# Last list pages and book details read from the database, served stale
+# when the cache misses and the database is slow or failing (see
+# CATALOG_STALE_*); refreshes run in the background with their own session.
+stale_catalog = cache_registry.register(StaleCache(
+    maxsize=settings.CATALOG_STALE_CACHE_SIZE,
+    while_revalidate=settings.CATALOG_STALE_WHILE_REVALIDATE,
+    if_error=settings.CATALOG_STALE_IF_ERROR,
+    name="stale_catalog"
+))
+catalog_refresher = BackgroundRefresher(SessionLocal)
+
+class CatalogBody(NamedTuple):
+    """An encoded catalogue response; ``stale`` tells why an older copy was served."""
+    body: bytes
+    stale: Optional[str] = None
+    age: float = 0.0
+
+class CatalogPage(NamedTuple):
+    """A get_books_by page; ``stale`` tells why an older copy was served."""
+    page: PaginatedResponse[BookResponse]
+    stale: Optional[str] = None
+    age: float = 0.0
+
 class BookService:
     def __init__(self, message_broker: MessageBroker):
         self.message_broker = message_broker
 
     def get_book(self, db: Session, book_id: int) -> Optional[BookDetail]:
-        """Get a book by its ID."""
+        """Get an available book by its ID, from the book detail cache if possible."""
+        entry, _, _ = self._cached_book(db, book_id)
+        return entry[0]
+
+    def get_book_json(self, db: Session, book_id: int) -> bytes:
+        """Like get_book, but the detail already encoded as a JSON response body."""
+        return self.get_book_body(db, book_id).body
+
+    def get_book_body(self, db: Session, book_id: int) -> CatalogBody:
+        """Like get_book_json, telling whether a stale copy was served."""
+        entry, stale, age = self._cached_book(db, book_id)
+        return CatalogBody(entry[1], stale, age)
+
+    def _cached_book(
+        self, db: Session, book_id: int
+    ) -> Tuple[Tuple[BookDetail, bytes, Optional[str]], Optional[str], float]:
+        """The book detail cache entry of a book, loading it on a miss; see _load_or_stale.
+
+        An entry read before the current ``book:<id>`` version, e.g. when
+        another worker lent the book, counts as a miss, so the body never
+        lags behind the ETag built from that version.
+        """
         try:
-            book = db.query(Book).filter(Book.id == book_id).first()
-            if not book or not book.available:
+            entry = book_detail_cache.get(book_id)
+            if entry is not None:
+                current = catalog_cache.stamp((f"book:{book_id}",))
+                if current is None or entry[2] == current:
+                    return entry, None, 0.0
+                book_detail_cache.delete(book_id)
+            if missing_book_ids.get(book_id):
                 raise ResourceNotFoundError("Book", book_id)
-            
-            return BookDetail.model_validate(book)
+            # Identical concurrent misses share one query
+            return self._load_or_stale(
+                db, ("book", book_id),
+                lambda session: book_reads.do(("book", book_id), self._load_book, session, book_id)
+            )
         except ResourceNotFoundError:
             raise
         except SQLAlchemyError as e:
@@ -36,65 +261,280 @@ class BookService:
         except Exception as e:
             raise LibraryException(f"An unexpected error occurred while fetching book: {str(e)}")
 
+    @book_detail_cache.timed_load()
+    def _load_book(self, db: Session, book_id: int) -> Tuple[BookDetail, bytes, Optional[str]]:
+        """Query a book and store it in the book detail cache."""
+        # Read first, so a change committed during the query invalidates the entry
+        stamp = catalog_cache.stamp((f"book:{book_id}",))
+        book = db.execute(BOOK_BY_ID, {"book_id": book_id}).scalars().first()
+        if not book or not book.available:
+            missing_book_ids.set(book_id, True)
+            raise ResourceNotFoundError("Book", book_id)
+        
+        detail = BookDetail.model_validate(book)
+        entry = (detail, detail.model_dump_json().encode(), stamp)
+        book_detail_cache.set(book_id, entry)
+        return entry
+
+    def _load_or_stale(
+        self, db: Session, key: Hashable, load: Callable[[Session], Any]
+    ) -> Tuple[Any, Optional[str], float]:
+        """Run ``load(db)`` after a cache miss, or serve the stale copy of ``key``.
+
+        A copy younger than CATALOG_STALE_WHILE_REVALIDATE is returned at once
+        and ``load`` runs in the background; one younger than
+        CATALOG_STALE_IF_ERROR is returned when ``load`` fails with a database
+        error. Returns the value, the reason it is stale (None when fresh)
+        and its age in seconds.
+        """
+        stale = stale_catalog.get(key, stale_catalog.while_revalidate)
+        if stale is not None:
+            def refresh(session: Session) -> None:
+                try:
+                    stale_catalog.put(key, load(session))
+                except ResourceNotFoundError:
+                    stale_catalog.delete(key)
+
+            catalog_refresher.submit(key, refresh)
+            return stale[0], "while-revalidate", stale[1]
+
+        try:
+            value = load(db)
+        except ResourceNotFoundError:
+            stale_catalog.delete(key)
+            raise
+        except (SQLAlchemyError, DatabaseOperationError) as e:
+            stale = stale_catalog.get(key, stale_catalog.if_error)
+            if stale is None:
+                raise
+            logger.warning(f"Serving stale {key!r} after a database error: {str(e)}")
+            return stale[0], "if-error", stale[1]
+        stale_catalog.put(key, value)
+        return value, None, 0.0
+
+    def book_etag(self, book_id: int) -> Optional[str]:
+        """ETag of a book's details, computed without querying the database."""
+        stamp = catalog_cache.stamp((f"book:{book_id}",))
+        return weak_etag("book", book_id, stamp) if stamp else None
+
+    def books_etag(
+        self,
+        page: int = 1,
+        limit: int = 10,
+        publisher: Union[str, Sequence[str], None] = None,
+        category: Union[str, Sequence[str], None] = None,
+        available_only: bool = True,
+        cursor: Optional[str] = None,
+        author: Union[str, Sequence[str], None] = None
+    ) -> Optional[str]:
+        """ETag of a get_books page, computed without querying the database.
+
+        It changes whenever a book the page may contain is created, deleted
+        or borrowed.
+
+        Raises:
+            ValidationError: If a filter has too many values
+        """
+        publishers = self._filter_values("publisher", publisher)
+        categories = self._filter_values("category", category)
+        authors = self._filter_values("author", author)
+        stamp = catalog_cache.stamp(catalog_namespaces(publishers, categories))
+        if not stamp:
+            return None
+        return weak_etag(
+            "books", stamp, publishers, categories, authors, available_only, page, limit, cursor
+        )
+
     def get_books(
         self,
         db: Session,
         page: int = 1,
         limit: int = 10,
-        publisher: Optional[str] = None,
-        category: Optional[str] = None,
-        available_only: bool = True
+        publisher: Union[str, Sequence[str], None] = None,
+        category: Union[str, Sequence[str], None] = None,
+        available_only: bool = True,
+        cursor: Optional[str] = None,
+        author: Union[str, Sequence[str], None] = None
     ) -> PaginatedResponse[BookList]:
-        """Get books with optional filtering and pagination."""
+        """Get books with optional filtering and pagination; see get_books_body."""
+        return PaginatedResponse[BookList].model_validate_json(
+            self.get_books_json(
+                db, page=page, limit=limit, publisher=publisher, category=category,
+                available_only=available_only, cursor=cursor, author=author
+            )
+        )
+
+    def get_books_json(
+        self,
+        db: Session,
+        page: int = 1,
+        limit: int = 10,
+        publisher: Union[str, Sequence[str], None] = None,
+        category: Union[str, Sequence[str], None] = None,
+        available_only: bool = True,
+        cursor: Optional[str] = None,
+        author: Union[str, Sequence[str], None] = None
+    ) -> bytes:
+        """Get books with optional filtering and pagination; see get_books_body."""
+        return self.get_books_body(
+            db, page=page, limit=limit, publisher=publisher, category=category,
+            available_only=available_only, cursor=cursor, author=author
+        ).body
+
+    def get_books_body(
+        self,
+        db: Session,
+        page: int = 1,
+        limit: int = 10,
+        publisher: Union[str, Sequence[str], None] = None,
+        category: Union[str, Sequence[str], None] = None,
+        available_only: bool = True,
+        cursor: Optional[str] = None,
+        author: Union[str, Sequence[str], None] = None
+    ) -> CatalogBody:
+        """Get books with optional filtering and pagination, encoded as a JSON response body.
+
+        ``publisher``, ``category`` and ``author`` each take one value or a
+        list of up to MAX_FILTER_VALUES values; a book matches when it has any
+        of the listed values for every given filter.
+
+        Pages are addressed by ``page`` (offset) or, when ``cursor`` is given,
+        by keyset on (title, id), which costs the same at any depth.
+
+        Encoded pages are kept in the catalogue cache, so a hit is returned
+        without validation or encoding. After a miss, an older copy of the
+        page may be served; see _load_or_stale.
+        """
         try:
-            query = db.query(Book)
-            if publisher:
-                query = query.filter(Book.publisher == publisher)
-            if category:
-                query = query.filter(Book.category == category)
-            if available_only:
-                query = query.filter(Book.available == True)
-            
-            try:
-                total = query.count()
-            except SQLAlchemyError as e:
-                raise DatabaseOperationError(f"Failed to count books: {str(e)}") from e
-            
-            if total == 0:
-                return PaginatedResponse.create(
-                    items=[],
-                    total=0,
-                    page=page,
-                    limit=limit
-                )
-            
-            skip = (page - 1) * limit
-            
-            try:
-                books = (
-                    query
-                    .order_by(Book.title)
-                    .offset(skip)
-                    .limit(limit)
-                    .all()
+            after = decode_cursor(cursor, str, int) if cursor else None
+            if after:
+                page = None
+
+            publishers = self._filter_values("publisher", publisher)
+            categories = self._filter_values("category", category)
+            authors = self._filter_values("author", author)
+
+            key = ("books", publishers, categories, authors, available_only, page, limit, cursor)
+            cached, cache_key = catalog_cache.get(catalog_namespaces(publishers, categories), key)
+            if cached is not None:
+                return CatalogBody(cached)
+
+            # Identical concurrent misses share one query
+            return CatalogBody(*self._load_or_stale(
+                db, key,
+                lambda session: book_reads.do(
+                    key + (cache_key,), self._load_books, session,
+                    publishers, categories, authors, available_only, page, limit, after, cache_key
                 )
-            except SQLAlchemyError as e:
-                raise DatabaseOperationError(f"Failed to fetch books: {str(e)}") from e
-            
-            book_responses = [BookList.model_validate(book) for book in books]
-            
-            return PaginatedResponse.create(
-                items=book_responses,
-                total=total,
-                page=page,
-                limit=limit
-            )
+            ))
             
-        except (ResourceNotFoundError, DatabaseOperationError):
+        except (ResourceNotFoundError, DatabaseOperationError, ValidationError):
             raise
         except Exception as e:
             raise LibraryException(f"An unexpected error occurred while fetching books: {str(e)}")
 
+    @catalog_cache.timed_load()
+    def _load_books(
+        self,
+        db: Session,
+        publishers: Tuple[str, ...],
+        categories: Tuple[str, ...],
+        authors: Tuple[str, ...],
+        available_only: bool,
+        page: Optional[int],
+        limit: int,
+        after: Optional[tuple],
+        cache_key: Optional[str]
+    ) -> bytes:
+        """Query and encode a get_books page and store it in the catalogue cache."""
+        query = db.query(Book)
+        for column, values in (
+            (Book.publisher, publishers),
+            (Book.category, categories),
+            (Book.author, authors)
+        ):
+            if len(values) == 1:
+                query = query.filter(column == values[0])
+            elif values:
+                query = query.filter(column.in_(values))
+        if available_only:
+            query = query.filter(Book.available == True)
+        
+        try:
+            total, total_is_estimate = books_total.count(
+                query, key=(publishers, categories, authors, available_only)
+            )
+        except SQLAlchemyError as e:
+            raise DatabaseOperationError(f"Failed to count books: {str(e)}") from e
+        
+        if total == 0:
+            result = PaginatedResponse[BookList].create(
+                items=[],
+                total=0,
+                page=page,
+                limit=limit
+            )
+            encoded = result.model_dump_json().encode()
+            catalog_cache.set(cache_key, encoded)
+            return encoded
+        
+        skip = 0
+        if after:
+            query = query.filter(keyset_filter((Book.title, Book.id), after))
+        else:
+            skip = (page - 1) * limit
+        
+        try:
+            # One extra row tells whether there is a next page
+            books = (
+                query
+                .order_by(Book.title, Book.id)
+                .offset(skip)
+                .limit(limit + 1)
+                .all()
+            )
+        except SQLAlchemyError as e:
+            raise DatabaseOperationError(f"Failed to fetch books: {str(e)}") from e
+        
+        next_cursor = None
+        if len(books) > limit:
+            books = books[:limit]
+            next_cursor = encode_cursor((books[-1].title, books[-1].id))
+        
+        book_responses = [BookList.model_validate(book) for book in books]
+        
+        result = PaginatedResponse[BookList].create(
+            items=book_responses,
+            total=total,
+            page=page,
+            limit=limit,
+            next_cursor=next_cursor,
+            total_is_estimate=total_is_estimate
+        )
+        encoded = result.model_dump_json().encode()
+        catalog_cache.set(cache_key, encoded)
+        return encoded
+
+    def _filter_values(
+        self,
+        name: str,
+        value: Union[str, Sequence[str], None]
+    ) -> Tuple[str, ...]:
+        """Normalize a single or multi-value filter to a sorted, deduplicated tuple.
+
+        Raises:
+            ValidationError: If more than MAX_FILTER_VALUES values are given
+        """
+        if not value:
+            return ()
+        values = tuple(sorted({value} if isinstance(value, str) else set(value)))
+        if len(values) > MAX_FILTER_VALUES:
+            raise ValidationError(
+                message=f"At most {MAX_FILTER_VALUES} values are allowed for {name}",
+                details={name: len(values)}
+            )
+        return values
+
     async def get_books_by_publisher(
         self, 
         db: Session, 
@@ -103,48 +543,7 @@ class BookService:
         limit: int = 10
     ) -> PaginatedResponse[BookResponse]:
         """Get books filtered by publisher with pagination."""
-        try:
-            query = db.query(Book).filter(Book.publisher == publisher)
-            
-            try:
-                total = query.count()
-            except SQLAlchemyError as e:
-                raise DatabaseOperationError(f"Failed to count books by publisher: {str(e)}") from e
-            
-            if total == 0:
-                return PaginatedResponse.create(
-                    items=[],
-                    total=0,
-                    page=page,
-                    limit=limit
-                )
-            
-            skip = (page - 1) * limit
-            
-            try:
-                books = (
-                    query
-                    .order_by(Book.title)
-                    .offset(skip)
-                    .limit(limit)
-                    .all()
-                )
-            except SQLAlchemyError as e:
-                raise DatabaseOperationError(f"Failed to fetch books by publisher: {str(e)}") from e
-            
-            book_responses = [BookResponse.model_validate(book) for book in books]
-            
-            return PaginatedResponse.create(
-                items=book_responses,
-                total=total,
-                page=page,
-                limit=limit
-            )
-            
-        except (ResourceNotFoundError, DatabaseOperationError):
-            raise
-        except Exception as e:
-            raise LibraryException(f"An unexpected error occurred while fetching books by publisher: {str(e)}")
+        return self.get_books_by(db, "publisher", publisher, page, limit)
 
     async def get_books_by_category(
         self, 
@@ -154,48 +553,112 @@ class BookService:
         limit: int = 10
     ) -> PaginatedResponse[BookResponse]:
         """Get books filtered by category with pagination."""
+        return self.get_books_by(db, "category", category, page, limit)
+
+    def get_books_by(
+        self,
+        db: Session,
+        name: str,
+        value: str,
+        page: int = 1,
+        limit: int = 10
+    ) -> PaginatedResponse[BookResponse]:
+        """One page of the books whose ``name`` ("publisher" or "category") equals ``value``."""
+        return self.get_books_by_page(db, name, value, page, limit).page
+
+    def get_books_by_page(
+        self,
+        db: Session,
+        name: str,
+        value: str,
+        page: int = 1,
+        limit: int = 10
+    ) -> CatalogPage:
+        """Like get_books_by, telling whether a stale copy was served.
+
+        First pages come from the in-memory snapshots of first_page_service;
+        other pages from the catalogue cache when possible. After a miss, an
+        older copy of the page may be served; see _load_or_stale.
+        """
+        column, counter = BOOK_FILTERS[name]
+        if page == 1:
+            first_page = first_page_service.get_first_page(name, value, limit)
+            if first_page is not None:
+                return CatalogPage(first_page)
         try:
-            query = db.query(Book).filter(Book.category == category)
-            
-            try:
-                total = query.count()
-            except SQLAlchemyError as e:
-                raise DatabaseOperationError(f"Failed to count books by category: {str(e)}") from e
-            
-            if total == 0:
-                return PaginatedResponse.create(
-                    items=[],
-                    total=0,
-                    page=page,
-                    limit=limit
-                )
-            
-            skip = (page - 1) * limit
-            
-            try:
-                books = (
-                    query
-                    .order_by(Book.title)
-                    .offset(skip)
-                    .limit(limit)
-                    .all()
+            key = (name, value, page, limit)
+            cached, cache_key = catalog_cache.get((f"{name}:{value}",), key)
+            if cached is not None:
+                return CatalogPage(PaginatedResponse[BookResponse].model_validate_json(cached))
+
+            # Identical concurrent misses share one query
+            return CatalogPage(*self._load_or_stale(
+                db, key,
+                lambda session: book_reads.do(
+                    key + (cache_key,), self._load_books_by,
+                    session, column, counter, value, page, limit, cache_key
                 )
-            except SQLAlchemyError as e:
-                raise DatabaseOperationError(f"Failed to fetch books by category: {str(e)}") from e
-            
-            book_responses = [BookResponse.model_validate(book) for book in books]
-            
-            return PaginatedResponse.create(
-                items=book_responses,
-                total=total,
-                page=page,
-                limit=limit
-            )
+            ))
             
         except (ResourceNotFoundError, DatabaseOperationError):
             raise
         except Exception as e:
-            raise LibraryException(f"An unexpected error occurred while fetching books by category: {str(e)}")
+            raise LibraryException(f"An unexpected error occurred while fetching books by {name}: {str(e)}")
+
+    @catalog_cache.timed_load()
+    def _load_books_by(
+        self,
+        db: Session,
+        column,
+        counter: TotalCounter,
+        value: str,
+        page: int,
+        limit: int,
+        cache_key: Optional[str]
+    ) -> PaginatedResponse[BookResponse]:
+        """Query a get_books_by page and store it in the catalogue cache."""
+        name = column.key
+        query = db.query(Book).filter(column == value)
+        
+        try:
+            total, total_is_estimate = counter.count(query, key=value)
+        except SQLAlchemyError as e:
+            raise DatabaseOperationError(f"Failed to count books by {name}: {str(e)}") from e
+        
+        if total == 0:
+            result = PaginatedResponse[BookResponse].create(
+                items=[],
+                total=0,
+                page=page,
+                limit=limit
+            )
+            catalog_cache.set(cache_key, result.model_dump_json().encode())
+            return result
+        
+        skip = (page - 1) * limit
+        
+        try:
+            books = (
+                query
+                .order_by(Book.title, Book.id)
+                .offset(skip)
+                .limit(limit)
+                .all()
+            )
+        except SQLAlchemyError as e:
+            raise DatabaseOperationError(f"Failed to fetch books by {name}: {str(e)}") from e
+        
+        book_responses = [BookResponse.model_validate(book) for book in books]
+        
+        result = PaginatedResponse[BookResponse].create(
+            items=book_responses,
+            total=total,
+            page=page,
+            limit=limit,
+            total_is_estimate=total_is_estimate
+        )
+        catalog_cache.set(cache_key, result.model_dump_json().encode())
+        return result
 
     async def create_books(self, db: Session, books: List[BookCreate]) -> List[Book]:
         """Create multiple books in the frontend API."""
@@ -206,7 +669,9 @@ class BookService:
                 book_data['available'] = True
                 
                 try:
-                    existing_book = db.query(Book).filter(Book.isbn == book_data['isbn']).first()
+                    existing_book = db.execute(
+                        BOOK_BY_ISBN, {"isbn": book_data['isbn']}
+                    ).scalars().first()
                 except SQLAlchemyError as e:
                     raise DatabaseOperationError(f"Failed to check for existing book: {str(e)}") from e
                 
@@ -220,10 +685,15 @@ class BookService:
             
             if db_books:
                 try:
+                    db.flush()
+                    facet_service.apply(db, db_books, +1)
+                    created = [book_event_data(db_book) for db_book in db_books]
                     db.commit()
                 except SQLAlchemyError as e:
                     db.rollback()
                     raise DatabaseOperationError(f"Failed to commit new books: {str(e)}") from e
+                
+                local_events.publish(MessageType.BOOKS_CREATED, created)
             
             return db_books
             
@@ -237,20 +707,24 @@ class BookService:
         """Delete a book by its ISBN."""
         try:
             try:
-                db_book = db.query(Book).filter(Book.isbn == isbn).first()
+                db_book = db.execute(BOOK_BY_ISBN, {"isbn": isbn}).scalars().first()
             except SQLAlchemyError as e:
                 raise DatabaseOperationError(f"Failed to fetch book for deletion: {str(e)}") from e
             
             if not db_book:
                 raise ResourceNotFoundError("Book", isbn)
             
+            deleted = book_event_data(db_book)
             try:
+                if db_book.available:
+                    facet_service.apply(db, [db_book], -1)
                 db.delete(db_book)
                 db.commit()
             except SQLAlchemyError as e:
                 db.rollback()
                 raise DatabaseOperationError(f"Failed to delete book: {str(e)}") from e
             
+            local_events.publish(MessageType.BOOK_DELETED, deleted)
             return True
             
         except (ResourceNotFoundError, DatabaseOperationError):
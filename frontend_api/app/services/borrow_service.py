@@ -2,7 +2,9 @@ from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 from datetime import date, timedelta
 from ..models.borrow import BorrowRecord
-from ..schemas.borrow import BorrowCreate
+from ..schemas.borrow import Borrow, BorrowCreate
+from .queries import BOOK_BY_ID, USER_EMAIL_BY_ID, CLAIM_BOOK
+from .facet_service import facet_service
 from shared.message_types import MessageType
 from shared.message_broker import MessageBroker
 from shared.exceptions import (
@@ -12,10 +14,9 @@ from shared.exceptions import (
     ValidationError,
     MessageBrokerError
 )
-from ..models.book import Book
-from ..models.user import User
 import logging
 from ..core.config import settings
+from ..core.events import local_events
 
 logger = logging.getLogger(__name__)
 
@@ -23,63 +24,79 @@ class BorrowService:
     def __init__(self, message_broker: MessageBroker):
         self.message_broker = message_broker
 
-    async def create_borrow_record(self, db: Session, borrow: BorrowCreate) -> BorrowRecord:
-        """Create a new borrow record and notify admin_api."""
+    async def create_borrow_record(self, db: Session, borrow: BorrowCreate) -> Borrow:
+        """Create a new borrow record and notify admin_api.
+
+        The book is claimed with a single conditional UPDATE ... RETURNING, so
+        concurrent borrows of the same book are resolved by the database: only
+        one of them matches the row, the others get a ValidationError. The
+        claim and the borrow record insert commit in the same transaction.
+        """
         try:
-            # Get user and book details
+            # Resolve the user's email for the admin_api notification
             try:
-                user = db.query(User).filter(User.id == borrow.user_id).first()
-                if not user:
-                    raise ResourceNotFoundError("User", borrow.user_id)
-
-                book = db.query(Book).filter(Book.id == borrow.book_id).first()
-                if not book:
-                    raise ResourceNotFoundError("Book", borrow.book_id)
+                user_email = db.execute(
+                    USER_EMAIL_BY_ID, {"user_id": borrow.user_id}
+                ).scalar()
             except SQLAlchemyError as e:
-                raise DatabaseOperationError(f"Failed to fetch user or book: {str(e)}") from e
-
-            # Validate book availability
-            if not book.available:
-                raise ValidationError(f"Book {book.title} is not available")
+                raise DatabaseOperationError(f"Failed to fetch user: {str(e)}") from e
+            if user_email is None:
+                raise ResourceNotFoundError("User", borrow.user_id)
 
             # Calculate return date
-            return_date = date.today() + timedelta(days=borrow.days)
+            today = date.today()
+            return_date = today + timedelta(days=borrow.days)
 
-            # Create borrow record
             try:
+                # Atomically flip the book to unavailable if it still is available
+                claimed = db.execute(CLAIM_BOOK, {"book_id": borrow.book_id}).first()
+                if claimed is None:
+                    db.rollback()
+                    self._raise_unclaimable(db, borrow.book_id)
+                book_isbn = claimed.isbn
+                facet_service.apply(db, [claimed], -1)
+
                 db_borrow = BorrowRecord(
                     user_id=borrow.user_id,
                     book_id=borrow.book_id,
-                    borrow_date=date.today(),
+                    borrow_date=today,
                     return_date=return_date
                 )
-                
-                # Update book availability
-                book.available = False
-                
                 db.add(db_borrow)
-                db.add(book)
+                db.flush()
+                result = Borrow.model_validate(db_borrow)
                 db.commit()
-                db.refresh(db_borrow)
-                db.refresh(book)
             except SQLAlchemyError as e:
                 db.rollback()
                 raise DatabaseOperationError(f"Failed to create borrow record: {str(e)}") from e
 
+            local_events.publish(
+                MessageType.BOOK_BORROWED,
+                {
+                    "book_id": borrow.book_id,
+                    "book_isbn": book_isbn,
+                    "publisher": claimed.publisher,
+                    "category": claimed.category,
+                    "user_id": borrow.user_id,
+                    "user_email": user_email,
+                    "return_date": return_date.isoformat()
+                }
+            )
+
             # Notify admin_api
             try:
                 await self.message_broker.publish(
                     MessageType.BOOK_BORROWED.value,
                     {
-                        "book_isbn": book.isbn,
-                        "user_email": user.email,
+                        "book_isbn": book_isbn,
+                        "user_email": user_email,
                         "return_date": return_date.isoformat()
                     }
                 )
             except Exception as e:
                 raise MessageBrokerError(f"Failed to publish borrow message: {str(e)}") from e
 
-            return db_borrow
+            return result
 
         except (ResourceNotFoundError, ValidationError, DatabaseOperationError, MessageBrokerError):
             raise
@@ -89,6 +106,13 @@ class BorrowService:
                 error_code="UNEXPECTED_ERROR"
             )
 
+    def _raise_unclaimable(self, db: Session, book_id: int) -> None:
+        """Explain why a book could not be claimed (only runs on the failure path)."""
+        book = db.execute(BOOK_BY_ID, {"book_id": book_id}).scalars().first()
+        if not book:
+            raise ResourceNotFoundError("Book", book_id)
+        raise ValidationError(f"Book {book.title} is not available")
+
 # Create instance to be imported by other modules
 message_broker = MessageBroker(settings.RABBITMQ_URL)
 borrow_service = BorrowService(message_broker)
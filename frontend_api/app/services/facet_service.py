@@ -0,0 +1,125 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import select, delete, insert, func, literal, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import SQLAlchemyError
+from collections import Counter
+from typing import Any, Iterable
+from ..models.book import Book
+from ..models.facet import BookFacetCount
+from ..schemas.book import BookFacets
+from shared.exceptions import DatabaseOperationError
+import logging
+import zlib
+
+logger = logging.getLogger(__name__)
+
+# Book columns that have a facet counter, by facet name
+FACET_COLUMNS = {
+    "publisher": Book.publisher,
+    "category": Book.category
+}
+
+# Dialects with INSERT ... ON CONFLICT DO UPDATE
+UPSERT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert
+}
+
+# Advisory lock taken shared by apply and exclusive by rebuild (PostgreSQL)
+FACET_LOCK_KEY = zlib.crc32(b"facet:book_facet_counts")
+
+def _lock_counters(db: Session, exclusive: bool) -> None:
+    """Take the counters lock until the end of the transaction, where supported."""
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    function = "pg_advisory_xact_lock" if exclusive else "pg_advisory_xact_lock_shared"
+    db.execute(text(f"SELECT {function}(:key)"), {"key": FACET_LOCK_KEY})
+
+class FacetService:
+    """Keeps the available book counters per publisher and category.
+
+    ``apply`` is called by the services that change book availability
+    (create, delete, borrow) before they commit, so the counters move in the
+    same transaction as the books. Each counter is updated with a single
+    upsert adding the delta, which stays correct with several workers.
+    ``rebuild`` takes an exclusive lock, so it never interleaves with
+    another rebuild or with ``apply`` calls in other transactions.
+    """
+
+    def apply(self, db: Session, books: Iterable[Any], delta: int) -> None:
+        """Add ``delta`` to the counters of each book's publisher and category.
+
+        Args:
+            db: Database session; the caller commits
+            books: Objects with ``publisher`` and ``category`` attributes
+            delta: +1 for books becoming available, -1 for books leaving
+        """
+        changes = Counter()
+        for book in books:
+            for facet in FACET_COLUMNS:
+                value = getattr(book, facet)
+                if value is not None:
+                    changes[(facet, value)] += delta
+        # Sorted so concurrent transactions lock the counter rows in one order
+        rows = [
+            {"facet": facet, "value": value, "available_count": change}
+            for (facet, value), change in sorted(changes.items())
+            if change
+        ]
+        if not rows:
+            return
+
+        _lock_counters(db, exclusive=False)
+        upsert = UPSERT_INSERTS[db.get_bind().dialect.name](BookFacetCount)
+        upsert = upsert.on_conflict_do_update(
+            index_elements=[BookFacetCount.facet, BookFacetCount.value],
+            set_={
+                "available_count": BookFacetCount.available_count
+                + upsert.excluded.available_count
+            }
+        )
+        db.execute(upsert, rows)
+
+    def get_facets(self, db: Session) -> BookFacets:
+        """Return the available book counts per publisher and per category."""
+        try:
+            counters = db.execute(
+                select(BookFacetCount)
+                .where(BookFacetCount.available_count > 0)
+                .order_by(BookFacetCount.facet, BookFacetCount.value)
+            ).scalars().all()
+        except SQLAlchemyError as e:
+            raise DatabaseOperationError(f"Failed to fetch book facets: {str(e)}") from e
+
+        facets = {facet: {} for facet in FACET_COLUMNS}
+        for counter in counters:
+            facets[counter.facet][counter.value] = counter.available_count
+        return BookFacets(
+            publishers=facets["publisher"],
+            categories=facets["category"]
+        )
+
+    def rebuild(self, db: Session) -> None:
+        """Recompute every counter from the books table.
+
+        Run at startup to seed the counters for an existing catalogue and to
+        correct any drift, e.g. from changes made outside the services.
+        """
+        try:
+            _lock_counters(db, exclusive=True)
+            db.execute(delete(BookFacetCount))
+            for facet, column in FACET_COLUMNS.items():
+                db.execute(
+                    insert(BookFacetCount).from_select(
+                        ["facet", "value", "available_count"],
+                        select(literal(facet), column, func.count())
+                        .where(Book.available == True, column.isnot(None))
+                        .group_by(column)
+                    )
+                )
+            db.commit()
+        except SQLAlchemyError as e:
+            db.rollback()
+            raise DatabaseOperationError(f"Failed to rebuild book facets: {str(e)}") from e
+
+facet_service = FacetService()
@@ -0,0 +1,213 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import select, func
+from sqlalchemy.exc import SQLAlchemyError
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from ..models.book import Book
+from ..schemas.book import BookResponse
+from ..core.config import settings
+from ..core.events import local_events
+from .facet_service import FACET_COLUMNS
+from shared.pagination import PaginatedResponse
+from shared.cache import CacheCounters, approx_size
+from shared.cache_registry import cache_registry
+from shared.message_types import MessageType
+from shared.exceptions import DatabaseOperationError
+import asyncio
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Book columns carried by listing items
+ITEM_COLUMNS = ("id", "isbn", "title", "author", "publisher", "category", "available")
+
+class _Snapshot:
+    __slots__ = ("items", "total", "generation")
+
+    def __init__(self, items: List[BookResponse], total: int, generation: int):
+        self.items = items
+        self.total = total
+        self.generation = generation
+
+def _order(book) -> Tuple[str, int]:
+    """Listing order of a book: title, then id."""
+    return (book.title, book.id)
+
+class FirstPageService(CacheCounters):
+    """First pages of the publisher and category listings, kept in memory.
+
+    Loaded at startup with one query per facet and then maintained from the
+    BOOKS_CREATED, BOOK_DELETED and BOOK_BORROWED local events, which cover
+    API calls and the changes BookSyncService receives from admin_api. Each
+    snapshot holds the listing total and its first ``depth`` books, so page 1
+    with a limit up to ``depth`` is answered without the database.
+
+    Changes made by other workers are picked up by the periodic reload in
+    ``keep_warm``; a reload never overwrites a snapshot that an event changed
+    while it was querying.
+    """
+    def __init__(self, depth: int, name: Optional[str] = None):
+        super().__init__()
+        self.name = name
+        self.depth = depth
+        self._pages: Dict[Tuple[str, str], _Snapshot] = {}
+        self._lock = threading.Lock()
+        self._generation = 0
+
+    def __len__(self) -> int:
+        return len(self._pages)
+
+    def clear(self) -> None:
+        """Drop every snapshot; listings go to the database until the next load."""
+        with self._lock:
+            self._generation += 1
+            self._pages = {}
+
+    def load(self, db: Session) -> None:
+        """(Re)build every snapshot from the books table."""
+        with self._lock:
+            started = self._generation
+
+        pages = {}
+        try:
+            with self.timed_load():
+                for facet, column in FACET_COLUMNS.items():
+                    totals = dict(db.execute(
+                        select(column, func.count()).where(column.isnot(None)).group_by(column)
+                    ).all())
+                    position = func.row_number().over(
+                        partition_by=column, order_by=(Book.title, Book.id)
+                    ).label("position")
+                    ranked = (
+                        select(*[getattr(Book, name) for name in ITEM_COLUMNS], position)
+                        .where(column.isnot(None))
+                        .subquery()
+                    )
+                    rows = db.execute(
+                        select(*[ranked.c[name] for name in ITEM_COLUMNS])
+                        .where(ranked.c.position <= self.depth)
+                        .order_by(ranked.c[facet], ranked.c.position)
+                    ).all()
+                    for row in rows:
+                        value = getattr(row, facet)
+                        snapshot = pages.get((facet, value))
+                        if snapshot is None:
+                            snapshot = pages[(facet, value)] = _Snapshot([], totals[value], started)
+                        snapshot.items.append(BookResponse.model_validate(dict(row._mapping)))
+        except SQLAlchemyError as e:
+            raise DatabaseOperationError(f"Failed to load first pages: {str(e)}") from e
+
+        with self._lock:
+            # Snapshots changed by events during the queries are newer
+            pages.update(
+                (key, snapshot) for key, snapshot in self._pages.items()
+                if snapshot.generation > started
+            )
+            self._pages = pages
+        logger.info(f"First pages loaded for {len(pages)} publishers and categories")
+
+    async def keep_warm(self, session_factory: Callable[[], Session], interval: float) -> None:
+        """Reload every ``interval`` seconds; runs until cancelled."""
+        def reload() -> None:
+            with session_factory() as db:
+                self.load(db)
+
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(reload)
+            except Exception as e:
+                logger.error(f"Failed to reload first pages: {str(e)}", exc_info=True)
+
+    def get_first_page(
+        self, name: str, value: str, limit: int
+    ) -> Optional[PaginatedResponse[BookResponse]]:
+        """Page 1 of the ``name`` listing for ``value``, or None if no snapshot covers it."""
+        with self._lock:
+            snapshot = self._pages.get((name, value))
+            # Deletions can leave fewer books than depth before the next reload
+            if (
+                snapshot is None or limit < 1
+                or (limit > len(snapshot.items) and len(snapshot.items) < snapshot.total)
+            ):
+                self.count_lookup(hit=False)
+                return None
+            self.count_lookup(hit=True)
+            items, total = snapshot.items[:limit], snapshot.total
+        return PaginatedResponse[BookResponse].create(
+            items=items, total=total, page=1, limit=limit
+        )
+
+    def stats(self, include_bytes: bool = True) -> Dict[str, Any]:
+        """Snapshot count and size with the counters; a load is a full reload."""
+        with self._lock:
+            pages = dict(self._pages)
+        seen = set()
+        return {
+            "name": self.name,
+            "size": len(pages),
+            "bytes": sum(
+                approx_size(key, seen) + approx_size(snapshot.items, seen) for key, snapshot in pages.items()
+            ) if include_bytes else None,
+            "depth": self.depth,
+            **self.counter_stats()
+        }
+
+    def _touch(self, key: Tuple[str, str]) -> Optional[_Snapshot]:
+        """The snapshot for ``key``, marked as changed by an event; call with the lock held."""
+        snapshot = self._pages.get(key)
+        if snapshot is not None:
+            snapshot.generation = self._generation
+        return snapshot
+
+    def add_books(self, books: List[dict]) -> None:
+        """Count created books and place them on first pages; handler for BOOKS_CREATED events."""
+        with self._lock:
+            self._generation += 1
+            for book in books:
+                item = BookResponse.model_validate({name: book[name] for name in ITEM_COLUMNS})
+                for facet in FACET_COLUMNS:
+                    key = (facet, book[facet])
+                    snapshot = self._touch(key)
+                    if snapshot is None:
+                        self._pages[key] = _Snapshot([item], 1, self._generation)
+                        continue
+                    complete = len(snapshot.items) == snapshot.total
+                    snapshot.total += 1
+                    # Past the last kept book of a partial page, its place is unknown
+                    if complete or _order(item) < _order(snapshot.items[-1]):
+                        snapshot.items = sorted(snapshot.items + [item], key=_order)[:self.depth]
+
+    def remove_book(self, book: dict) -> None:
+        """Uncount a deleted book; handler for BOOK_DELETED events."""
+        with self._lock:
+            self._generation += 1
+            for facet in FACET_COLUMNS:
+                key = (facet, book[facet])
+                snapshot = self._touch(key)
+                if snapshot is None:
+                    continue
+                # Kept when empty, so a reload in flight cannot bring it back
+                snapshot.total = max(snapshot.total - 1, 0)
+                snapshot.items = [item for item in snapshot.items if item.id != book["id"]]
+
+    def mark_borrowed(self, data: dict) -> None:
+        """Show a lent book as unavailable; handler for BOOK_BORROWED events."""
+        with self._lock:
+            self._generation += 1
+            for facet in FACET_COLUMNS:
+                snapshot = self._touch((facet, data[facet]))
+                if snapshot is None:
+                    continue
+                # Items may be held by responses in flight, so they are replaced
+                snapshot.items = [
+                    item.model_copy(update={"available": False}) if item.id == data["book_id"] else item
+                    for item in snapshot.items
+                ]
+
+first_page_service = cache_registry.register(
+    FirstPageService(depth=settings.FIRST_PAGE_DEPTH, name="first_pages")
+)
+local_events.subscribe(MessageType.BOOKS_CREATED, first_page_service.add_books)
+local_events.subscribe(MessageType.BOOK_DELETED, first_page_service.remove_book)
+local_events.subscribe(MessageType.BOOK_BORROWED, first_page_service.mark_borrowed)
@@ -0,0 +1,36 @@
+"""Precompiled statements for the hot single-row lookups.
+
+These are built once at import time with named bind parameters, so every
+call reuses the same statement object and hits SQLAlchemy's compiled cache
+instead of rebuilding a ``db.query(...).filter(...)`` chain. The SQL text is
+identical on every execution, which also lets drivers that support
+server-side prepared statements (e.g. psycopg 3) prepare them once.
+
+Usage:
+    db.execute(BOOK_BY_ID, {"book_id": book_id}).scalars().first()
+"""
+from sqlalchemy import select, update, bindparam
+from ..models.book import Book
+from ..models.user import User
+
+BOOK_BY_ID = select(Book).where(Book.id == bindparam("book_id"))
+BOOK_BY_ISBN = select(Book).where(Book.isbn == bindparam("isbn"))
+USER_BY_ID = select(User).where(User.id == bindparam("user_id"))
+USER_BY_EMAIL = select(User).where(User.email == bindparam("email"))
+USER_EMAIL_BY_ID = select(User.email).where(User.id == bindparam("user_id"))
+
+# Conditional claim used by borrowing: only one concurrent caller can flip
+# an available book, the others match zero rows. Returns what the borrow
+# needs afterwards (notification and facet counters) without a reload.
+CLAIM_BOOK = (
+    update(Book)
+    .where(Book.id == bindparam("book_id"), Book.available == True)
+    .values(available=False)
+    .returning(Book.isbn, Book.publisher, Book.category)
+    .execution_options(synchronize_session=False)
+)
+
+__all__ = [
+    "BOOK_BY_ID", "BOOK_BY_ISBN", "USER_BY_ID", "USER_BY_EMAIL",
+    "USER_EMAIL_BY_ID", "CLAIM_BOOK"
+]
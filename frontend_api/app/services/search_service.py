@@ -0,0 +1,118 @@
+from sqlalchemy.orm import Session
+from sqlalchemy.engine import Engine
+from sqlalchemy import select, func, case, and_, or_, literal_column, text
+from sqlalchemy.exc import SQLAlchemyError
+from ..models.book import Book
+from ..schemas.book import BookList
+from shared.pagination import PaginatedResponse
+from shared.exceptions import (
+    LibraryException,
+    DatabaseOperationError,
+    ValidationError
+)
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Text search configuration of the search_vector column
+SEARCH_CONFIG = "english"
+
+# Most words of a search used by the LIKE fallback
+MAX_FALLBACK_TERMS = 8
+
+# Postgres only: a generated tsvector over title (weight A) and author
+# (weight B) with a GIN index. Both statements are idempotent.
+SEARCH_SCHEMA_DDL = (
+    f"""
+    ALTER TABLE books ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(author, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_books_search_vector ON books USING gin (search_vector)"
+)
+
+class SearchService:
+    """Ranked search over the titles and authors of available books.
+
+    On Postgres the query is matched against the ``search_vector`` column
+    through its GIN index and ranked with ``ts_rank``. Other databases (the
+    SQLite test setup) fall back to case-insensitive LIKE matching of every
+    word, ranking title matches above author matches.
+    """
+
+    def ensure_schema(self, engine: Engine) -> None:
+        """Create the search column and index on Postgres; no-op elsewhere."""
+        if engine.dialect.name != "postgresql":
+            return
+        with engine.begin() as connection:
+            for statement in SEARCH_SCHEMA_DDL:
+                connection.execute(text(statement))
+
+    def search_books(
+        self,
+        db: Session,
+        q: str,
+        page: int = 1,
+        limit: int = 10
+    ) -> PaginatedResponse[BookList]:
+        """Search available books by title and author, best matches first.
+
+        Raises:
+            ValidationError: If the search text has no words
+        """
+        try:
+            q = q.strip()
+            if not q:
+                raise ValidationError(message="Search text must not be empty")
+
+            if db.get_bind().dialect.name == "postgresql":
+                match, rank = self._postgres_match(q)
+            else:
+                match, rank = self._fallback_match(q)
+
+            # Like the catalogue listings, only available books are returned
+            match = and_(match, Book.available == True)
+            try:
+                total = db.scalar(select(func.count()).select_from(Book).where(match))
+                books = db.execute(
+                    select(Book)
+                    .where(match)
+                    .order_by(rank.desc(), Book.id)
+                    .offset((page - 1) * limit)
+                    .limit(limit)
+                ).scalars().all()
+            except SQLAlchemyError as e:
+                raise DatabaseOperationError(f"Failed to search books: {str(e)}") from e
+
+            return PaginatedResponse.create(
+                items=[BookList.model_validate(book) for book in books],
+                total=total,
+                page=page,
+                limit=limit
+            )
+
+        except (DatabaseOperationError, ValidationError):
+            raise
+        except Exception as e:
+            raise LibraryException(f"An unexpected error occurred while searching books: {str(e)}")
+
+    def _postgres_match(self, q: str):
+        """Full-text match and rank; accepts web search syntax ("quoted", -not, or)."""
+        search_vector = literal_column("books.search_vector")
+        query = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+        return search_vector.op("@@")(query), func.ts_rank(search_vector, query)
+
+    def _fallback_match(self, q: str):
+        """Every word must appear in the title or author; title hits rank higher."""
+        matches = []
+        ranks = []
+        for term in q.split()[:MAX_FALLBACK_TERMS]:
+            in_title = Book.title.icontains(term, autoescape=True)
+            in_author = Book.author.icontains(term, autoescape=True)
+            matches.append(or_(in_title, in_author))
+            ranks.extend([case((in_title, 2), else_=0), case((in_author, 1), else_=0)])
+        return and_(*matches), sum(ranks[1:], ranks[0])
+
+search_service = SearchService()
@@ -1,6 +1,8 @@
 from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
 from ..models.user import User
 from ..schemas.user import UserCreate
+from .queries import USER_BY_ID, USER_BY_EMAIL
 from shared.message_broker import MessageBroker
 from shared.message_types import MessageType
 from shared.exceptions import (
@@ -9,11 +11,19 @@ from shared.exceptions import (
     ResourceNotFoundError,
     MessageBrokerError
 )
+from shared.cache import TTLCache
+from shared.cache_registry import cache_registry
 from ..core.config import settings
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Ids of users that do not exist, so repeated lookups skip the database.
+# create_user drops the id it creates; the short TTL covers other workers.
+missing_user_ids = cache_registry.register(TTLCache(
+    maxsize=settings.NEGATIVE_CACHE_SIZE, ttl=settings.NEGATIVE_CACHE_TTL, name="missing_user_ids"
+))
+
 class UserService:
     def __init__(self, message_broker: MessageBroker):
         self.message_broker = message_broker
@@ -21,8 +31,11 @@ class UserService:
     def get_user(self, db: Session, user_id: int):
         """Get a user by ID."""
         try:
-            user = db.query(User).filter(User.id == user_id).first()
+            if missing_user_ids.get(user_id):
+                raise ResourceNotFoundError("User", user_id)
+            user = db.execute(USER_BY_ID, {"user_id": user_id}).scalars().first()
             if not user:
+                missing_user_ids.set(user_id, True)
                 raise ResourceNotFoundError("User", user_id)
             return user
         except ResourceNotFoundError:
@@ -35,7 +48,7 @@ class UserService:
     def get_user_by_email(self, db: Session, email: str):
         """Get a user by email."""
         try:
-            return db.query(User).filter(User.email == email).first()
+            return db.execute(USER_BY_EMAIL, {"email": email}).scalars().first()
         except SQLAlchemyError as e:
             raise DatabaseOperationError(f"Failed to fetch user by email: {str(e)}") from e
         except Exception as e:
@@ -66,6 +79,7 @@ class UserService:
             except SQLAlchemyError as e:
                 db.rollback()
                 raise DatabaseOperationError(f"Failed to create user: {str(e)}") from e
+            missing_user_ids.delete(db_user.id)
 
             # Notify admin_api about new user
             try:
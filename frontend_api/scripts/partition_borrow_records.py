@@ -0,0 +1,31 @@
+"""Convert borrow_records to monthly partitions (Postgres only).
+
+A one-off step per database, run before the first deploy of a version
+whose services maintain the partitions, preferably while nothing writes to
+borrow_records:
+
+    docker compose exec frontend_api python -m scripts.partition_borrow_records
+
+Running it again on a partitioned table only adds missing partitions.
+"""
+from app.core.config import settings
+from app.core.database import engine
+from app.models import BorrowRecord
+from shared.partitioning import partition_table
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+if __name__ == "__main__":
+    try:
+        converted = partition_table(
+            engine, BorrowRecord.__table__, "borrow_date", settings.BORROW_PARTITION_MONTHS_AHEAD
+        )
+    except Exception as e:
+        logger.error(f"Partitioning borrow_records failed: {str(e)}")
+        raise
+    if converted:
+        logger.info("borrow_records converted to monthly partitions")
+    else:
+        logger.info("borrow_records is already partitioned or the database is not Postgres")
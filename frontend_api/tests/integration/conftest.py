@@ -10,6 +10,7 @@ from app.models.borrow import BorrowRecord
 from typing import AsyncGenerator, Generator
 import uuid
 from fastapi.testclient import TestClient
+from shared.cache_registry import cache_registry
 
 @pytest.fixture(scope="session", autouse=True)
 def setup_database():
@@ -29,6 +30,12 @@ def db_session() -> Generator[Session, None, None]:
         session.rollback()  # Roll back any pending transactions
         session.close()
 
+@pytest.fixture(autouse=True)
+def reset_caches():
+    # SQLite reuses the ids of deleted test rows, which the caches may remember
+    cache_registry.clear()
+    yield
+
 @pytest_asyncio.fixture
 async def async_client() -> AsyncGenerator[AsyncClient, None]:
     async with AsyncClient(app=app, base_url="http://test") as ac:
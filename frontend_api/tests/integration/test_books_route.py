@@ -1,5 +1,9 @@
 import pytest
 from httpx import AsyncClient
+from app.services.book_service import BookService, bump_catalog_versions, book_event_data, book_detail_cache
+from app.core.cache import catalog_cache
+from app.core.config import settings
+from shared.exceptions import DatabaseOperationError
 
 @pytest.mark.asyncio
 class TestBookEndpoints:
@@ -24,6 +28,104 @@ class TestBookEndpoints:
         assert data["id"] == test_book.id
         assert data["title"] == test_book.title
 
+    async def test_get_book_conditional(self, async_client: AsyncClient, test_book):
+        response = await async_client.get(f"/api/v1/books/{test_book.id}")
+        etag = response.headers["etag"]
+        assert etag.startswith('W/"')
+        assert "max-age" in response.headers["cache-control"]
+
+        response = await async_client.get(
+            f"/api/v1/books/{test_book.id}", headers={"If-None-Match": etag}
+        )
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+        # A borrow, create or delete of the book changes its ETag
+        bump_catalog_versions(book_event_data(test_book))
+        response = await async_client.get(
+            f"/api/v1/books/{test_book.id}", headers={"If-None-Match": etag}
+        )
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+
+    async def test_get_book_after_change_by_another_worker(self, async_client: AsyncClient, test_book, db_session):
+        url = f"/api/v1/books/{test_book.id}"
+        etag = (await async_client.get(url)).headers["etag"]
+
+        # Another worker renames the book: only the shared version moves here
+        test_book.title = "Test Book, Revised"
+        db_session.commit()
+        bump_catalog_versions(book_event_data(test_book))
+        response = await async_client.get(url)
+        assert response.headers["etag"] != etag
+        assert response.json()["title"] == "Test Book, Revised"
+        response = await async_client.get(url, headers={"If-None-Match": response.headers["etag"]})
+        assert response.status_code == 304
+
+        # ...then lends it
+        test_book.available = False
+        db_session.commit()
+        bump_catalog_versions(book_event_data(test_book))
+        response = await async_client.get(url)
+        assert response.status_code == 404
+
+    async def test_list_books_conditional(self, async_client: AsyncClient, test_book):
+        params = {"publisher": test_book.publisher}
+        etag = (await async_client.get("/api/v1/books/", params=params)).headers["etag"]
+        other = (await async_client.get("/api/v1/books/", params={**params, "page": 2})).headers["etag"]
+        assert other != etag
+
+        response = await async_client.get(
+            "/api/v1/books/", params=params, headers={"If-None-Match": f'"other", {etag}'}
+        )
+        assert response.status_code == 304
+
+        # Changes to books of another publisher leave the page's ETag alone
+        bump_catalog_versions({"id": 0, "publisher": "Other Publisher", "category": test_book.category})
+        response = await async_client.get("/api/v1/books/", params=params, headers={"If-None-Match": etag})
+        assert response.status_code == 304
+
+        bump_catalog_versions(book_event_data(test_book))
+        response = await async_client.get("/api/v1/books/", params=params, headers={"If-None-Match": etag})
+        assert response.status_code == 200
+
+    async def test_get_book_stale_if_error(self, async_client: AsyncClient, test_book, monkeypatch):
+        fresh = await async_client.get(f"/api/v1/books/{test_book.id}")
+        assert "x-cache-stale" not in fresh.headers
+
+        def failing_load(self, db, book_id):
+            raise DatabaseOperationError("Failed to fetch book: timeout")
+        monkeypatch.setattr(BookService, "_load_book", failing_load)
+        book_detail_cache.delete(test_book.id)
+
+        response = await async_client.get(f"/api/v1/books/{test_book.id}")
+        assert response.status_code == 200
+        assert response.json() == fresh.json()
+        assert response.headers["x-cache-stale"] == "if-error"
+        assert "age" in response.headers
+        assert "etag" not in response.headers
+
+    async def test_filter_books_by_publisher_stale_if_error(self, async_client: AsyncClient, test_book, monkeypatch):
+        url = f"/api/v1/books/publishers/{test_book.publisher}/"
+        fresh = await async_client.get(url, params={"page": 1, "limit": 10})
+        assert "x-cache-stale" not in fresh.headers
+
+        def failing_load(self, *args):
+            raise DatabaseOperationError("Failed to count books by publisher: timeout")
+        monkeypatch.setattr(BookService, "_load_books_by", failing_load)
+        catalog_cache.client.flushdb()
+
+        response = await async_client.get(url, params={"page": 1, "limit": 10})
+        assert response.status_code == 200
+        assert response.json() == fresh.json()
+        assert response.headers["x-cache-stale"] == "if-error"
+        assert "age" in response.headers
+
+    async def test_get_missing_book(self, async_client: AsyncClient):
+        response = await async_client.get("/api/v1/books/999999")
+        assert response.status_code == 404
+
     async def test_filter_books_by_publisher(self, async_client: AsyncClient, test_book):
         """Test filtering books by publisher"""
         response = await async_client.get(
@@ -44,4 +146,61 @@ class TestBookEndpoints:
         assert response.status_code == 200
         data = response.json()
         assert "items" in data
-        assert len(data["items"]) > 0 
\ No newline at end of file
+        assert len(data["items"]) > 0 
+
+    async def test_list_books_with_repeated_filters(self, async_client: AsyncClient, test_book):
+        """Test filtering the listing by several publishers in one request"""
+        response = await async_client.get("/api/v1/books/", params=[
+            ("publisher", test_book.publisher),
+            ("publisher", "Another Publisher"),
+            ("category", test_book.category)
+        ])
+        assert response.status_code == 200
+        data = response.json()
+        assert [item["id"] for item in data["items"]] == [test_book.id]
+
+        response = await async_client.get(
+            "/api/v1/books/",
+            params=[("publisher", f"Publisher {i}") for i in range(21)]
+        )
+        assert response.status_code == 400
+
+    async def test_get_book_facets(self, async_client: AsyncClient):
+        """Test the facet counts endpoint is not shadowed by /{book_id}"""
+        response = await async_client.get("/api/v1/books/facets")
+        assert response.status_code == 200
+        data = response.json()
+        assert "publishers" in data
+        assert "categories" in data
+
+    async def test_search_books(self, async_client: AsyncClient, test_book):
+        """Test searching books by a word of the title"""
+        word = test_book.title.split()[0]
+        response = await async_client.get("/api/v1/books/search", params={"q": word})
+        assert response.status_code == 200
+        data = response.json()
+        assert test_book.id in [item["id"] for item in data["items"]]
+
+        response = await async_client.get("/api/v1/books/search", params={"q": " "})
+        assert response.status_code == 400
+
+    async def test_cache_stats(self, async_client: AsyncClient, test_book, monkeypatch):
+        await async_client.get(f"/api/v1/books/{test_book.id}")
+        # Hidden without a configured token, and without the right header
+        response = await async_client.get("/api/v1/internal/caches")
+        assert response.status_code == 404
+        monkeypatch.setattr(settings, "INTERNAL_API_TOKEN", "secret")
+        response = await async_client.get("/api/v1/internal/caches", headers={"X-Internal-Token": "wrong"})
+        assert response.status_code == 404
+
+        headers = {"X-Internal-Token": "secret"}
+        response = await async_client.get("/api/v1/internal/caches", headers=headers)
+        assert response.status_code == 200
+        stats = response.json()
+        assert stats["book_detail"]["size"] >= 1
+        for name in ("hits", "misses", "evictions", "avg_load_ms"):
+            assert name in stats["book_detail"]
+        # Sizing every entry is opt-in
+        assert stats["book_detail"]["bytes"] is None
+        response = await async_client.get("/api/v1/internal/caches", params={"bytes": "true"}, headers=headers)
+        assert response.json()["book_detail"]["bytes"] > 0
@@ -12,4 +12,24 @@ class TestBorrowEndpoints:
         assert response.status_code == 200
         data = response.json()
         assert data["user_id"] == test_user.id
-        assert data["book_id"] == test_book.id
\ No newline at end of file
+        assert data["book_id"] == test_book.id
+
+    async def test_borrow_missing_user(self, async_client: AsyncClient, test_book):
+        """Test borrowing for a user that does not exist"""
+        response = await async_client.post(
+            f"/api/v1/borrow/user/999999/book/{test_book.id}",
+            params={"days": 7}
+        )
+        assert response.status_code == 404
+        data = response.json()
+        assert data["type"] == "library_error"
+        assert data["error_code"] == "RESOURCE_NOT_FOUND"
+
+    async def test_borrow_unavailable_book(self, async_client: AsyncClient, borrowed_test_book, test_user):
+        """Test borrowing a book that is already lent out"""
+        response = await async_client.post(
+            f"/api/v1/borrow/user/{test_user.id}/book/{borrowed_test_book.id}",
+            params={"days": 7}
+        )
+        assert response.status_code == 400
+        assert response.json()["type"] == "http_error"
@@ -28,4 +28,8 @@ class TestUserEndpoints:
         }
         response = await async_client.post("/api/v1/users/", json=user_data)
         assert response.status_code == 400
-        assert "already registered" in response.json()["detail"].lower() 
\ No newline at end of file
+        assert "already registered" in response.json()["detail"].lower() 
+
+    async def test_read_missing_user(self, async_client: AsyncClient):
+        response = await async_client.get("/api/v1/users/me/999999")
+        assert response.status_code == 404
@@ -10,6 +10,7 @@ from fastapi.testclient import TestClient
 from app.core.database import Base, get_db
 from app.main import app
 from shared.message_broker import MessageBroker
+from shared.cache_registry import cache_registry
 
 # Create in-memory SQLite database for testing
 SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
@@ -41,6 +42,12 @@ def db_session() -> Session:
         session.close()
         Base.metadata.drop_all(engine)
 
+@pytest.fixture(autouse=True)
+def reset_count_caches():
+    # Cached totals and books are module-level and would leak between databases
+    cache_registry.clear()
+    yield
+
 @pytest.fixture
 def client(db_session):
     def override_get_db():
@@ -0,0 +1,92 @@
+import pytest
+from app.services.autocomplete_service import AutocompleteService, autocomplete_service
+from app.services.book_service import BookService
+from app.models.book import Book
+from app.schemas.book import BookCreate
+
+class TestAutocompleteService:
+    @pytest.fixture
+    def service(self, db_session):
+        db_session.add_all([
+            Book(title="Clean Code", author="Robert C. Martin", isbn="1",
+                 publisher="Publisher", category="Software", available=True),
+            Book(title="Les Misérables", author="Victor Hugo", isbn="2",
+                 publisher="Publisher", category="Fiction", available=True),
+            Book(title="Code Complete", author="Steve McConnell", isbn="3",
+                 publisher="Publisher", category="Software", available=True),
+            Book(title="Code Lent", author="Ann Borrowed", isbn="5",
+                 publisher="Publisher", category="Software", available=False)
+        ])
+        db_session.commit()
+        service = AutocompleteService()
+        service.load(db_session)
+        return service
+
+    def test_suggest_matches_any_word_start(self, service):
+        # Shorter matching keys sort first: "code" before "code complete"
+        assert [s.title for s in service.suggest("cod")] == ["Clean Code", "Code Complete"]
+        assert [s.title for s in service.suggest("clean c")] == ["Clean Code"]
+        assert [s.title for s in service.suggest("MART")] == ["Clean Code"]
+        assert service.suggest("lean") == []
+
+    def test_suggest_ignores_accents_and_punctuation(self, service):
+        assert [s.title for s in service.suggest("miserab")] == ["Les Misérables"]
+        assert [s.author for s in service.suggest("robert c.")] == ["Robert C. Martin"]
+        assert service.suggest("!!") == []
+
+    def test_suggest_respects_limit(self, service):
+        assert len(service.suggest("c", limit=1)) == 1
+
+    def test_index_follows_book_events(self, service):
+        service.add_books([
+            {"id": 10, "title": "Refactoring", "author": "Martin Fowler", "available": True},
+            {"id": 11, "title": "Martin Eden", "author": "Jack London", "available": False}
+        ])
+        assert [s.title for s in service.suggest("martin")] == ["Clean Code", "Refactoring"]
+
+        service.remove_book({"id": 1, "isbn": "1"})
+        assert [s.title for s in service.suggest("martin")] == ["Refactoring"]
+        assert [s.title for s in service.suggest("cod")] == ["Code Complete"]
+
+        service.mark_borrowed({"book_id": 10})
+        assert service.suggest("martin") == []
+
+    def test_suggest_skips_unavailable_books(self, db_session, service):
+        assert [s.title for s in service.suggest("ann")] == []
+        assert [s.title for s in service.suggest("code l")] == []
+
+        # A reload picks up books changed outside this process
+        db_session.query(Book).filter(Book.isbn.in_(["3", "5"])).update(
+            {"available": Book.isbn == "5"}, synchronize_session=False
+        )
+        db_session.commit()
+        service.load(db_session)
+        assert [s.title for s in service.suggest("code")] == ["Clean Code", "Code Lent"]
+
+    def test_reload_keeps_books_changed_meanwhile(self, db_session, service):
+        load_query = db_session.execute
+        def execute_during_events(*args, **kwargs):
+            service.add_books([{"id": 20, "title": "Aesop", "author": "Aesop", "available": True}])
+            service.remove_book({"id": 1, "isbn": "1"})
+            return load_query(*args, **kwargs)
+        db_session.execute = execute_during_events
+        service.load(db_session)
+        del db_session.execute
+
+        assert [s.title for s in service.suggest("aes")] == ["Aesop"]
+        assert [s.title for s in service.suggest("clean")] == []
+
+    @pytest.mark.asyncio
+    async def test_index_is_updated_by_book_service(self, db_session, mock_message_broker):
+        # The shared instance is subscribed to the local book events
+        autocomplete_service.load(db_session)
+        book_service = BookService(mock_message_broker)
+
+        await book_service.create_books(db_session, [
+            BookCreate(title="Domain-Driven Design", author="Eric Evans", isbn="4",
+                       publisher="Publisher", category="Software")
+        ])
+        assert [s.title for s in autocomplete_service.suggest("driven")] == ["Domain-Driven Design"]
+
+        await book_service.delete_book_by_isbn(db_session, "4")
+        assert autocomplete_service.suggest("driven") == []
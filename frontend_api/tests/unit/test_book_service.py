@@ -1,10 +1,30 @@
 # frontend_api/tests/unit/test_book_service.py
 import pytest
 from datetime import datetime
-from app.services.book_service import BookService
+from app.services.book_service import (
+    BookService, books_total, book_detail_cache, missing_book_ids, book_reads, stale_catalog,
+    catalog_refresher, save_book_details, load_book_details, bump_catalog_versions, book_event_data,
+    MAX_FILTER_VALUES
+)
+from app.core.events import local_events
 from app.models.book import Book
 from app.schemas.book import BookCreate, BookList
+from app.schemas.borrow import BorrowCreate
+from app.services.borrow_service import BorrowService
+from app.models.user import User
+from app.core.cache import catalog_cache
+import redis
+from sqlalchemy.orm import sessionmaker
+import threading
+import time
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 from shared.message_types import MessageType
+from shared.exceptions import ValidationError, ResourceNotFoundError, DatabaseOperationError
+from shared.counting import CountStrategy
+from shared.cache_registry import cache_registry
+from shared import redis_cache
+from shared.redis_cache import InMemoryRedis
 
 class TestBookService:
     @pytest.mark.asyncio
@@ -65,6 +85,42 @@ class TestBookService:
         assert len(result.items) == 1
         assert result.items[0].title == "Book 1"
 
+    def test_get_books_with_multi_value_filters(self, db_session, mock_message_broker):
+        book_service = BookService(mock_message_broker)
+        for i, (publisher, category, available) in enumerate([
+            ("Publisher A", "Fiction", True),
+            ("Publisher B", "Fiction", True),
+            ("Publisher C", "Fiction", True),
+            ("Publisher A", "Science", True),
+            ("Publisher B", "Fiction", False)
+        ]):
+            db_session.add(Book(
+                title=f"Book {i}",
+                author=f"Author {i % 2}",
+                isbn=f"isbn-{i}",
+                publisher=publisher,
+                category=category,
+                available=available
+            ))
+        db_session.commit()
+
+        result = book_service.get_books(
+            db_session,
+            publisher=["Publisher A", "Publisher B"],
+            category=["Fiction"]
+        )
+        assert [book.title for book in result.items] == ["Book 0", "Book 1"]
+        assert result.total == 2
+
+        result = book_service.get_books(db_session, author=["Author 0", "Author 0"])
+        assert [book.title for book in result.items] == ["Book 0", "Book 2"]
+
+        with pytest.raises(ValidationError):
+            book_service.get_books(
+                db_session,
+                publisher=[f"Publisher {i}" for i in range(MAX_FILTER_VALUES + 1)]
+            )
+
     @pytest.mark.asyncio
     async def test_create_books(self, db_session, mock_message_broker, sample_book_data):
         # Arrange
@@ -77,4 +133,472 @@ class TestBookService:
         # Assert
         assert len(created_books) == 1
         assert created_books[0].title == sample_book_data["title"]
-        mock_message_broker.publish.assert_not_called()
\ No newline at end of file
+        mock_message_broker.publish.assert_not_called()
+
+    def test_get_books_cursor_pagination(self, db_session, mock_message_broker):
+        # Arrange: duplicate titles so the id tie-breaker matters
+        book_service = BookService(mock_message_broker)
+        for i in range(7):
+            db_session.add(Book(
+                title=f"Book {i % 3}",
+                author="Author",
+                isbn=f"isbn-{i}",
+                publisher="Publisher",
+                category="Fiction",
+                available=True
+            ))
+        db_session.commit()
+
+        # Act: walk all pages by cursor
+        seen = []
+        result = book_service.get_books(db_session, page=1, limit=3)
+        seen.extend(book.id for book in result.items)
+        while result.next_cursor:
+            result = book_service.get_books(db_session, limit=3, cursor=result.next_cursor)
+            assert result.page is None
+            seen.extend(book.id for book in result.items)
+
+        # Assert: same order as offset pagination, nothing skipped or repeated
+        by_offset = []
+        for page in range(1, 4):
+            by_offset.extend(
+                book.id for book in book_service.get_books(db_session, page=page, limit=3).items
+            )
+        assert seen == by_offset
+        assert len(set(seen)) == 7
+        assert result.total == 7
+
+    def test_get_books_invalid_cursor(self, db_session, mock_message_broker):
+        book_service = BookService(mock_message_broker)
+
+        with pytest.raises(ValidationError):
+            book_service.get_books(db_session, cursor="not-a-cursor")
+
+    @pytest.mark.asyncio
+    async def test_get_books_cached_total_invalidated_by_events(self, db_session, mock_message_broker, sample_book_data):
+        book_service = BookService(mock_message_broker)
+        db_session.add(Book(**sample_book_data))
+        db_session.commit()
+        assert book_service.get_books(db_session).total == 1
+
+        # A change this process was not told about keeps the cached total
+        db_session.add(Book(**{**sample_book_data, "isbn": "other-isbn"}))
+        db_session.commit()
+        assert book_service.get_books(db_session).total == 1
+
+        # Deleting through the service publishes an event that drops it
+        await book_service.delete_book_by_isbn(db_session, "other-isbn")
+        result = book_service.get_books(db_session)
+        assert result.total == 1
+        assert len(result.items) == 1
+
+        db_session.add(Book(**{**sample_book_data, "isbn": "third-isbn"}))
+        db_session.commit()
+        local_events.publish(MessageType.BOOKS_CREATED, [])
+        assert book_service.get_books(db_session).total == 2
+
+    def test_get_books_estimate_falls_back_to_exact_count(self, db_session, mock_message_broker, sample_book_data, monkeypatch):
+        # SQLite has no planner estimate, so the exact count is used
+        monkeypatch.setattr(books_total, "strategy", CountStrategy.ESTIMATE)
+        book_service = BookService(mock_message_broker)
+        db_session.add(Book(**sample_book_data))
+        db_session.commit()
+
+        result = book_service.get_books(db_session)
+        assert result.total == 1
+        assert result.total_is_estimate is False
+
+    def test_get_book_served_from_cache(self, db_session, mock_message_broker, sample_book_data):
+        book_service = BookService(mock_message_broker)
+        db_book = Book(**sample_book_data)
+        db_session.add(db_book)
+        db_session.commit()
+        hits, misses = book_detail_cache.hits, book_detail_cache.misses
+
+        first = book_service.get_book(db_session, db_book.id)
+        # An update this process was not told about is not seen until the TTL
+        db_book.title = "Changed elsewhere"
+        db_session.commit()
+        second = book_service.get_book(db_session, db_book.id)
+
+        assert second is first
+        assert second.title == sample_book_data["title"]
+        assert book_detail_cache.misses == misses + 1
+        assert book_detail_cache.hits == hits + 1
+
+    @pytest.mark.asyncio
+    async def test_get_book_cache_invalidated_by_borrow_and_delete(self, db_session, mock_message_broker, sample_book_data):
+        book_service = BookService(mock_message_broker)
+        borrowed = Book(**sample_book_data)
+        deleted = Book(**{**sample_book_data, "isbn": "other-isbn"})
+        user = User(email="reader@example.com", firstname="Test", lastname="Reader")
+        db_session.add_all([borrowed, deleted, user])
+        db_session.commit()
+        book_service.get_book(db_session, borrowed.id)
+        book_service.get_book(db_session, deleted.id)
+
+        await BorrowService(mock_message_broker).create_borrow_record(
+            db_session, BorrowCreate(user_id=user.id, book_id=borrowed.id, days=7)
+        )
+        await book_service.delete_book_by_isbn(db_session, "other-isbn")
+
+        with pytest.raises(ResourceNotFoundError):
+            book_service.get_book(db_session, borrowed.id)
+        with pytest.raises(ResourceNotFoundError):
+            book_service.get_book(db_session, deleted.id)
+
+    def test_get_book_cache_evicts_least_recently_used(self, db_session, mock_message_broker, sample_book_data, monkeypatch):
+        monkeypatch.setattr(book_detail_cache, "maxsize", 2)
+        book_service = BookService(mock_message_broker)
+        books = [Book(**{**sample_book_data, "isbn": f"isbn-{i}"}) for i in range(3)]
+        db_session.add_all(books)
+        db_session.commit()
+        evictions = book_detail_cache.evictions
+
+        book_service.get_book(db_session, books[0].id)
+        book_service.get_book(db_session, books[1].id)
+        book_service.get_book(db_session, books[0].id)
+        book_service.get_book(db_session, books[2].id)
+
+        assert book_detail_cache.evictions == evictions + 1
+        assert len(book_detail_cache) == 2
+        assert book_detail_cache.get(books[1].id) is None
+        assert book_detail_cache.get(books[0].id) is not None
+
+    @pytest.mark.asyncio
+    async def test_catalog_pages_invalidated_per_namespace(self, db_session, mock_message_broker, sample_book_data):
+        book_service = BookService(mock_message_broker)
+        book_a = Book(**{**sample_book_data, "isbn": "a-1", "publisher": "Publisher A"})
+        book_b = Book(**{**sample_book_data, "isbn": "b-1", "publisher": "Publisher B"})
+        user = User(email="reader@example.com", firstname="Test", lastname="Reader")
+        db_session.add_all([book_a, book_b, user])
+        db_session.commit()
+        assert (await book_service.get_books_by_publisher(db_session, "Publisher A")).total == 1
+        assert (await book_service.get_books_by_publisher(db_session, "Publisher B")).total == 1
+        assert book_service.get_books(db_session).total == 2
+
+        # Rows changed behind the services' back stay invisible: pages are cached
+        db_session.add(Book(**{**sample_book_data, "isbn": "b-2", "publisher": "Publisher B"}))
+        db_session.commit()
+        page = await BookService(mock_message_broker).get_books_by_publisher(db_session, "Publisher B")
+        assert page.total == 1
+
+        # Borrowing a Publisher A book only invalidates Publisher A and the full catalogue
+        await BorrowService(mock_message_broker).create_borrow_record(
+            db_session, BorrowCreate(user_id=user.id, book_id=book_a.id, days=7)
+        )
+        page = await book_service.get_books_by_publisher(db_session, "Publisher A")
+        assert [item.available for item in page.items] == [False]
+        assert (await book_service.get_books_by_publisher(db_session, "Publisher B")).total == 1
+        assert book_service.get_books(db_session).total == 2
+        assert book_service.get_books(db_session, publisher="Publisher B").total == 2
+
+    def test_catalog_cache_unavailable_falls_back_to_database(self, db_session, mock_message_broker, sample_book_data, monkeypatch):
+        class DownRedis:
+            def __getattr__(self, name):
+                def fail(*args, **kwargs):
+                    raise redis.ConnectionError("Connection refused")
+                return fail
+
+        monkeypatch.setattr(catalog_cache, "client", DownRedis())
+        book_service = BookService(mock_message_broker)
+        db_session.add(Book(**sample_book_data))
+        db_session.commit()
+
+        result = book_service.get_books(db_session)
+        assert result.total == 1
+        assert result.items[0].isbn == sample_book_data["isbn"]
+
+    def test_in_memory_catalog_cache_drops_expired_keys(self, monkeypatch):
+        client = InMemoryRedis()
+        now = [1000.0]
+        monkeypatch.setattr(redis_cache.time, "monotonic", lambda: now[0])
+        client.set("version", b"1")
+        for i in range(redis_cache.MIN_SWEEP_SIZE - 2):
+            client.set(f"old:{i}", b"x", ex=60)
+        now[0] += 61
+
+        # Superseded keys are never read again, yet the next write drops them
+        client.set("new", b"x", ex=60)
+        assert len(client._values) == 2
+        assert client.get("version") == b"1"
+        assert client._sweep_at == redis_cache.MIN_SWEEP_SIZE
+
+    @pytest.mark.asyncio
+    async def test_etags_change_with_catalog_events(self, db_session, mock_message_broker, sample_book_data):
+        book_service = BookService(mock_message_broker)
+        book = Book(**sample_book_data)
+        user = User(email="reader@example.com", firstname="Test", lastname="Reader")
+        db_session.add_all([book, user])
+        db_session.commit()
+        book_etag = book_service.book_etag(book.id)
+        list_etag = book_service.books_etag(category=sample_book_data["category"])
+        assert book_service.book_etag(book.id) == book_etag
+        assert book_service.books_etag(category=[sample_book_data["category"]]) == list_etag
+        assert book_service.books_etag(category="Other") != list_etag
+
+        await BorrowService(mock_message_broker).create_borrow_record(
+            db_session, BorrowCreate(user_id=user.id, book_id=book.id, days=7)
+        )
+
+        assert book_service.book_etag(book.id) != book_etag
+        assert book_service.books_etag(category=sample_book_data["category"]) != list_etag
+
+    def test_encoded_responses_match_normal_serialization(self, db_session, mock_message_broker, sample_book_data):
+        book_service = BookService(mock_message_broker)
+        book = Book(**{**sample_book_data, "title": "Über Café — 東京"})
+        db_session.add(book)
+        db_session.add(Book(**{**sample_book_data, "isbn": "other-isbn"}))
+        db_session.commit()
+
+        # Both the first (miss) and second (hit) call return what FastAPI would encode
+        for _ in range(2):
+            assert book_service.get_book_json(db_session, book.id) == JSONResponse(
+                jsonable_encoder(book_service.get_book(db_session, book.id))
+            ).body
+            assert book_service.get_books_json(db_session, limit=1) == JSONResponse(
+                jsonable_encoder(book_service.get_books(db_session, limit=1))
+            ).body
+
+    @pytest.mark.asyncio
+    async def test_get_missing_book_is_remembered(self, db_session, mock_message_broker, sample_book_data):
+        book_service = BookService(mock_message_broker)
+        with pytest.raises(ResourceNotFoundError):
+            book_service.get_book(db_session, 1)
+        assert missing_book_ids.get(1)
+
+        # A book inserted behind the service's back stays missing until the TTL
+        db_session.add(Book(id=1, **sample_book_data))
+        db_session.commit()
+        with pytest.raises(ResourceNotFoundError):
+            book_service.get_book(db_session, 1)
+
+        # Books created through the service (e.g. by BookSyncService) are visible at once
+        missing_book_ids.set(2, True)
+        await book_service.create_books(
+            db_session, [BookCreate(**{**sample_book_data, "isbn": "new-isbn"})]
+        )
+        assert book_service.get_book(db_session, 2).isbn == "new-isbn"
+
+    def test_concurrent_cache_misses_share_one_query(self, db_session, mock_message_broker, sample_book_data, monkeypatch):
+        db_book = Book(**sample_book_data)
+        db_session.add(db_book)
+        db_session.commit()
+        book_service = BookService(mock_message_broker)
+        entry = book_service._load_book(db_session, db_book.id)
+        book_detail_cache.clear()
+
+        release = threading.Event()
+        loads = []
+        def slow_load(db, book_id):
+            loads.append(book_id)
+            release.wait(5)
+            return entry
+        monkeypatch.setattr(book_service, "_load_book", slow_load)
+        collapsed = book_reads.collapsed
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(book_service.get_book(db_session, db_book.id)))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        deadline = time.monotonic() + 5
+        while book_reads.collapsed < collapsed + 7 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        assert loads == [db_book.id]
+        assert book_reads.collapsed == collapsed + 7
+        assert len(results) == 8
+        assert all(result is entry[0] for result in results)
+
+    @pytest.mark.asyncio
+    async def test_get_books_by_matches_publisher_and_category_listings(self, db_session, mock_message_broker, sample_book_data):
+        book_service = BookService(mock_message_broker)
+        db_session.add(Book(**sample_book_data))
+        db_session.commit()
+
+        by_publisher = book_service.get_books_by(db_session, "publisher", sample_book_data["publisher"])
+        by_category = await book_service.get_books_by_category(db_session, sample_book_data["category"])
+
+        assert by_publisher.total == by_category.total == 1
+        assert by_publisher.items == by_category.items
+
+    def test_get_books_serves_stale_page_if_database_fails(self, db_session, mock_message_broker, sample_book_data, monkeypatch):
+        book_service = BookService(mock_message_broker)
+        db_session.add(Book(**sample_book_data))
+        db_session.commit()
+        fresh = book_service.get_books_body(db_session)
+        assert fresh.stale is None
+
+        def failing_load(*args):
+            raise DatabaseOperationError("Failed to count books: timeout")
+        monkeypatch.setattr(book_service, "_load_books", failing_load)
+        catalog_cache.client.flushdb()
+
+        stale = book_service.get_books_body(db_session)
+        assert stale.body == fresh.body
+        assert stale.stale == "if-error"
+        assert stale.age >= 0
+        # Pages never read before have nothing to fall back to
+        with pytest.raises(DatabaseOperationError):
+            book_service.get_books_body(db_session, page=2)
+
+        monkeypatch.setattr(stale_catalog, "if_error", 0)
+        with pytest.raises(DatabaseOperationError):
+            book_service.get_books_body(db_session)
+
+    def test_get_books_by_serves_stale_page_if_database_fails(self, db_session, mock_message_broker, sample_book_data, monkeypatch):
+        book_service = BookService(mock_message_broker)
+        db_session.add(Book(**sample_book_data))
+        db_session.commit()
+        publisher = sample_book_data["publisher"]
+        fresh = book_service.get_books_by_page(db_session, "publisher", publisher)
+        assert fresh.stale is None
+
+        def failing_load(*args):
+            raise DatabaseOperationError("Failed to count books by publisher: timeout")
+        monkeypatch.setattr(book_service, "_load_books_by", failing_load)
+        catalog_cache.client.flushdb()
+
+        stale = book_service.get_books_by_page(db_session, "publisher", publisher)
+        assert stale.page == fresh.page
+        assert stale.stale == "if-error"
+        with pytest.raises(DatabaseOperationError):
+            book_service.get_books_by(db_session, "category", sample_book_data["category"])
+
+    @pytest.mark.asyncio
+    async def test_lent_book_has_no_stale_copy(self, db_session, mock_message_broker, sample_book_data, monkeypatch):
+        class InlineExecutor:
+            def submit(self, fn, *args):
+                fn(*args)
+
+        monkeypatch.setattr(stale_catalog, "while_revalidate", 60)
+        monkeypatch.setattr(catalog_refresher, "_executor", InlineExecutor())
+        monkeypatch.setattr(catalog_refresher, "session_factory", sessionmaker(bind=db_session.get_bind()))
+        book_service = BookService(mock_message_broker)
+        db_book = Book(**sample_book_data)
+        user = User(email="reader@example.com", firstname="Test", lastname="Reader")
+        db_session.add_all([db_book, user])
+        db_session.commit()
+        book_service.get_book(db_session, db_book.id)
+
+        await BorrowService(mock_message_broker).create_borrow_record(
+            db_session, BorrowCreate(user_id=user.id, book_id=db_book.id, days=7)
+        )
+        with pytest.raises(ResourceNotFoundError):
+            book_service.get_book_body(db_session, db_book.id)
+
+    def test_get_book_serves_stale_while_revalidating(self, db_session, mock_message_broker, sample_book_data, monkeypatch):
+        class InlineExecutor:
+            def submit(self, fn, *args):
+                fn(*args)
+
+        monkeypatch.setattr(stale_catalog, "while_revalidate", 60)
+        monkeypatch.setattr(catalog_refresher, "_executor", InlineExecutor())
+        monkeypatch.setattr(catalog_refresher, "session_factory", sessionmaker(bind=db_session.get_bind()))
+        book_service = BookService(mock_message_broker)
+        db_book = Book(**sample_book_data)
+        db_session.add(db_book)
+        db_session.commit()
+        assert book_service.get_book_body(db_session, db_book.id).stale is None
+
+        db_book.title = "Clean Code, 2nd edition"
+        db_session.commit()
+        book_detail_cache.delete(db_book.id)
+
+        # The old detail is served and the refresh stores the new one
+        stale = book_service.get_book_body(db_session, db_book.id)
+        assert stale.stale == "while-revalidate"
+        assert b'"Clean Code"' in stale.body
+        assert book_service.get_book(db_session, db_book.id).title == "Clean Code, 2nd edition"
+
+        # A refresh that finds the book gone drops the stale copy
+        db_book.available = False
+        db_session.commit()
+        book_detail_cache.delete(db_book.id)
+        assert book_service.get_book_body(db_session, db_book.id).stale == "while-revalidate"
+        book_detail_cache.delete(db_book.id)
+        with pytest.raises(ResourceNotFoundError):
+            book_service.get_book(db_session, db_book.id)
+
+    def test_book_detail_snapshot_round_trip(self, db_session, mock_message_broker, sample_book_data, tmp_path, monkeypatch):
+        # The versions outlive the process with Redis; here they live in the test's stand-in
+        monkeypatch.setattr(catalog_cache, "shared", True)
+        book_service = BookService(mock_message_broker)
+        books = [Book(**{**sample_book_data, "isbn": f"isbn-{i}"}) for i in range(3)]
+        db_session.add_all(books)
+        db_session.commit()
+        bodies = {book.id: book_service.get_book_json(db_session, book.id) for book in books}
+        path = str(tmp_path / "book_details.snapshot")
+        assert save_book_details(path) == 3
+
+        # Another worker changes one of the books before the next start
+        bump_catalog_versions(book_event_data(books[1]))
+        book_detail_cache.clear()
+        assert load_book_details(path) == 2
+
+        assert book_detail_cache.get(books[1].id) is None
+        for book in (books[0], books[2]):
+            detail, body, _ = book_detail_cache.get(book.id)
+            assert body == bodies[book.id]
+            assert detail == book_service.get_book(db_session, book.id)
+
+        # Versions from before Redis lost its data cannot be trusted
+        book_detail_cache.clear()
+        catalog_cache.client.flushdb()
+        assert load_book_details(path) == 0
+
+    def test_book_detail_snapshot_requires_redis(self, db_session, mock_message_broker, sample_book_data, tmp_path):
+        db_book = Book(**sample_book_data)
+        db_session.add(db_book)
+        db_session.commit()
+        BookService(mock_message_broker).get_book(db_session, db_book.id)
+        path = tmp_path / "book_details.snapshot"
+
+        assert not catalog_cache.shared
+        assert save_book_details(str(path)) == 0
+        assert not path.exists()
+        assert load_book_details(str(path)) == 0
+
+    def test_book_detail_snapshot_ignores_unusable_files(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(catalog_cache, "shared", True)
+        assert load_book_details(str(tmp_path / "missing.snapshot")) == 0
+        corrupt = tmp_path / "corrupt.snapshot"
+        corrupt.write_bytes(b"not a snapshot at all")
+        assert load_book_details(str(corrupt)) == 0
+        assert len(book_detail_cache) == 0
+
+    def test_cache_stats_are_registered(self, db_session, mock_message_broker, sample_book_data):
+        book_service = BookService(mock_message_broker)
+        db_book = Book(**sample_book_data)
+        db_session.add(db_book)
+        db_session.commit()
+        before = cache_registry.stats()
+
+        book_service.get_book(db_session, db_book.id)
+        book_service.get_book(db_session, db_book.id)
+        book_service.get_books(db_session)
+        book_service.get_books(db_session)
+
+        stats = cache_registry.stats()
+        detail = stats["book_detail"]
+        assert detail["hits"] == before["book_detail"]["hits"] + 1
+        assert detail["loads"] == before["book_detail"]["loads"] + 1
+        # The cached entry holds the model, its JSON and the version stamp
+        assert detail["size"] == 1
+        assert detail["bytes"] > 2 * len(book_service.get_book_json(db_session, db_book.id))
+        catalog = stats["catalog"]
+        assert catalog["hits"] == before["catalog"]["hits"] + 1
+        assert catalog["loads"] == before["catalog"]["loads"] + 1
+        assert stats["books_total"]["loads"] == before["books_total"]["loads"] + 1
+        assert {"missing_book_ids", "missing_user_ids", "stale_catalog", "first_pages"} <= set(stats)
+        assert stats["book_reads"]["executions"] == before["book_reads"]["executions"] + 2
+
+        cache_registry.clear()
+        assert book_detail_cache.get(db_book.id) is None
+        assert catalog_cache.get(("catalog",), "anything")[0] is None
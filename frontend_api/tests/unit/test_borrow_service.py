@@ -140,4 +140,52 @@ class TestBorrowService:
             await borrow_service.create_borrow_record(db_session, borrow_create)
         
         assert "Database error" in str(exc_info.value)
-        mock_message_broker.publish.assert_not_called() 
\ No newline at end of file
+        mock_message_broker.publish.assert_not_called() 
+
+    @pytest.mark.asyncio
+    async def test_create_borrow_record_second_borrower_loses(
+        self,
+        db_session,
+        mock_message_broker,
+        setup_book_and_user
+    ):
+        book, user = setup_book_and_user
+        other_user = User(email="other@example.com", firstname="Other", lastname="User")
+        db_session.add(other_user)
+        db_session.commit()
+
+        borrow_service = BorrowService(mock_message_broker)
+        await borrow_service.create_borrow_record(
+            db_session, BorrowCreate(user_id=user.id, book_id=book.id, days=7)
+        )
+
+        with pytest.raises(ValidationError) as exc_info:
+            await borrow_service.create_borrow_record(
+                db_session, BorrowCreate(user_id=other_user.id, book_id=book.id, days=7)
+            )
+
+        assert "not available" in str(exc_info.value)
+        assert db_session.query(BorrowRecord).filter(BorrowRecord.book_id == book.id).count() == 1
+        mock_message_broker.publish.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_create_borrow_record_invalid_user(
+        self,
+        db_session,
+        mock_message_broker,
+        setup_book_and_user
+    ):
+        book, _ = setup_book_and_user
+        borrow_service = BorrowService(mock_message_broker)
+        borrow_create = BorrowCreate(
+            user_id=999,  # Non-existent user ID
+            book_id=book.id,
+            days=14
+        )
+
+        with pytest.raises(ResourceNotFoundError):
+            await borrow_service.create_borrow_record(db_session, borrow_create)
+
+        db_session.refresh(book)
+        assert book.available
+        mock_message_broker.publish.assert_not_called()
@@ -0,0 +1,87 @@
+import pytest
+from unittest.mock import Mock
+from app.services.facet_service import FacetService, FACET_LOCK_KEY
+from app.services.book_service import BookService
+from app.services.borrow_service import BorrowService
+from app.models.book import Book
+from app.models.user import User
+from app.schemas.book import BookCreate
+from app.schemas.borrow import BorrowCreate
+
+class TestFacetService:
+    @pytest.fixture
+    def books(self):
+        return [
+            BookCreate(
+                title=f"Book {i}",
+                author="Author",
+                isbn=f"isbn-{i}",
+                publisher=publisher,
+                category=category
+            )
+            for i, (publisher, category) in enumerate([
+                ("Publisher A", "Fiction"),
+                ("Publisher A", "Science"),
+                ("Publisher B", "Fiction")
+            ])
+        ]
+
+    @pytest.mark.asyncio
+    async def test_counters_follow_create_borrow_and_delete(self, db_session, mock_message_broker, books):
+        facet_service = FacetService()
+        book_service = BookService(mock_message_broker)
+        await book_service.create_books(db_session, books)
+
+        facets = facet_service.get_facets(db_session)
+        assert facets.publishers == {"Publisher A": 2, "Publisher B": 1}
+        assert facets.categories == {"Fiction": 2, "Science": 1}
+
+        # Borrowing takes the book out of its facets
+        user = User(email="test@example.com", firstname="Test", lastname="User")
+        db_session.add(user)
+        db_session.commit()
+        borrowed = db_session.query(Book).filter(Book.isbn == "isbn-0").one()
+        await BorrowService(mock_message_broker).create_borrow_record(
+            db_session, BorrowCreate(user_id=user.id, book_id=borrowed.id, days=7)
+        )
+
+        # Deleting a borrowed book leaves the counters alone, an available one does not
+        await book_service.delete_book_by_isbn(db_session, "isbn-0")
+        await book_service.delete_book_by_isbn(db_session, "isbn-2")
+
+        facets = facet_service.get_facets(db_session)
+        assert facets.publishers == {"Publisher A": 1}
+        assert facets.categories == {"Science": 1}
+
+    @pytest.mark.asyncio
+    async def test_rebuild_matches_incremental_counters(self, db_session, mock_message_broker, books):
+        facet_service = FacetService()
+        await BookService(mock_message_broker).create_books(db_session, books)
+        # A change made outside the services is picked up by the rebuild
+        db_session.query(Book).filter(Book.isbn == "isbn-1").update({"available": False})
+        db_session.commit()
+        incremental = facet_service.get_facets(db_session)
+
+        facet_service.rebuild(db_session)
+
+        rebuilt = facet_service.get_facets(db_session)
+        assert incremental.publishers == {"Publisher A": 2, "Publisher B": 1}
+        assert rebuilt.publishers == {"Publisher A": 1, "Publisher B": 1}
+        assert rebuilt.categories == {"Fiction": 2}
+
+    def test_rebuild_and_apply_take_the_counters_lock_on_postgresql(self):
+        db = Mock()
+        db.get_bind.return_value.dialect.name = "postgresql"
+        facet_service = FacetService()
+
+        facet_service.rebuild(db)
+        facet_service.apply(db, [Mock(publisher="Publisher A", category="Fiction")], +1)
+
+        locks = [call.args for call in db.execute.call_args_list if "advisory" in str(call.args[0])]
+        assert [str(statement) for statement, _ in locks] == [
+            "SELECT pg_advisory_xact_lock(:key)",
+            "SELECT pg_advisory_xact_lock_shared(:key)"
+        ]
+        assert all(params == {"key": FACET_LOCK_KEY} for _, params in locks)
+        # The exclusive lock comes before the counters are emptied
+        assert "advisory" in str(db.execute.call_args_list[0].args[0])
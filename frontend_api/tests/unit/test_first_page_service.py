@@ -0,0 +1,104 @@
+import pytest
+from unittest.mock import Mock
+from app.services.first_page_service import FirstPageService, first_page_service
+from app.services.book_service import BookService, book_event_data
+from app.models.book import Book
+from app.schemas.book import BookCreate
+
+def titles(page):
+    return [item.title for item in page.items]
+
+class TestFirstPageService:
+    @pytest.fixture
+    def books(self, db_session):
+        books = [
+            Book(title=title, author="Author", isbn=str(i), publisher=publisher,
+                 category=category, available=available)
+            for i, (title, publisher, category, available) in enumerate([
+                ("Dune", "Chilton", "Fiction", True),
+                ("Beloved", "Knopf", "Fiction", True),
+                ("Carrie", "Doubleday", "Fiction", False),
+                ("Atonement", "Knopf", "Fiction", True),
+                ("Emma", "Knopf", "Classics", True)
+            ])
+        ]
+        db_session.add_all(books)
+        db_session.commit()
+        return books
+
+    @pytest.fixture
+    def service(self, db_session, books):
+        service = FirstPageService(depth=3)
+        service.load(db_session)
+        return service
+
+    def test_load_matches_database_listing(self, db_session, mock_message_broker, service):
+        book_service = BookService(mock_message_broker)
+        for name, value in [("category", "Fiction"), ("publisher", "Knopf"), ("category", "Classics")]:
+            first_page = service.get_first_page(name, value, limit=3)
+            assert first_page == book_service.get_books_by(db_session, name, value, limit=3)
+
+        fiction = service.get_first_page("category", "Fiction", limit=2)
+        assert titles(fiction) == ["Atonement", "Beloved"]
+        assert fiction.total == 4
+        # Deeper than the snapshot, or never loaded
+        assert service.get_first_page("category", "Fiction", limit=4) is None
+        assert service.get_first_page("publisher", "Unknown", limit=10) is None
+
+    def test_snapshots_follow_book_events(self, service, books):
+        service.add_books([
+            {"id": 10, "isbn": "10", "title": "Anna Karenina", "author": "Tolstoy",
+             "publisher": "Knopf", "category": "Fiction", "available": True},
+            {"id": 11, "isbn": "11", "title": "Zorba", "author": "Kazantzakis",
+             "publisher": "Faber", "category": "Fiction", "available": True}
+        ])
+        fiction = service.get_first_page("category", "Fiction", limit=3)
+        assert titles(fiction) == ["Anna Karenina", "Atonement", "Beloved"]
+        assert fiction.total == 6
+        assert titles(service.get_first_page("publisher", "Faber", limit=10)) == ["Zorba"]
+
+        service.mark_borrowed({"book_id": books[3].id, "publisher": "Knopf", "category": "Fiction"})
+        atonement = service.get_first_page("publisher", "Knopf", limit=3).items[1]
+        assert atonement.title == "Atonement" and not atonement.available
+
+        service.remove_book(book_event_data(books[3]))
+        fiction = service.get_first_page("category", "Fiction", limit=2)
+        assert titles(fiction) == ["Anna Karenina", "Beloved"]
+        assert fiction.total == 5
+        # Only two of the first three Fiction books are known until a reload
+        assert service.get_first_page("category", "Fiction", limit=3) is None
+
+        service.remove_book(book_event_data(books[4]))
+        classics = service.get_first_page("category", "Classics", limit=10)
+        assert classics.items == [] and classics.total == 0
+
+    def test_reload_keeps_snapshots_changed_meanwhile(self, db_session, service):
+        load_query = db_session.execute
+        def execute_during_event(*args, **kwargs):
+            service.add_books([
+                {"id": 20, "isbn": "20", "title": "Aesop", "author": "Aesop",
+                 "publisher": "Penguin", "category": "Classics", "available": True}
+            ])
+            return load_query(*args, **kwargs)
+        db_session.execute = execute_during_event
+        service.load(db_session)
+        del db_session.execute
+
+        assert titles(service.get_first_page("category", "Classics", limit=3))[0] == "Aesop"
+        assert service.get_first_page("category", "Fiction", limit=3).total == 4
+
+    @pytest.mark.asyncio
+    async def test_first_pages_are_served_without_database(self, db_session, mock_message_broker, books):
+        # The shared instance is used by get_books_by and subscribed to the local book events
+        first_page_service.load(db_session)
+        book_service = BookService(mock_message_broker)
+        await book_service.create_books(db_session, [BookCreate(
+            title="Aesop", author="Aesop", isbn="20", publisher="Penguin", category="Classics"
+        )])
+
+        no_database = Mock()
+        classics = book_service.get_books_by(no_database, "category", "Classics")
+        assert titles(classics) == ["Aesop", "Emma"]
+        assert titles(book_service.get_books_by(no_database, "publisher", "Penguin")) == ["Aesop"]
+        no_database.assert_not_called()
+        assert not no_database.method_calls
@@ -0,0 +1,106 @@
+import pytest
+from contextlib import nullcontext
+from datetime import date
+from types import SimpleNamespace
+from unittest.mock import Mock
+from sqlalchemy.dialects import postgresql
+from app.models.borrow import BorrowRecord
+from shared.partitioning import (
+    add_months, add_partitions, partition_ddl, partition_name, partition_table
+)
+
+class RecordingConnection:
+    """Records the Postgres SQL of each statement; scalars come from ``results``."""
+    def __init__(self, results):
+        self.results = results
+        self.statements = []
+
+    def execute(self, statement, params=None):
+        sql = str(statement.compile(dialect=postgresql.dialect())).strip()
+        self.statements.append(sql)
+        value = next((value for part, value in self.results.items() if part in sql), None)
+        return Mock(scalar=Mock(return_value=value))
+
+    def begin_nested(self):
+        return nullcontext()
+
+def postgres_engine(connection):
+    return SimpleNamespace(
+        dialect=SimpleNamespace(name="postgresql"),
+        begin=lambda: nullcontext(connection)
+    )
+
+class TestPartitioning:
+    def test_add_months(self):
+        assert add_months(date(2024, 11, 15), 0) == date(2024, 11, 1)
+        assert add_months(date(2024, 11, 15), 1) == date(2024, 12, 1)
+        assert add_months(date(2024, 11, 30), 2) == date(2025, 1, 1)
+        assert add_months(date(2024, 1, 31), -1) == date(2023, 12, 1)
+        assert add_months(date(2024, 3, 1), 24) == date(2026, 3, 1)
+
+    def test_partition_name_and_ddl(self):
+        assert partition_name("borrow_records", date(2024, 3, 1)) == "borrow_records_y2024m03"
+        assert partition_ddl("borrow_records", date(2024, 12, 1)) == (
+            'CREATE TABLE IF NOT EXISTS "borrow_records_y2024m12" PARTITION OF "borrow_records" '
+            "FOR VALUES FROM ('2024-12-01') TO ('2025-01-01')"
+        )
+
+    def test_conversion_ddl(self):
+        oldest = add_months(date.today(), -2)
+        connection = RecordingConnection({
+            "relkind": "r",
+            "IS NULL": 0,
+            "min(": oldest,
+            "pg_get_serial_sequence": "borrow_records_id_seq"
+        })
+
+        assert partition_table(postgres_engine(connection), BorrowRecord.__table__, "borrow_date", 1)
+
+        ddl = [sql for sql in connection.statements if not sql.startswith("SELECT")]
+        months = [add_months(oldest, offset) for offset in range(4)]
+        assert ddl[:4] == [
+            'ALTER TABLE "borrow_records" RENAME TO "borrow_records_unpartitioned"',
+            'CREATE TABLE "borrow_records" (LIKE "borrow_records_unpartitioned" INCLUDING DEFAULTS) '
+            'PARTITION BY RANGE ("borrow_date")',
+            'ALTER TABLE "borrow_records" ALTER COLUMN "borrow_date" SET NOT NULL',
+            'CREATE TABLE "borrow_records_default" PARTITION OF "borrow_records" DEFAULT'
+        ]
+        assert ddl[4:8] == [partition_ddl("borrow_records", month) for month in months]
+        assert ddl[8] == (
+            'INSERT INTO "borrow_records" ("id", "user_id", "book_id", "borrow_date", "return_date") '
+            'SELECT "id", "user_id", "book_id", "borrow_date", "return_date" FROM "borrow_records_unpartitioned"'
+        )
+        assert ddl[9:12] == [
+            'ALTER SEQUENCE borrow_records_id_seq OWNED BY "borrow_records"."id"',
+            'DROP TABLE "borrow_records_unpartitioned"',
+            'ALTER TABLE "borrow_records" ADD PRIMARY KEY (id, borrow_date)'
+        ]
+        assert ddl[12] == "CREATE INDEX ix_borrow_records_id ON borrow_records (id)"
+        assert sorted(ddl[13:15]) == [
+            "ALTER TABLE borrow_records ADD FOREIGN KEY(book_id) REFERENCES books (id)",
+            "ALTER TABLE borrow_records ADD FOREIGN KEY(user_id) REFERENCES users (id)"
+        ]
+        # Idempotent partition creation for the current months follows
+        assert all(sql.startswith("CREATE TABLE IF NOT EXISTS") for sql in ddl[15:])
+
+    def test_conversion_refuses_rows_without_date(self):
+        connection = RecordingConnection({"relkind": "r", "IS NULL": 2})
+
+        with pytest.raises(ValueError, match="2 borrow_records rows have no borrow_date"):
+            partition_table(postgres_engine(connection), BorrowRecord.__table__, "borrow_date")
+
+        assert all(sql.startswith("SELECT") for sql in connection.statements)
+
+    def test_maintenance_never_converts(self, db_session):
+        plain = RecordingConnection({"relkind": "r"})
+        assert not add_partitions(postgres_engine(plain), BorrowRecord.__table__)
+        assert all(sql.startswith("SELECT") for sql in plain.statements)
+
+        partitioned = RecordingConnection({"relkind": "p"})
+        assert add_partitions(postgres_engine(partitioned), BorrowRecord.__table__, 1)
+        assert partitioned.statements[-1] == partition_ddl(
+            "borrow_records", add_months(date.today(), 1)
+        )
+
+        # Other databases are left alone
+        assert not partition_table(db_session.get_bind(), BorrowRecord.__table__, "borrow_date")
@@ -0,0 +1,62 @@
+import pytest
+from sqlalchemy.dialects import postgresql
+from app.services.search_service import SearchService
+from app.models.book import Book
+from shared.exceptions import ValidationError
+
+class TestSearchService:
+    @pytest.fixture
+    def books(self, db_session):
+        books = [
+            Book(title="Clean Code", author="Robert C. Martin", isbn="1",
+                 publisher="Publisher", category="Software", available=True),
+            Book(title="The Clean Coder", author="Robert C. Martin", isbn="2",
+                 publisher="Publisher", category="Software", available=False),
+            Book(title="Code Complete", author="Steve McConnell", isbn="3",
+                 publisher="Publisher", category="Software", available=True),
+            Book(title="Refactoring", author="Martin Fowler", isbn="4",
+                 publisher="Publisher", category="Software", available=True),
+            Book(title="100% Pure", author="Someone", isbn="5",
+                 publisher="Publisher", category="Fiction", available=True),
+            Book(title="Martin Eden", author="Jack London", isbn="6",
+                 publisher="Publisher", category="Fiction", available=True)
+        ]
+        db_session.add_all(books)
+        db_session.commit()
+        return books
+
+    def test_search_matches_every_word(self, db_session, books):
+        result = SearchService().search_books(db_session, "clean CODE")
+
+        # "The Clean Coder" matches too but is lent out
+        assert result.total == 1
+        assert [book.isbn for book in result.items] == ["1"]
+
+    def test_search_ranks_title_matches_first(self, db_session, books):
+        result = SearchService().search_books(db_session, "martin")
+
+        # Author-only matches tie and are ordered by id
+        assert [book.isbn for book in result.items] == ["6", "1", "4"]
+
+    def test_search_paginates(self, db_session, books):
+        result = SearchService().search_books(db_session, "martin", page=2, limit=2)
+
+        assert result.total == 3
+        assert result.pages == 2
+        assert [book.isbn for book in result.items] == ["4"]
+
+    def test_search_escapes_like_wildcards(self, db_session, books):
+        result = SearchService().search_books(db_session, "%")
+
+        assert [book.isbn for book in result.items] == ["5"]
+
+    def test_search_rejects_blank_text(self, db_session, books):
+        with pytest.raises(ValidationError):
+            SearchService().search_books(db_session, "   ")
+
+    def test_postgres_match_uses_search_vector(self):
+        match, rank = SearchService()._postgres_match("clean code")
+
+        sql = str(match.compile(dialect=postgresql.dialect()))
+        assert "books.search_vector @@ websearch_to_tsquery" in sql
+        assert "ts_rank" in str(rank.compile(dialect=postgresql.dialect()))
@@ -1,8 +1,9 @@
 import pytest
-from app.services.user_service import UserService
+from app.services.user_service import UserService, missing_user_ids
 from app.models.user import User
 from app.schemas.user import UserCreate
 from shared.message_types import MessageType
+from shared.exceptions import ResourceNotFoundError
 
 class TestUserService:
     @pytest.mark.asyncio
@@ -71,4 +72,25 @@ class TestUserService:
         # Assert
         assert result.id == existing_user.id
         assert result.email == existing_user.email
-        mock_message_broker.publish.assert_not_called() 
\ No newline at end of file
+        mock_message_broker.publish.assert_not_called() 
+
+    @pytest.mark.asyncio
+    async def test_get_missing_user_is_remembered(self, db_session, mock_message_broker, sample_user_data):
+        user_service = UserService(mock_message_broker)
+        with pytest.raises(ResourceNotFoundError):
+            user_service.get_user(db_session, 1)
+        assert missing_user_ids.get(1)
+
+        # A user inserted behind the service's back stays missing until the TTL
+        db_session.add(User(id=1, **sample_user_data))
+        db_session.commit()
+        with pytest.raises(ResourceNotFoundError):
+            user_service.get_user(db_session, 1)
+
+        # Users created through the service are visible at once
+        with pytest.raises(ResourceNotFoundError):
+            user_service.get_user(db_session, 2)
+        await user_service.create_user(
+            db_session, UserCreate(**{**sample_user_data, "email": "new@example.com"})
+        )
+        assert user_service.get_user(db_session, 2).email == "new@example.com"
@@ -0,0 +1,166 @@
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Set, Tuple
+import sys
+import threading
+import time
+
+ATOMS = (str, bytes, bytearray, int, float, bool, type(None))
+
+def approx_size(obj: Any, seen: Optional[Set[int]] = None) -> int:
+    """Rough deep size of ``obj`` in bytes.
+
+    Follows containers and instance attributes (including pydantic fields);
+    objects already in ``seen`` are not counted again, so passing one set for
+    a whole cache counts shared objects once.
+    """
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, ATOMS):
+        return size
+    if isinstance(obj, dict):
+        size += sum(approx_size(key, seen) + approx_size(value, seen) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(approx_size(item, seen) for item in obj)
+    if hasattr(obj, "__dict__"):
+        size += approx_size(vars(obj), seen)
+    return size
+
+class CacheCounters:
+    """Hit, miss, eviction and load counters for a cache's ``stats()``.
+
+    A load is the work done to fill a miss; callers time it with
+    ``timed_load``, so average and worst load latency show what a miss costs.
+    """
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.loads = 0
+        self.load_seconds = 0.0
+        self.max_load_seconds = 0.0
+        self._counters_lock = threading.Lock()
+
+    def count_lookup(self, hit: bool) -> None:
+        """Count one lookup as a hit or a miss."""
+        with self._counters_lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    @contextmanager
+    def timed_load(self) -> Iterator[None]:
+        """Time the enclosed load, whether it succeeds or fails; also a decorator."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._counters_lock:
+                self.loads += 1
+                self.load_seconds += elapsed
+                self.max_load_seconds = max(self.max_load_seconds, elapsed)
+
+    def counter_stats(self) -> Dict[str, Any]:
+        """The counters, with the hit ratio and load latency in milliseconds."""
+        with self._counters_lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "loads": self.loads,
+                "avg_load_ms": self.load_seconds / self.loads * 1000 if self.loads else 0.0,
+                "max_load_ms": self.max_load_seconds * 1000
+            }
+
+class TTLCache(CacheCounters):
+    """Bounded in-process cache with least-recently-used eviction and a TTL.
+
+    Entries expire ``ttl`` seconds after they were stored; when ``maxsize``
+    entries are held, storing a new one evicts the least recently used.
+    Hits, misses and evictions are counted for ``stats()``, along with the
+    loads callers time with ``timed_load``. All methods are thread safe.
+
+    ``get`` returns ``default`` (None unless given) for absent or expired
+    keys, so callers that need to cache None pass their own sentinel.
+    """
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0, name: Optional[str] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        super().__init__()
+        self.name = name
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for ``key``, or ``default``."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store ``value`` under ``key``, evicting the oldest entry if full."""
+        expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def items(self) -> List[Tuple[Hashable, Any]]:
+        """Unexpired entries, least recently used first."""
+        now = time.monotonic()
+        with self._lock:
+            return [
+                (key, value) for key, (value, expires_at) in self._entries.items()
+                if expires_at > now
+            ]
+
+    def delete(self, key: Hashable) -> None:
+        """Drop ``key`` if present."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every entry; the counters are kept."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self, include_bytes: bool = True) -> Dict[str, Any]:
+        """Counters and occupancy, e.g. for a metrics endpoint.
+
+        ``bytes`` walks every entry, so it is None unless ``include_bytes``
+        and meant for occasional calls.
+        """
+        with self._lock:
+            entries = list(self._entries.items())
+        seen = set()
+        return {
+            "name": self.name,
+            "size": len(entries),
+            "bytes": sum(
+                approx_size(key, seen) + approx_size(value, seen) for key, (value, _) in entries
+            ) if include_bytes else None,
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            **self.counter_stats()
+        }
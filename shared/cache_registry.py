@@ -0,0 +1,50 @@
+"""Process-wide registry of the caches of a service.
+
+Modules register their caches when they create them::
+
+    book_detail_cache = cache_registry.register(TTLCache(..., name="book_detail"))
+
+so the statistics endpoint can report all of them at once and test
+fixtures can reset them all with ``cache_registry.clear()``. A registered
+cache provides ``stats(include_bytes)``, a dict usually in the shape of
+``TTLCache.stats`` (size, bytes, the CacheCounters counters), and
+``clear()``. Sizing walks every entry, so ``bytes`` is only computed when
+asked for. Request
+coalescers such as ``SingleFlight`` are registered too, for their counters.
+"""
+from typing import Any, Dict, Optional
+import threading
+
+class CacheRegistry:
+    """Registered caches by name."""
+    def __init__(self):
+        self._caches: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def register(self, cache: Any, name: Optional[str] = None) -> Any:
+        """Add ``cache`` under ``name`` (its ``name`` attribute by default); returns it.
+
+        Raises:
+            ValueError: If another cache already has that name
+        """
+        name = name or cache.name
+        with self._lock:
+            if self._caches.get(name, cache) is not cache:
+                raise ValueError(f"A cache named {name!r} is already registered")
+            self._caches[name] = cache
+        return cache
+
+    def stats(self, include_bytes: bool = True) -> Dict[str, Dict[str, Any]]:
+        """``stats()`` of every registered cache, by name."""
+        with self._lock:
+            caches = list(self._caches.items())
+        return {name: cache.stats(include_bytes) for name, cache in sorted(caches)}
+
+    def clear(self) -> None:
+        """Empty every registered cache; their counters are kept."""
+        with self._lock:
+            caches = list(self._caches.values())
+        for cache in caches:
+            cache.clear()
+
+cache_registry = CacheRegistry()
@@ -0,0 +1,116 @@
+from enum import Enum
+from typing import Any, Dict, Hashable, Optional, Tuple
+from sqlalchemy.orm import Query
+from .cache import CacheCounters, approx_size
+import json
+import threading
+import time
+
+class CountStrategy(str, Enum):
+    """How a paginated listing computes its ``total``."""
+    EXACT = "exact"        # COUNT(*) on every request
+    CACHED = "cached"      # COUNT(*) once, reused until invalidated or expired
+    ESTIMATE = "estimate"  # Postgres planner estimate, exact when small
+
+class TotalCounter(CacheCounters):
+    """Resolves the total row count of a listing using a configured strategy.
+
+    One counter is created per endpoint. ``count`` returns the total together
+    with a flag telling whether it is an estimate, which is passed on to the
+    response as ``total_is_estimate``.
+
+    Cached totals are keyed by the filters of the listing and dropped by
+    ``invalidate()``, which services call when a committed change can alter
+    the count. The TTL bounds staleness for changes this process never sees,
+    e.g. a borrow handled by another worker.
+
+    Estimates read the ``Plan Rows`` of ``EXPLAIN`` for the listing query.
+    Below ``exact_below`` rows, or on databases other than Postgres, an exact
+    count is used instead.
+
+    Every count or EXPLAIN query is timed as a load for ``stats()``.
+    """
+    def __init__(
+        self,
+        strategy: CountStrategy = CountStrategy.EXACT,
+        ttl: float = 60.0,
+        exact_below: int = 1000,
+        name: Optional[str] = None
+    ):
+        super().__init__()
+        self.name = name
+        self.strategy = CountStrategy(strategy)
+        self.ttl = ttl
+        self.exact_below = exact_below
+        self._totals: Dict[Hashable, Tuple[int, float]] = {}
+        self._lock = threading.Lock()
+
+    def count(self, query: Query, key: Hashable = None) -> Tuple[int, bool]:
+        """Return ``(total, is_estimate)`` for the rows matched by ``query``.
+
+        Args:
+            query: The listing query, before ordering and pagination
+            key: Identifies the listing's filters for the cached strategy
+        """
+        if self.strategy == CountStrategy.CACHED:
+            return self._cached_count(query, key), False
+        if self.strategy == CountStrategy.ESTIMATE:
+            with self.timed_load():
+                estimate = self._estimate(query)
+            if estimate is not None and estimate >= self.exact_below:
+                return estimate, True
+        with self.timed_load():
+            return query.count(), False
+
+    def invalidate(self) -> None:
+        """Drop every cached total."""
+        with self._lock:
+            self._totals.clear()
+
+    def clear(self) -> None:
+        """Same as invalidate; for the cache registry."""
+        self.invalidate()
+
+    def stats(self, include_bytes: bool = True) -> Dict[str, Any]:
+        """Cached totals and counters, e.g. for a metrics endpoint."""
+        with self._lock:
+            totals = dict(self._totals)
+        return {
+            "name": self.name,
+            "strategy": self.strategy.value,
+            "size": len(totals),
+            "bytes": approx_size(totals) if include_bytes else None,
+            "ttl": self.ttl,
+            **self.counter_stats()
+        }
+
+    def _cached_count(self, query: Query, key: Hashable) -> int:
+        now = time.monotonic()
+        with self._lock:
+            cached = self._totals.get(key)
+        if cached and now - cached[1] < self.ttl:
+            self.count_lookup(hit=True)
+            return cached[0]
+        self.count_lookup(hit=False)
+        with self.timed_load():
+            total = query.count()
+        with self._lock:
+            self._totals[key] = (total, now)
+        return total
+
+    def _estimate(self, query: Query) -> Optional[int]:
+        """Planner row estimate for ``query``, None where unsupported."""
+        session = query.session
+        dialect = session.get_bind().dialect
+        if dialect.name != "postgresql":
+            return None
+        compiled = query.statement.compile(
+            dialect=dialect,
+            compile_kwargs={"render_postcompile": True}
+        )
+        plan = session.connection().exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+        ).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
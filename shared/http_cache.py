@@ -0,0 +1,38 @@
+"""Helpers for HTTP validators (ETag / If-None-Match) and Cache-Control."""
+from typing import Dict, Optional
+import hashlib
+
+def weak_etag(*parts) -> str:
+    """A weak entity tag derived from ``parts``."""
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()
+    return f'W/"{digest[:32]}"'
+
+def etag_matches(if_none_match: Optional[str], etag: Optional[str]) -> bool:
+    """Whether an If-None-Match header matches ``etag``, using weak comparison."""
+    if not if_none_match or not etag:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+def cache_headers(etag: Optional[str], max_age: int) -> Dict[str, str]:
+    """ETag and Cache-Control headers for a publicly cacheable response."""
+    headers = {"Cache-Control": f"public, max-age={max_age}"}
+    if etag:
+        headers["ETag"] = etag
+    return headers
+
+def stale_headers(age: float, reason: str) -> Dict[str, str]:
+    """Headers for a stale response: its age, why it is stale, and no reuse.
+
+    No ETag is sent, since the current one describes fresher content.
+    """
+    return {
+        "Cache-Control": "no-cache",
+        "Age": str(int(age)),
+        "X-Cache-Stale": reason
+    }
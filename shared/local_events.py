@@ -0,0 +1,33 @@
+from collections import defaultdict
+from typing import Any, Callable, Dict, List
+from .message_types import MessageType
+import logging
+
+logger = logging.getLogger(__name__)
+
+class LocalEventBus:
+    """In-process publish/subscribe for committed data changes.
+
+    Services publish here after a change has been committed, using the same
+    MessageType values as the message broker. In-process caches and derived
+    structures subscribe to keep themselves up to date. Handlers run
+    synchronously in the publisher's thread. A failing handler is logged and
+    never breaks the write path that published the event.
+    """
+    def __init__(self):
+        self._handlers: Dict[MessageType, List[Callable[[Any], None]]] = defaultdict(list)
+
+    def subscribe(self, event_type: MessageType, handler: Callable[[Any], None]) -> None:
+        """Register a handler called with the event data on every publish."""
+        self._handlers[event_type].append(handler)
+
+    def publish(self, event_type: MessageType, data: Any) -> None:
+        """Deliver an event to every handler registered for its type."""
+        for handler in list(self._handlers[event_type]):
+            try:
+                handler(data)
+            except Exception as e:
+                logger.error(
+                    f"Error handling local {event_type.value} event: {str(e)}",
+                    exc_info=True
+                )
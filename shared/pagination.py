@@ -1,37 +1,64 @@
-from typing import TypeVar, Generic, List
+from typing import TypeVar, Generic, List, Optional, Any, Callable, Sequence
+from datetime import date, datetime
 from pydantic import BaseModel
+from sqlalchemy import tuple_
+from .exceptions import ValidationError
+import base64
+import json
 
 T = TypeVar('T')
 
 class PaginatedResponse(BaseModel, Generic[T]):
     """Generic schema for paginated responses.
-    
+
     This is a shared schema used by both admin_api and frontend_api
     for consistent pagination handling across the application.
-    
+
+    Two modes are supported: page/limit (offset based) and cursor (keyset
+    based). Both return ``next_cursor`` when there are more rows, so a client
+    can start with page 1 and follow cursors from there. In cursor mode the
+    page number is unknown and ``page`` is null.
+
+    ``total`` may come from a cache or a planner estimate instead of an exact
+    count (see ``shared.counting``); ``total_is_estimate`` flags the latter.
+
     Attributes:
         items: List of items for the current page
         total: Total number of items across all pages
-        page: Current page number (1-based)
+        page: Current page number (1-based), None in cursor mode
         limit: Maximum number of items per page
         pages: Total number of pages
+        next_cursor: Opaque cursor for the following page, None on the last page
+        total_is_estimate: True when total is an approximation
     """
     items: List[T]
     total: int
-    page: int
+    page: Optional[int]
     limit: int
     pages: int
+    next_cursor: Optional[str] = None
+    total_is_estimate: bool = False
 
     @classmethod
-    def create(cls, items: List[T], total: int, page: int, limit: int) -> "PaginatedResponse[T]":
+    def create(
+        cls,
+        items: List[T],
+        total: int,
+        page: Optional[int],
+        limit: int,
+        next_cursor: Optional[str] = None,
+        total_is_estimate: bool = False
+    ) -> "PaginatedResponse[T]":
         """Helper method to create a paginated response.
-        
+
         Args:
             items: The items for the current page
             total: Total number of items
-            page: Current page number
+            page: Current page number, None in cursor mode
             limit: Maximum items per page
-            
+            next_cursor: Cursor pointing after the last item, if there are more
+            total_is_estimate: Whether total is an approximation
+
         Returns:
             A PaginatedResponse instance
         """
@@ -40,5 +67,53 @@ class PaginatedResponse(BaseModel, Generic[T]):
             total=total,
             page=page,
             limit=limit,
-            pages=((total - 1) // limit) + 1 if total > 0 else 0
-        ) 
\ No newline at end of file
+            pages=((total - 1) // limit) + 1 if total > 0 else 0,
+            next_cursor=next_cursor,
+            total_is_estimate=total_is_estimate
+        )
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode the sort key of the last row on a page into an opaque cursor.
+
+    The sort key must end with a unique column (normally the primary key) so
+    that rows sharing the leading sort values are neither skipped nor repeated.
+    """
+    payload = [
+        value.isoformat() if isinstance(value, (date, datetime)) else value
+        for value in values
+    ]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str, *parsers: Callable[[Any], Any]) -> List[Any]:
+    """Decode a cursor produced by ``encode_cursor``.
+
+    Args:
+        cursor: The opaque cursor sent by the client
+        parsers: One callable per sort key value, e.g. ``str, int`` or
+            ``datetime.fromisoformat, int``
+
+    Raises:
+        ValidationError: If the cursor is malformed or does not match the parsers
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(parsers):
+            raise ValueError("unexpected cursor shape")
+        return [parse(value) for parse, value in zip(parsers, values)]
+    except (ValueError, TypeError) as e:
+        raise ValidationError(
+            message="Invalid pagination cursor",
+            details={"cursor": cursor}
+        ) from e
+
+def keyset_filter(columns: Sequence[Any], values: Sequence[Any], descending: bool = False):
+    """Build the WHERE clause selecting rows strictly after a cursor.
+
+    Uses a row-value comparison, ``(a, b) > (:a, :b)``, which Postgres can
+    answer with a range scan on a composite index over the same columns.
+    """
+    row = tuple_(*columns)
+    bound = tuple_(*values)
+    return row < bound if descending else row > bound
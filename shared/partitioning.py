@@ -0,0 +1,182 @@
+"""Monthly range partitioning of a date-keyed table on Postgres.
+
+Used by both services for ``borrow_records``, partitioned by
+``borrow_date``.
+
+``partition_table`` converts a plain table and is run once per database
+as an explicit step (``python -m scripts.partition_borrow_records`` in
+each service), never by the application: the table is renamed, a
+partitioned copy is created with monthly partitions covering its rows and
+a default partition, the rows are copied over, the old table is dropped,
+and the primary key, indexes and foreign keys are recreated, all in one
+transaction. The primary key becomes ``(id, <date column>)`` because
+Postgres requires the partition key in every unique constraint. Rows
+without a date are refused rather than given one.
+
+``maintain_partitions`` runs in the services and only adds the missing
+future partitions of an already partitioned table, at startup and then
+daily, so inserts never fall through to the default partition. Other
+databases are left alone.
+"""
+from datetime import date
+from sqlalchemy import Table, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.schema import AddConstraint, CreateIndex
+from sqlalchemy.exc import SQLAlchemyError
+import asyncio
+import logging
+import zlib
+
+logger = logging.getLogger(__name__)
+
+# Seconds between two runs of the future partition check
+MAINTENANCE_INTERVAL = 24 * 60 * 60
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+def add_months(day: date, months: int) -> date:
+    """First day of the month ``months`` after the month of ``day``."""
+    month_index = day.year * 12 + day.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+def partition_name(table_name: str, month: date) -> str:
+    return f"{table_name}_y{month:%Y}m{month:%m}"
+
+def partition_table(
+    engine: Engine,
+    table: Table,
+    column: str,
+    months_ahead: int = 3
+) -> bool:
+    """Make ``table`` range partitioned by month on ``column``.
+
+    Returns True when the table was converted by this call.
+
+    Raises:
+        ValueError: If some rows have no ``column`` value; nothing is changed
+    """
+    if engine.dialect.name != "postgresql":
+        return False
+    with engine.begin() as connection:
+        _lock(connection, table.name)
+        converted = False
+        if not _is_partitioned(connection, table.name):
+            _convert(connection, table, column, months_ahead)
+            converted = True
+        _create_partitions(connection, table.name, date.today(), months_ahead)
+    return converted
+
+def add_partitions(engine: Engine, table: Table, months_ahead: int = 3) -> bool:
+    """Create the missing future partitions of ``table``.
+
+    Returns False, changing nothing, when ``table`` is not partitioned.
+    """
+    if engine.dialect.name != "postgresql":
+        return False
+    with engine.begin() as connection:
+        _lock(connection, table.name)
+        if not _is_partitioned(connection, table.name):
+            return False
+        _create_partitions(connection, table.name, date.today(), months_ahead)
+    return True
+
+async def maintain_partitions(engine: Engine, table: Table, months_ahead: int = 3):
+    """Keep future partitions in place, now and daily; runs until cancelled."""
+    while True:
+        try:
+            partitioned = await asyncio.to_thread(add_partitions, engine, table, months_ahead)
+            if not partitioned and engine.dialect.name == "postgresql":
+                logger.warning(
+                    f"{table.name} is not partitioned; run scripts.partition_borrow_records to convert it"
+                )
+        except Exception as e:
+            logger.error(f"Failed to maintain {table.name} partitions: {str(e)}", exc_info=True)
+        await asyncio.sleep(MAINTENANCE_INTERVAL)
+
+def partition_ddl(table_name: str, month: date) -> str:
+    """CREATE statement of the partition of ``table_name`` for ``month``."""
+    following = add_months(month, 1)
+    return (
+        f'CREATE TABLE IF NOT EXISTS "{partition_name(table_name, month)}" '
+        f'PARTITION OF "{table_name}" '
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{following.isoformat()}')"
+    )
+
+def _lock(connection: Connection, table_name: str) -> None:
+    """Serialize changes to the partitions of ``table_name`` until the end of the transaction."""
+    connection.execute(
+        text("SELECT pg_advisory_xact_lock(:key)"),
+        {"key": zlib.crc32(f"partition:{table_name}".encode())}
+    )
+
+def _is_partitioned(connection: Connection, table_name: str) -> bool:
+    relkind = connection.execute(
+        text("SELECT relkind FROM pg_class WHERE oid = to_regclass(:name)"),
+        {"name": table_name}
+    ).scalar()
+    return relkind == "p"
+
+def _create_partitions(connection: Connection, table_name: str, first: date, months_ahead: int) -> None:
+    """Monthly partitions from the month of ``first`` to ``months_ahead`` after today.
+
+    A month whose rows already went to the default partition cannot get its
+    own partition; that is logged and skipped instead of failing startup.
+    """
+    month = month_start(first)
+    last = add_months(date.today(), months_ahead)
+    while month <= last:
+        try:
+            with connection.begin_nested():
+                connection.execute(text(partition_ddl(table_name, month)))
+        except SQLAlchemyError as e:
+            logger.error(f"Could not create {table_name} partition for {month:%Y-%m}: {str(e)}")
+        month = add_months(month, 1)
+
+def _convert(connection: Connection, table: Table, column: str, months_ahead: int) -> None:
+    name = table.name
+    legacy = f"{name}_unpartitioned"
+    undated = connection.execute(
+        text(f'SELECT count(*) FROM "{name}" WHERE "{column}" IS NULL')
+    ).scalar()
+    if undated:
+        raise ValueError(f"{undated} {name} rows have no {column}; set it before partitioning")
+    logger.info(f"Converting {name} to monthly partitions on {column}")
+
+    connection.execute(text(f'ALTER TABLE "{name}" RENAME TO "{legacy}"'))
+    connection.execute(text(
+        f'CREATE TABLE "{name}" (LIKE "{legacy}" INCLUDING DEFAULTS) '
+        f'PARTITION BY RANGE ("{column}")'
+    ))
+    connection.execute(text(f'ALTER TABLE "{name}" ALTER COLUMN "{column}" SET NOT NULL'))
+    connection.execute(text(f'CREATE TABLE "{name}_default" PARTITION OF "{name}" DEFAULT'))
+
+    oldest = connection.execute(text(f'SELECT min("{column}") FROM "{legacy}"')).scalar()
+    _create_partitions(connection, name, oldest or date.today(), months_ahead)
+
+    columns = ", ".join(f'"{c.name}"' for c in table.columns)
+    connection.execute(text(
+        f'INSERT INTO "{name}" ({columns}) SELECT {columns} FROM "{legacy}"'
+    ))
+
+    # The id sequence belongs to the old table and would be dropped with it
+    id_column = next(iter(table.primary_key.columns)).name
+    sequence = connection.execute(
+        text("SELECT pg_get_serial_sequence(:table, :column)"),
+        {"table": legacy, "column": id_column}
+    ).scalar()
+    if sequence:
+        connection.execute(text(f'ALTER SEQUENCE {sequence} OWNED BY "{name}"."{id_column}"'))
+    # Dropping the old table frees its constraint and index names
+    connection.execute(text(f'DROP TABLE "{legacy}"'))
+
+    key_columns = [c.name for c in table.primary_key.columns]
+    if column not in key_columns:
+        key_columns.append(column)
+    connection.execute(text(
+        f'ALTER TABLE "{name}" ADD PRIMARY KEY ({", ".join(key_columns)})'
+    ))
+    for index in table.indexes:
+        connection.execute(CreateIndex(index))
+    for constraint in table.foreign_key_constraints:
+        connection.execute(AddConstraint(constraint))
@@ -0,0 +1,108 @@
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Tuple
+import re
+import threading
+import unicodedata
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+def normalize(text: str) -> str:
+    """Lower-case, strip accents and punctuation, collapse whitespace.
+
+    ``"Les Misérables!"`` becomes ``"les miserables"``.
+    """
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return _NON_ALNUM.sub(" ", stripped.casefold()).strip()
+
+class PrefixIndex:
+    """In-memory prefix index from text to integer ids.
+
+    Every text is normalized and stored once per word start, so "Clean
+    Code" is found by "cle", "clean c" and "cod". Keys and ids are kept in
+    two parallel sorted lists: a lookup is a binary search followed by a
+    scan of the matching run, and the lists cost a fraction of a trie's
+    per-node objects.
+
+    Adding or removing an id shifts the lists (O(n) memmove), which is fine
+    for the trickle of catalogue changes; use ``build`` for bulk loads.
+    All methods are thread safe.
+    """
+    def __init__(self):
+        self._keys: List[str] = []
+        self._ids: List[int] = []
+        self._keys_by_id: Dict[int, List[str]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._keys_by_id)
+
+    def build(self, items: Iterable[Tuple[int, Iterable[str]]]) -> None:
+        """Replace the whole index with ``(id, texts)`` items."""
+        keys_by_id = {item_id: self._keys_for(texts) for item_id, texts in items}
+        entries = sorted(
+            (key, item_id)
+            for item_id, keys in keys_by_id.items()
+            for key in keys
+        )
+        with self._lock:
+            self._keys = [key for key, _ in entries]
+            self._ids = [item_id for _, item_id in entries]
+            self._keys_by_id = keys_by_id
+
+    def add(self, item_id: int, texts: Iterable[str]) -> None:
+        """Index ``texts`` under ``item_id``, replacing what it had before."""
+        keys = self._keys_for(texts)
+        with self._lock:
+            self._remove(item_id)
+            for key in keys:
+                position = bisect_left(self._keys, key)
+                # Keep equal keys ordered by id, like build does
+                while position < len(self._keys) and self._keys[position] == key \
+                        and self._ids[position] < item_id:
+                    position += 1
+                self._keys.insert(position, key)
+                self._ids.insert(position, item_id)
+            self._keys_by_id[item_id] = keys
+
+    def remove(self, item_id: int) -> None:
+        """Drop ``item_id`` from the index; unknown ids are ignored."""
+        with self._lock:
+            self._remove(item_id)
+
+    def search(self, prefix: str, limit: int = 10) -> List[int]:
+        """Ids whose texts have a word starting with ``prefix``, in key order."""
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        found: List[int] = []
+        seen = set()
+        with self._lock:
+            position = bisect_left(self._keys, prefix)
+            while position < len(self._keys) and len(found) < limit:
+                if not self._keys[position].startswith(prefix):
+                    break
+                item_id = self._ids[position]
+                if item_id not in seen:
+                    seen.add(item_id)
+                    found.append(item_id)
+                position += 1
+        return found
+
+    def _remove(self, item_id: int) -> None:
+        for key in self._keys_by_id.pop(item_id, ()):
+            position = bisect_left(self._keys, key)
+            while self._ids[position] != item_id:
+                position += 1
+            del self._keys[position]
+            del self._ids[position]
+
+    @staticmethod
+    def _keys_for(texts: Iterable[str]) -> List[str]:
+        """Every word-start suffix of the normalized texts, without duplicates."""
+        keys = set()
+        for text in texts:
+            words = normalize(text).split()
+            for start in range(len(words)):
+                keys.add(" ".join(words[start:]))
+        return sorted(keys)
@@ -0,0 +1,243 @@
+"""Redis cache shared by all workers, invalidated through versioned namespaces.
+
+Every cached value belongs to one or more namespaces (``catalog``,
+``publisher:<name>``, ...). Each namespace has a version counter in Redis
+and a value is stored under a key that embeds the versions it was computed
+at. Invalidating a namespace is a single ``INCR``: entries built at older
+versions are no longer addressed and expire with their TTL.
+
+Versions are read before the value is computed, so a value computed while
+its namespace is being bumped is stored under the old version and never
+served. Redis errors are logged and treated as misses; the caller falls
+back to the database.
+
+``InMemoryRedis`` implements the commands used here for tests and for
+running without ``REDIS_URL`` (the cache is then per process).
+"""
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+import hashlib
+import logging
+import threading
+import time
+import uuid
+import redis
+from .cache import CacheCounters, approx_size
+
+logger = logging.getLogger(__name__)
+
+# Fewest keys InMemoryRedis holds before sweeping expired ones
+MIN_SWEEP_SIZE = 1024
+
+class InMemoryRedis:
+    """Process-local stand-in for the subset of the Redis client used by VersionedCache.
+
+    Keys superseded by a version bump are never read again, so expired keys
+    are swept whenever the key count has doubled since the last sweep; the
+    cost stays proportional to the number of writes.
+    """
+    def __init__(self):
+        self._values: Dict[str, Tuple[bytes, Optional[float]]] = {}
+        self._lock = threading.Lock()
+        self._sweep_at = MIN_SWEEP_SIZE
+
+    def _live(self, key: str) -> Optional[bytes]:
+        entry = self._values.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._values[key]
+            return None
+        return value
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            return self._live(key)
+
+    def mget(self, keys: Sequence[str]) -> list:
+        with self._lock:
+            return [self._live(key) for key in keys]
+
+    def set(self, key: str, value, ex: Optional[float] = None, nx: bool = False) -> Optional[bool]:
+        if isinstance(value, str):
+            value = value.encode()
+        with self._lock:
+            if nx and self._live(key) is not None:
+                return None
+            self._values[key] = (value, time.monotonic() + ex if ex else None)
+            if len(self._values) >= self._sweep_at:
+                self._sweep()
+        return True
+
+    def _sweep(self) -> None:
+        """Drop every expired key; call with the lock held."""
+        now = time.monotonic()
+        self._values = {
+            key: entry for key, entry in self._values.items()
+            if entry[1] is None or entry[1] > now
+        }
+        self._sweep_at = max(2 * len(self._values), MIN_SWEEP_SIZE)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            value = int(self._live(key) or 0) + 1
+            expires_at = self._values.get(key, (None, None))[1]
+            self._values[key] = (str(value).encode(), expires_at)
+            return value
+
+    def delete(self, *keys: str) -> int:
+        with self._lock:
+            return sum(self._values.pop(key, None) is not None for key in keys)
+
+    def info(self, section: Optional[str] = None) -> Dict[str, int]:
+        with self._lock:
+            return {"used_memory": approx_size(self._values)}
+
+    def flushdb(self) -> bool:
+        with self._lock:
+            self._values.clear()
+        return True
+
+def redis_client(url: Optional[str]):
+    """A Redis client for ``url``, or an InMemoryRedis when no URL is set."""
+    if not url:
+        return InMemoryRedis()
+    return redis.Redis.from_url(url, socket_timeout=0.25, socket_connect_timeout=0.25)
+
+class VersionedCache(CacheCounters):
+    """Bytes cache in Redis keyed by namespace versions.
+
+    Typical use::
+
+        cached, key = cache.get(("catalog",), ("books", page, limit))
+        if cached is None:
+            cached = compute()
+            cache.set(key, cached)
+        ...
+        cache.bump("catalog")   # after a change
+
+    Lookups are counted for ``stats()``, which reports the memory used by
+    the whole Redis database as ``bytes``. ``shared`` is False with an
+    InMemoryRedis, whose versions and stamps end with the process.
+    """
+    def __init__(self, client, prefix: str, ttl: float):
+        super().__init__()
+        self.name = prefix
+        self.client = client
+        self.shared = not isinstance(client, InMemoryRedis)
+        self.prefix = prefix
+        self.ttl = ttl
+
+    def _version_key(self, namespace: str) -> str:
+        return f"{self.prefix}:version:{namespace}"
+
+    def _stamp(self, namespaces: Sequence[str]) -> str:
+        """Digest of the current versions of ``namespaces``.
+
+        It includes a random epoch created with the first version, so stamps
+        issued before Redis lost its data (or by another process's in-memory
+        stand-in) never match stamps issued after.
+        """
+        epoch_key = f"{self.prefix}:epoch"
+        epoch, *versions = self.client.mget(
+            [epoch_key] + [self._version_key(name) for name in namespaces]
+        )
+        if epoch is None:
+            self.client.set(epoch_key, uuid.uuid4().hex, nx=True)
+            epoch = self.client.get(epoch_key)
+        return self._digest(epoch, zip(namespaces, versions))
+
+    @staticmethod
+    def _digest(epoch: bytes, versions: Iterable[Tuple[str, Optional[bytes]]]) -> str:
+        stamp = ",".join(
+            [str(epoch)] + [f"{name}={int(version or 0)}" for name, version in versions]
+        )
+        return hashlib.sha1(stamp.encode()).hexdigest()
+
+    def stamp(self, namespaces: Sequence[str]) -> Optional[str]:
+        """Opaque token that changes whenever one of ``namespaces`` is bumped.
+
+        Suitable for ETags. None when Redis is unavailable.
+        """
+        try:
+            return self._stamp(namespaces)
+        except redis.RedisError as e:
+            logger.warning(f"Cache version lookup failed: {str(e)}")
+            return None
+
+    def stamps(self, namespaces: Sequence[str]) -> Optional[List[str]]:
+        """``stamp((namespace,))`` of each of ``namespaces``, read with one round trip.
+
+        None when Redis is unavailable or has lost its data since the stamps
+        being compared with were issued.
+        """
+        try:
+            epoch, *versions = self.client.mget(
+                [f"{self.prefix}:epoch"] + [self._version_key(name) for name in namespaces]
+            )
+        except redis.RedisError as e:
+            logger.warning(f"Cache version lookup failed: {str(e)}")
+            return None
+        if epoch is None:
+            return None
+        return [
+            self._digest(epoch, [(name, version)]) for name, version in zip(namespaces, versions)
+        ]
+
+    def get(self, namespaces: Sequence[str], key: Hashable) -> Tuple[Optional[bytes], Optional[str]]:
+        """Look up ``key`` at the current versions of ``namespaces``.
+
+        Returns the cached bytes (None on a miss) and the versioned key to
+        store the computed value under, which is None when Redis is
+        unavailable.
+        """
+        try:
+            digest = hashlib.sha1(repr(key).encode()).hexdigest()
+            versioned_key = f"{self.prefix}:{self._stamp(namespaces)}:{digest}"
+            cached = self.client.get(versioned_key)
+        except redis.RedisError as e:
+            logger.warning(f"Cache lookup failed, reading from the database: {str(e)}")
+            self.count_lookup(hit=False)
+            return None, None
+        self.count_lookup(hit=cached is not None)
+        return cached, versioned_key
+
+    def set(self, versioned_key: Optional[str], value: bytes) -> None:
+        """Store ``value`` under a key returned by ``get``."""
+        if versioned_key is None:
+            return
+        try:
+            self.client.set(versioned_key, value, ex=max(int(self.ttl), 1))
+        except redis.RedisError as e:
+            logger.warning(f"Cache store failed: {str(e)}")
+
+    def bump(self, *namespaces: str) -> None:
+        """Invalidate every entry that depends on one of ``namespaces``."""
+        for namespace in set(namespaces):
+            try:
+                self.client.incr(self._version_key(namespace))
+            except redis.RedisError as e:
+                # Entries of this namespace stay visible until their TTL
+                logger.error(f"Failed to invalidate cache namespace {namespace}: {str(e)}")
+
+    def clear(self) -> None:
+        """Make every entry unreachable by starting a new epoch, in every worker."""
+        try:
+            self.client.delete(f"{self.prefix}:epoch")
+        except redis.RedisError as e:
+            logger.error(f"Failed to clear cache {self.prefix}: {str(e)}")
+
+    def stats(self, include_bytes: bool = True) -> Dict[str, Any]:
+        """Counters and Redis memory use, e.g. for a metrics endpoint."""
+        used_memory = None
+        if include_bytes:
+            try:
+                used_memory = self.client.info("memory").get("used_memory")
+            except redis.RedisError:
+                pass
+        return {
+            "name": self.name,
+            "bytes": used_memory,
+            "ttl": self.ttl,
+            **self.counter_stats()
+        }
@@ -0,0 +1,69 @@
+from typing import Any, Callable, Dict, Hashable, Optional
+import threading
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+class SingleFlight:
+    """Collapses concurrent calls with the same key into one execution.
+
+    The first caller for a key (the leader) runs the function; callers that
+    arrive with the same key while it runs wait for it and get its result,
+    or its exception. Nothing is kept once the leader returns, so this only
+    deduplicates work in flight; caching stays the caller's job.
+
+    For threads, e.g. sync FastAPI routes running in the threadpool. Results
+    are shared between callers and must not be mutated.
+    """
+    def __init__(self, name: Optional[str] = None):
+        self.name = name
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.executions = 0
+        self.collapsed = 0
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run ``fn(*args, **kwargs)``, or wait for the run already in flight for ``key``."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+            else:
+                self.collapsed += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def clear(self) -> None:
+        """Nothing to drop, as nothing is kept; lets a CacheRegistry hold it."""
+
+    def stats(self, include_bytes: bool = True) -> Dict[str, Any]:
+        """Executions and collapsed calls, e.g. for a metrics endpoint; nothing to size."""
+        with self._lock:
+            return {
+                "name": self.name,
+                "in_flight": len(self._calls),
+                "executions": self.executions,
+                "collapsed": self.collapsed
+            }
@@ -0,0 +1,86 @@
+"""Binary snapshot files of cache entries, read through mmap.
+
+A snapshot is a header (magic, entry count), a fixed-size index of
+(key, stamp, offset, length) records, then the values back to back. Keys
+are 64-bit integers and stamps SHA-1 hex digests, e.g. from
+``VersionedCache.stamps``, so a reader can check which entries are still
+current before copying any value out of the mapping.
+
+Files are written to a temporary name and renamed, so readers never see a
+partial snapshot even when several processes write the same path.
+"""
+from typing import Iterable, List, Tuple
+import mmap
+import os
+import struct
+import tempfile
+
+MAGIC = b"CACHESN1"
+HEADER = struct.Struct(">8sI")
+RECORD = struct.Struct(">q20sQI")
+
+def write_snapshot(path: str, entries: Iterable[Tuple[int, str, bytes]]) -> int:
+    """Write ``(key, stamp, value)`` entries to ``path``; returns how many were written."""
+    entries = list(entries)
+    offset = HEADER.size + RECORD.size * len(entries)
+    index = []
+    for key, stamp, value in entries:
+        index.append(RECORD.pack(key, bytes.fromhex(stamp), offset, len(value)))
+        offset += len(value)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".snapshot-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(HEADER.pack(MAGIC, len(entries)))
+            f.writelines(index)
+            f.writelines(value for _, _, value in entries)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return len(entries)
+
+class SnapshotFile:
+    """A snapshot mapped for reading; use as a context manager.
+
+    Raises:
+        OSError: If the file cannot be opened or mapped
+        ValueError: If it is not a complete snapshot
+    """
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, self.count = HEADER.unpack_from(self._map, 0)
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a cache snapshot")
+            self._records = [
+                RECORD.unpack_from(self._map, HEADER.size + RECORD.size * position)
+                for position in range(self.count)
+            ]
+            if self._records:
+                _, _, offset, length = self._records[-1]
+                if offset + length > len(self._map):
+                    raise ValueError(f"{path} is truncated")
+        except (struct.error, ValueError) as e:
+            self._map.close()
+            raise ValueError(str(e)) from e
+
+    def __enter__(self) -> "SnapshotFile":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def index(self) -> List[Tuple[int, str]]:
+        """Key and stamp of every entry, in file order."""
+        return [(key, stamp.hex()) for key, stamp, _, _ in self._records]
+
+    def value(self, position: int) -> bytes:
+        """A copy of the value of the entry at ``position`` in the index."""
+        _, _, offset, length = self._records[position]
+        return self._map[offset:offset + length]
+
+    def close(self) -> None:
+        self._map.close()
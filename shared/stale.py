@@ -0,0 +1,113 @@
+"""Serving stale values while the source of fresh ones is slow or failing.
+
+Follows the ``stale-while-revalidate`` / ``stale-if-error`` semantics of
+RFC 5861: the last value computed for a key is kept for a bounded time
+after the regular cache lost it (expiry or invalidation). Within the
+while-revalidate bound it is served at once and recomputed in the
+background; within the if-error bound it is served when recomputing fails.
+A bound of 0 disables that mode.
+
+Ages are measured from when the value was computed, so a bound is the
+oldest data a client can get, whatever made the regular entry go away.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional, Set, Tuple
+import logging
+import threading
+import time
+from .cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+class StaleCache:
+    """Last known good value per key, with its age."""
+    def __init__(
+        self,
+        maxsize: int,
+        while_revalidate: float,
+        if_error: float,
+        name: Optional[str] = None
+    ):
+        self.name = name
+        self.while_revalidate = while_revalidate
+        self.if_error = if_error
+        # Nothing older than the larger bound is ever served
+        self._entries = TTLCache(
+            maxsize=maxsize, ttl=max(while_revalidate, if_error, 1.0), name=name
+        )
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Record ``value`` as freshly computed for ``key``."""
+        if self.while_revalidate > 0 or self.if_error > 0:
+            self._entries.set(key, (value, time.monotonic()))
+
+    def get(self, key: Hashable, max_age: float) -> Optional[Tuple[Any, float]]:
+        """The value for ``key`` and its age in seconds, if not older than ``max_age``."""
+        if max_age <= 0:
+            return None
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, computed_at = entry
+        age = time.monotonic() - computed_at
+        return (value, age) if age <= max_age else None
+
+    def delete(self, key: Hashable) -> None:
+        """Forget ``key``, e.g. once it no longer exists."""
+        self._entries.delete(key)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._entries.clear()
+
+    def stats(self, include_bytes: bool = True) -> Dict[str, Any]:
+        """Counters and occupancy of the underlying cache, with the bounds."""
+        return {
+            **self._entries.stats(include_bytes),
+            "while_revalidate": self.while_revalidate,
+            "if_error": self.if_error
+        }
+
+class BackgroundRefresher:
+    """Runs refreshes on a small thread pool, at most one per key at a time.
+
+    ``fn`` gets a session from ``session_factory``, since the session of the
+    request that triggered the refresh is closed by the time it runs.
+    """
+    def __init__(self, session_factory: Callable[[], Any], max_workers: int = 2):
+        self.session_factory = session_factory
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="refresh")
+        self._pending: Set[Hashable] = set()
+        self._lock = threading.Lock()
+
+    def submit(self, key: Hashable, fn: Callable[[Any], Any]) -> bool:
+        """Schedule ``fn(session)`` unless a refresh of ``key`` is already pending."""
+        with self._lock:
+            if key in self._pending:
+                return False
+            self._pending.add(key)
+        try:
+            self._executor.submit(self._run, key, fn)
+        except RuntimeError:
+            # Shutting down
+            with self._lock:
+                self._pending.discard(key)
+            return False
+        return True
+
+    def _run(self, key: Hashable, fn: Callable[[Any], Any]) -> None:
+        try:
+            session = self.session_factory()
+            try:
+                fn(session)
+            finally:
+                session.close()
+        except Exception as e:
+            logger.warning(f"Background refresh of {key!r} failed: {str(e)}")
+        finally:
+            with self._lock:
+                self._pending.discard(key)
+
+    def shutdown(self) -> None:
+        """Drop queued refreshes; running ones finish on their own."""
+        self._executor.shutdown(wait=False, cancel_futures=True)